@@ -0,0 +1,150 @@
+# backtest.py
+# 选择器规则的流式历史回测 / Streaming historical backtest of the selector rules
+
+import collections
+import concurrent.futures
+import functools
+import math
+import os
+
+import numpy as np
+
+from chain_store import INDEX_FILE, ChainStore, to_days
+from market_view import atm_iv, derive_answers
+from payoff import PUT, STOCK
+from strategy_selector import StrategySelector
+from strike_selector import select_recommended_legs
+
+# 单个标的的回测结果：branch_pnl 为每个规则分支按日期排列的 (日期天数, 当日盈亏变化)，trades 为各分支开仓次数
+# Backtest result of one symbol: branch_pnl lists (days since epoch, P&L change) per rule branch, trades counts positions opened per branch
+BacktestResult = collections.namedtuple('BacktestResult', ['symbol', 'branch_pnl', 'trades'])
+
+
+def iter_snapshots(root, start=None, end=None):
+    """按日期顺序逐个打开以 YYYY-MM-DD 命名的快照目录 / Open snapshot directories named YYYY-MM-DD one at a time in date order"""
+    # 每个快照只读取索引，数据列按需内存映射 / Each snapshot only reads its index; data columns are memory-mapped on demand
+    for name in sorted(os.listdir(root)):
+        try:
+            day = to_days(name)
+        except ValueError:
+            continue
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        path = os.path.join(root, name)
+        if os.path.isfile(os.path.join(path, INDEX_FILE)):
+            yield day, ChainStore(path)
+
+
+def _contract_mid(store, symbol, expiry, kind, strike):
+    # 在快照中二分查找合约的中间价，不存在时返回 None / Binary-search a contract's mid price in a snapshot, None when missing
+    try:
+        chain = store.chain(symbol, expiry)
+    except KeyError:
+        return None
+    split = int(np.searchsorted(chain.kind, PUT))
+    start, stop = (split, len(chain.kind)) if kind == PUT else (0, split)
+    position = start + int(np.searchsorted(chain.strike[start:stop], strike))
+    if position == stop or chain.strike[position] != strike:
+        return None
+    mid = (float(chain.bid[position]) + float(chain.ask[position])) / 2.0
+    # 缺少买价或卖价时没有可用的估值 / Without both a bid and an ask there is no usable mark
+    return mid if math.isfinite(mid) else None
+
+
+class Position:
+    def __init__(self, branch, selection):
+        self.branch = branch
+        self.selection = selection
+        # 各腿最近一次的估值，初始为开仓价 / Latest mark of every leg, starting at the entry price
+        self.marks = [leg.premium for leg in selection.legs]
+        self.value = self._value()
+    
+    def _value(self):
+        return sum(leg.quantity * mark for leg, mark in zip(self.selection.legs, self.marks))
+    
+    def mark(self, store, day, spot):
+        """按快照估值，返回价值变化 / Mark to the snapshot and return the change in value"""
+        selection = self.selection
+        for index, leg in enumerate(selection.legs):
+            expiry = selection.expiries[leg.expiry]
+            if leg.kind == STOCK:
+                self.marks[index] = spot
+            elif day >= expiry:
+                # 到期按内在价值结算 / Settle at intrinsic value on expiry
+                self.marks[index] = max(spot - leg.strike, 0.0) if leg.kind != PUT else max(leg.strike - spot, 0.0)
+            else:
+                # 没有有效报价时沿用上次估值 / Keep the previous mark when there is no valid quote
+                mid = _contract_mid(store, selection.symbol, expiry, leg.kind, leg.strike)
+                if mid is not None:
+                    self.marks[index] = mid
+        value = self._value()
+        change, self.value = value - self.value, value
+        return change
+    
+    def expired(self, day):
+        """近月腿到期即平仓 / The position closes when its near legs expire"""
+        return day >= self.selection.expiries[0]
+
+
+def backtest_symbol(root, symbol, selector=None, rebalance_every=5, lookback=20,
+                    risk_tolerance='medium', time_horizon='medium', start=None, end=None):
+    """流式回放单个标的的快照并按规则分支统计盈亏 / Stream the snapshots of one symbol and track P&L per rule branch"""
+    selector = selector or StrategySelector()
+    symbol = symbol.upper()
+    prices = collections.deque(maxlen=lookback + 1)
+    positions = []
+    branch_pnl = collections.defaultdict(list)
+    trades = collections.Counter()
+
+    seen = 0
+    for day, store in iter_snapshots(root, start, end):
+        if symbol not in store or store.spot(symbol) is None:
+            continue
+        spot = store.spot(symbol)
+        prices.append(spot)
+
+        # 逐日估值，到期的持仓在结算后移除 / Mark every position, dropping those settled on expiry
+        changes = collections.defaultdict(float)
+        for position in positions:
+            changes[position.branch] += position.mark(store, day, spot)
+        positions = [position for position in positions if not position.expired(day)]
+        for branch, change in changes.items():
+            branch_pnl[branch].append((day, change))
+
+        # 调仓日按推导出的回答开新仓 / On rebalance days open the legs recommended for the derived answers
+        if seen % rebalance_every == 0 and len(prices) > 2:
+            answers = derive_answers(prices, atm_iv(store, symbol, day), risk_tolerance, time_horizon)
+            branch, strategy_ids = selector.select_rule(answers)
+            for selection in select_recommended_legs(store, symbol, strategy_ids, answers, as_of=day):
+                positions.append(Position(branch, selection))
+                trades[branch] += 1
+        seen += 1
+
+    return BacktestResult(symbol, dict(branch_pnl), dict(trades))
+
+
+def run_backtest(root, symbols, workers=1, **options):
+    """按标的拆分回测，可在进程池中并行，结果按完成顺序产出 / Backtest symbols separately, optionally in a process pool, yielding results as they finish"""
+    task = functools.partial(backtest_symbol, root, **options)
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(task, symbol) for symbol in symbols]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+    else:
+        for symbol in symbols:
+            yield task(symbol)
+
+
+def branch_equity_curves(results):
+    """合并多个标的的结果，得到每个规则分支的日期与累计盈亏 / Merge results into (dates, cumulative P&L) per rule branch"""
+    merged = collections.defaultdict(list)
+    for result in results:
+        for branch, series in result.branch_pnl.items():
+            merged[branch].extend(series)
+    curves = {}
+    for branch, series in merged.items():
+        days, changes = np.array(series, dtype=float).T
+        unique_days, inverse = np.unique(days.astype(np.int64), return_inverse=True)
+        curves[branch] = (unique_days, np.cumsum(np.bincount(inverse, weights=changes)))
+    return curves
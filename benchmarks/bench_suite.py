@@ -0,0 +1,309 @@
+# benchmarks/bench_suite.py
+# 选择器、定价与结果构建热点路径的基准套件，可保存基线并与之比较
+# Benchmark suite for the selector, pricing and result-building hot paths; saves a baseline and compares runs against it
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import catalog
+from strategy_selector import StrategySelector
+
+# 默认基线文件 / Default baseline file
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# 批量选择的规模 / Batch sizes for batch selection
+BATCH_SIZES = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# 名称 -> 准备函数，准备函数返回无参数的被测函数 / name -> setup function returning the zero-argument callable under test
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _answer_space():
+    structure = catalog.load_structure()
+    return [dict(zip(structure['question_ids'], combination))
+            for combination in itertools.product(*structure['option_values'])]
+
+
+@benchmark('selector.select_strategies.all_combinations')
+def _select_all():
+    # 关闭推荐缓存，测量的是选择本身而不是缓存命中 / The recommendation cache is off, so selection itself is measured rather than cache hits
+    selector = StrategySelector(cache_size=0)
+    space = _answer_space()
+    
+    def run():
+        for answers in space:
+            selector.select_strategies(answers)
+    return run
+
+
+@benchmark('selector.select_strategies.all_combinations.cached')
+def _select_all_cached():
+    # 第一轮之后全部命中缓存 / Every call after the first pass is a cache hit
+    selector = StrategySelector()
+    space = _answer_space()
+    
+    def run():
+        for answers in space:
+            selector.select_strategies(answers)
+    return run
+
+
+@benchmark('selector.construct')
+def _construct():
+    StrategySelector()
+    return StrategySelector
+
+
+@benchmark('selector.construct.cold_catalog')
+def _construct_cold():
+    def run():
+        # 丢弃进程内目录，重新读取数据文件（使用磁盘上的预编译缓存）
+        # Drop the in-process catalogs and read the data files again (through the on-disk precompiled cache)
+        catalog.reload()
+        StrategySelector().get_questions()
+    return run
+
+
+@benchmark('selector.switch_language')
+def _switch_language():
+    selector = StrategySelector()
+    answers = _answer_space()[0]
+    
+    def run():
+        for language in ('en', 'cn'):
+            selector.set_language(language)
+            selector.get_questions()
+            selector.select_strategies(answers)
+    return run
+
+
+def _batch_setup(size):
+    def setup():
+        selector = StrategySelector()
+        option_values = catalog.load_structure()['option_values']
+        generator = np.random.default_rng(0)
+        codes = np.column_stack([generator.integers(0, len(values), size) for values in option_values])
+        return lambda: selector.select_strategies_batch(codes)
+    return setup
+
+
+for _size in BATCH_SIZES:
+    benchmark(f'selector.select_strategies_batch.{_size}')(_batch_setup(_size))
+
+
+@benchmark('selector.select_strategies_batch.dicts.10000')
+def _batch_dicts():
+    selector = StrategySelector()
+    space = _answer_space()
+    records = [space[index % len(space)] for index in range(10000)]
+    return lambda: selector.select_strategies_batch(records)
+
+
+@benchmark('result_model.build')
+def _result_model():
+    from result_model import build_result_model
+    selector = StrategySelector()
+    answers = _answer_space()[0]
+    return lambda: build_result_model(selector, answers, 'NVDA', 'en')
+
+
+@benchmark('result_model.build.all_combinations')
+def _result_model_all():
+    from result_model import build_result_model
+    selector = StrategySelector(cache_size=0)
+    space = _answer_space()
+    
+    def run():
+        for answers in space:
+            build_result_model(selector, answers, 'NVDA', 'en')
+    return run
+
+
+@benchmark('scoring.score.all_combinations')
+def _score_all():
+    from scoring import load_model
+    space = _answer_space()
+    return lambda: load_model().score(space)
+
+
+@benchmark('scoring.rank.1000_variants')
+def _rank_variants():
+    # 用随机属性把目录扩展到 1000 个策略变体 / Grow the catalog to 1000 strategy variants with random attributes
+    from scoring import ScoringModel
+    structure = dict(catalog.load_structure())
+    generator = np.random.default_rng(0)
+    structure['strategy_ids'] = tuple(f'variant_{index}' for index in range(1000))
+    structure['strategy_attributes'] = {
+        strategy_id: {name: float(generator.uniform(low, high)) for name, (low, high) in structure['scoring']['attributes'].items()}
+        for strategy_id in structure['strategy_ids']
+    }
+    model = ScoringModel(structure)
+    answers = _answer_space()[0]
+    return lambda: model.rank(answers, limit=10)
+
+
+@benchmark('iv_solver.implied_vol.100000')
+def _implied_vol():
+    from iv_solver import implied_vol
+    from pricing import black_scholes
+    generator = np.random.default_rng(0)
+    size = 100000
+    kind = generator.integers(0, 2, size)
+    strike = generator.uniform(50.0, 200.0, size)
+    t = generator.uniform(1 / 365, 2.0, size)
+    price = black_scholes(kind, 100.0, strike, t, generator.uniform(0.1, 1.0, size), 0.03).price
+    return lambda: implied_vol(kind, price, 100.0, strike, t, 0.03)
+
+
+@benchmark('payoff.strategy_payoffs.all_strategies')
+def _payoffs():
+    from payoff import STRATEGY_TEMPLATES, strategy_payoffs
+    strategy_ids = list(STRATEGY_TEMPLATES)
+    return lambda: strategy_payoffs(strategy_ids, 100.0)
+
+
+@benchmark('payoff_chart.build_charts.all_strategies')
+def _charts():
+    from payoff import STRATEGY_TEMPLATES, build_legs, stack_legs
+    from payoff_chart import build_charts
+    legs = stack_legs(build_legs(strategy_id, 100.0) for strategy_id in STRATEGY_TEMPLATES)
+    spots = [100.0] * len(STRATEGY_TEMPLATES)
+    return lambda: build_charts(legs, spots)
+
+
+@benchmark('payoff_chart.envelope.800_columns')
+def _envelope():
+    from payoff_chart import envelope, template_chart
+    chart = template_chart('iron_condor')
+    return lambda: envelope(chart, 800)
+
+
+@benchmark('pricing.strategy_greeks.all_strategies')
+def _greeks():
+    from payoff import STRATEGY_TEMPLATES
+    from pricing import strategy_greeks
+    strategy_ids = list(STRATEGY_TEMPLATES)
+    return lambda: strategy_greeks(strategy_ids, 100.0, (30 / 365, 60 / 365), 0.25)
+
+
+def measure(function, repeat=5, min_time=0.2):
+    """类似 timeit：自动选择循环次数，返回每次调用的秒数 / Like timeit: pick a loop count automatically and return seconds per call"""
+    function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return {'best': min(samples), 'median': statistics.median(samples), 'loops': loops, 'repeat': repeat}
+
+
+def run_suite(pattern=None, repeat=5, min_time=0.2, report=None):
+    """运行名称包含 pattern 的基准 / Run the benchmarks whose names contain pattern"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(setup(), repeat, min_time)
+        if report:
+            report(name, results[name])
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """与基线比较，返回 (名称, 基线秒数, 当前秒数, 比值, 是否退化) 行
+    Compare against a baseline, returning (name, baseline seconds, current seconds, ratio, regressed) rows
+    
+    用每轮中的最佳值比较，受系统噪声影响最小。
+    The best round is compared since it is the least affected by system noise.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = result['best'] / previous['best']
+        rows.append((name, previous['best'], result['best'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="热点路径基准套件 / Hot-path benchmark suite")
+    parser.add_argument("-k", "--filter", help="只运行名称包含该字符串的基准 / Only run benchmarks whose names contain this string")
+    parser.add_argument("--repeat", type=int, default=5, help="每个基准的轮数 / Rounds per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最短秒数 / Minimum seconds per round")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="保存为基线文件 / Save the results as a baseline file")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="与基线文件比较 / Compare against a baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="变慢超过该比例视为退化 / Slowdown ratio above which a benchmark counts as regressed")
+    parser.add_argument("--list", action="store_true", help="列出所有基准 / List the benchmarks")
+    arguments = parser.parse_args(argv)
+
+    if arguments.list:
+        print('\n'.join(BENCHMARKS))
+        return 0
+
+    report = lambda name, result: print(f"{name:<50} {_format_seconds(result['best'])}  (median {_format_seconds(result['median']).strip()}, {result['loops']} loops)")
+    current = run_suite(arguments.filter, arguments.repeat, arguments.min_time, report)
+
+    if arguments.save:
+        with open(arguments.save, 'w', encoding='utf-8') as handle:
+            json.dump(current, handle, indent=2)
+            handle.write('\n')
+        print(f"baseline written to {arguments.save}")
+
+    if arguments.compare:
+        with open(arguments.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        rows = compare(baseline, current, arguments.threshold)
+        print(f"\ncompared with {arguments.compare} ({baseline.get('created', 'unknown date')}):")
+        for name, previous, best, ratio, regressed in rows:
+            print(f"{name:<50} {_format_seconds(previous)} -> {_format_seconds(best)}  x{ratio:5.2f}{'  REGRESSION' if regressed else ''}")
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
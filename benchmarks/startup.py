@@ -0,0 +1,118 @@
+# benchmarks/startup.py
+# 冷启动基准：测量新进程从启动到首个问题、首个推荐的耗时
+# Cold-start benchmark: time from spawning a fresh process to its first question and first recommendation
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 固定的一组回答，保证每次运行走同一条规则分支 / A fixed set of answers so every run takes the same rule branch
+ANSWERS = {
+    'market_view': 'bullish',
+    'price_movement': 'moderate',
+    'volatility_view': 'stable',
+    'risk_tolerance': 'medium',
+    'time_horizon': 'medium',
+}
+
+# 子进程在到达每个里程碑时输出一行标记，父进程记录读到该行的时刻
+# The child prints a marker line at every milestone; the parent timestamps the moment it reads the line
+SCRIPTS = {
+    'headless': f"""
+import sys
+from strategy_selector import StrategySelector
+selector = StrategySelector()
+selector.get_questions()
+sys.stdout.write('question\\n'); sys.stdout.flush()
+selector.select_strategies({ANSWERS!r})
+sys.stdout.write('recommendation\\n'); sys.stdout.flush()
+""",
+    'gui': f"""
+import sys
+import tkinter as tk
+from main import OptionStrategyApp
+root = tk.Tk()
+app = OptionStrategyApp(root)
+root.update()
+sys.stdout.write('question\\n'); sys.stdout.flush()
+app.answers = dict({ANSWERS!r})
+# 推荐在后台线程中计算，等到结果显示为止 / Recommendations are computed on a worker thread, so wait until they are displayed
+shown = []
+display_results = app.display_results
+app.display_results = lambda model: (display_results(model), shown.append(model))
+app.show_results()
+while not shown:
+    root.update()
+root.update()
+sys.stdout.write('recommendation\\n'); sys.stdout.flush()
+root.destroy()
+""",
+}
+
+MILESTONES = ('question', 'recommendation')
+
+
+def run_once(mode, cold=False):
+    """启动一个子进程，返回各里程碑相对启动时刻的秒数 / Spawn one child and return the seconds from spawn to each milestone"""
+    if cold:
+        # 丢弃目录的预编译缓存，模拟全新安装 / Drop the catalog's precompiled cache to mimic a fresh install
+        shutil.rmtree(os.path.join(ROOT, 'data', '__pycache__'), ignore_errors=True)
+    timings = {}
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, '-c', SCRIPTS[mode]], cwd=ROOT,
+                             stdout=subprocess.PIPE, text=True)
+    for line in child.stdout:
+        timings[line.strip()] = time.perf_counter() - start
+    if child.wait() != 0 or set(timings) != set(MILESTONES):
+        raise RuntimeError(f"{mode} startup run failed with exit code {child.returncode}")
+    return timings
+
+
+def benchmark(mode='headless', repeat=20, cold=False):
+    """重复运行并汇总每个里程碑的毫秒统计 / Repeat the run and summarize every milestone in milliseconds"""
+    # 先运行一次预热字节码和目录缓存 / One warm-up run fills the bytecode and catalog caches
+    run_once(mode)
+    samples = {milestone: [] for milestone in MILESTONES}
+    for _ in range(repeat):
+        for milestone, seconds in run_once(mode, cold).items():
+            samples[milestone].append(seconds * 1000.0)
+    summary = {}
+    for milestone, values in samples.items():
+        values.sort()
+        summary[milestone] = {
+            'median_ms': statistics.median(values),
+            'min_ms': values[0],
+            'p90_ms': values[min(len(values) - 1, int(len(values) * 0.9))],
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="冷启动基准 / Cold-start benchmark")
+    parser.add_argument("--mode", choices=sorted(SCRIPTS), default="headless",
+                        help="headless 只测选择逻辑，gui 测 Tk 界面（需要显示器）/ headless times the selection logic, gui the Tk frontend (needs a display)")
+    parser.add_argument("--repeat", type=int, default=20, help="运行次数 / Number of runs")
+    parser.add_argument("--cold", action="store_true",
+                        help="每次运行前删除目录缓存 / Delete the catalog cache before every run")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出 / Print the summary as JSON")
+    arguments = parser.parse_args(argv)
+
+    summary = benchmark(arguments.mode, arguments.repeat, arguments.cold)
+    if arguments.json:
+        print(json.dumps({'mode': arguments.mode, 'repeat': arguments.repeat, 'cold': arguments.cold,
+                          'python': sys.version.split()[0], 'milestones': summary}, indent=2))
+        return
+    print(f"{arguments.mode} startup, {arguments.repeat} runs{' (cold catalog cache)' if arguments.cold else ''}")
+    for milestone, stats in summary.items():
+        print(f"  first {milestone:<15} median {stats['median_ms']:7.1f} ms   min {stats['min_ms']:7.1f} ms   p90 {stats['p90_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
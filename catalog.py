@@ -0,0 +1,104 @@
+# catalog.py
+# 策略与问题目录的惰性加载 / Lazy loading of the strategy and question catalogs
+
+import marshal
+import os
+
+import instrumentation
+
+# 目录数据文件位置：structure.json 为语言无关的结构，<语言>.json 为各语言文本
+# Catalog data files: structure.json holds the language-independent structure, <language>.json the texts of one language
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 预编译缓存目录 / Directory of the precompiled cache
+CACHE_DIR = os.path.join(DATA_DIR, '__pycache__')
+
+# 目录版本号，每次重新加载时递增 / Catalog version, bumped on every reload
+version = 0
+
+# 进程内共享的已加载目录 / Loaded catalogs shared within the process
+_loaded = {}
+
+
+def _read(name):
+    """读取数据文件，优先使用与源文件匹配的 marshal 缓存 / Read a data file, preferring a marshal cache that matches the source"""
+    source = os.path.join(DATA_DIR, name + '.json')
+    stat = os.stat(source)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache_path = os.path.join(CACHE_DIR, name + '.marshal')
+    try:
+        with open(cache_path, 'rb') as handle:
+            cached_stamp, data = marshal.load(handle)
+        if tuple(cached_stamp) == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    # 仅在缓存缺失或过期时才需要解析 JSON / JSON is only parsed when the cache is missing or stale
+    import json
+
+    with open(source, encoding='utf-8') as handle:
+        data = json.load(handle)
+    # 缓存写入失败（如只读安装）时直接使用解析结果 / Fall back to the parsed data when the cache cannot be written, e.g. read-only installs
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temporary = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as handle:
+            marshal.dump((stamp, data), handle)
+        os.replace(temporary, cache_path)
+    except OSError:
+        pass
+    return data
+
+
+def load_structure():
+    """加载语言无关的目录结构 / Load the language-independent catalog structure"""
+    structure = _loaded.get('structure')
+    if structure is None:
+        with instrumentation.span('catalog.load_structure'):
+            data = _read('structure')
+        categories = {}
+        for strategy in data['strategies']:
+            categories.setdefault(strategy['category'], []).append(strategy['id'])
+        structure = _loaded['structure'] = {
+            'strategy_ids': tuple(strategy['id'] for strategy in data['strategies']),
+            'strategy_categories': {strategy['id']: strategy['category'] for strategy in data['strategies']},
+            'categories': {category: tuple(strategy_ids) for category, strategy_ids in categories.items()},
+            'question_ids': tuple(question['id'] for question in data['questions']),
+            'option_values': tuple(tuple(question['options']) for question in data['questions']),
+            'message_keys': tuple(data['messages']),
+            'strategy_attributes': {strategy['id']: strategy['attributes'] for strategy in data['strategies']},
+            'scoring': data['scoring'],
+        }
+    return structure
+
+
+def load_language(language):
+    """首次使用时加载某一语言的策略与问题文本 / Load the strategy and question texts of one language on first use"""
+    texts = _loaded.get(language)
+    if texts is None:
+        structure = load_structure()
+        with instrumentation.span('catalog.load_language'):
+            data = _read(language)
+        strategies = {}
+        for strategy_id in structure['strategy_ids']:
+            localized = {'id': strategy_id, 'category': structure['strategy_categories'][strategy_id]}
+            localized.update(data['strategies'][strategy_id])
+            strategies[strategy_id] = localized
+        questions = []
+        for question_id, values in zip(structure['question_ids'], structure['option_values']):
+            question = data['questions'][question_id]
+            questions.append({
+                'id': question_id,
+                'text': question['text'],
+                'options': [{'value': value, 'text': question['options'][value]} for value in values],
+            })
+        texts = _loaded[language] = {'strategies': strategies, 'questions': questions, 'messages': data['messages']}
+    return texts
+
+
+def reload():
+    """丢弃已加载的目录，下次使用时重新读取 / Drop the loaded catalogs so they are read again on next use"""
+    global version
+    _loaded.clear()
+    version += 1
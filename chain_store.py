@@ -0,0 +1,205 @@
+# chain_store.py
+# 本地期权链列式存储 / Local columnar option-chain store
+
+import collections
+import csv
+import datetime
+import json
+import os
+
+import numpy as np
+
+from payoff import CALL, PUT
+
+# 列式存储的数值列及其类型 / Numeric columns of the store and their dtypes
+COLUMNS = (
+    ('expiry', np.int32),         # 到期日，距1970-01-01的天数 / Expiry as days since 1970-01-01
+    ('kind', np.int8),            # 期权类型，与 payoff.CALL/PUT 一致 / Option kind, same codes as payoff.CALL/PUT
+    ('strike', np.float64),
+    ('bid', np.float64),
+    ('ask', np.float64),
+    ('iv', np.float64),           # 隐含波动率，缺失为 NaN / Implied volatility, NaN when missing
+    ('volume', np.int64),
+    ('open_interest', np.int64),
+)
+
+# CSV 中期权类型的写法 / Spellings of the option kind in CSV files
+KIND_CODES = {'c': CALL, 'call': CALL, 'p': PUT, 'put': PUT}
+
+INDEX_FILE = 'index.json'
+
+# 导入时每块转换的行数 / Rows converted per chunk during import
+IMPORT_CHUNK_ROWS = 500000
+
+_EPOCH = datetime.date(1970, 1, 1)
+
+# 某一标的（或某一到期日）的期权链视图，各列为底层内存映射数组的零拷贝切片
+# Option chain view of one symbol (or one expiry); every column is a zero-copy slice of the memory-mapped arrays
+OptionChain = collections.namedtuple('OptionChain', ['symbol', 'spot'] + [name for name, _ in COLUMNS])
+
+
+def to_days(value):
+    """将日期或 YYYY-MM-DD 字符串转换为天数 / Convert a date or YYYY-MM-DD string to days since epoch"""
+    if isinstance(value, str):
+        value = datetime.date.fromisoformat(value)
+    return (value - _EPOCH).days
+
+
+def from_days(days):
+    """将天数转换为日期 / Convert days since epoch to a date"""
+    return _EPOCH + datetime.timedelta(days=int(days))
+
+
+def _parse_number(text, default):
+    return float(text) if text not in ('', None) else default
+
+
+def import_csv(csv_path, store_path, as_of=None):
+    """一次性将 CSV 期权链导入为列式二进制存储 / One-time import of a CSV option chain into the columnar binary store"""
+    # CSV 必须包含 symbol, expiry, type, strike, bid, ask 列，可选 iv, volume, open_interest, underlying
+    # The CSV needs symbol, expiry, type, strike, bid, ask columns; iv, volume, open_interest, underlying are optional
+    symbols = []
+    symbol_codes = {}
+    spots = {}
+    chunks = {name: [] for name, _ in COLUMNS}
+    chunks['symbol'] = []
+    rows = None
+
+    def flush():
+        # 分块转换为数组，避免千万行时保留大量 Python 对象 / Convert in chunks so 10M-row files do not keep millions of Python objects alive
+        for name, dtype in COLUMNS + (('symbol', np.int64),):
+            chunks[name].append(np.array(rows[name], dtype=dtype))
+
+    with open(csv_path, newline='', encoding='utf-8') as handle:
+        for number, record in enumerate(csv.DictReader(handle)):
+            if number % IMPORT_CHUNK_ROWS == 0:
+                if rows is not None:
+                    flush()
+                rows = {name: [] for name in chunks}
+            symbol = record['symbol'].strip().upper()
+            if symbol not in symbol_codes:
+                symbol_codes[symbol] = len(symbols)
+                symbols.append(symbol)
+            if record.get('underlying'):
+                spots[symbol] = float(record['underlying'])
+            rows['symbol'].append(symbol_codes[symbol])
+            rows['expiry'].append(to_days(record['expiry'].strip()))
+            rows['kind'].append(KIND_CODES[record['type'].strip().lower()])
+            rows['strike'].append(float(record['strike']))
+            rows['bid'].append(_parse_number(record['bid'], np.nan))
+            rows['ask'].append(_parse_number(record['ask'], np.nan))
+            rows['iv'].append(_parse_number(record.get('iv'), np.nan))
+            rows['volume'].append(int(_parse_number(record.get('volume'), 0)))
+            rows['open_interest'].append(int(_parse_number(record.get('open_interest'), 0)))
+    if rows is not None:
+        flush()
+    arrays = {}
+    for name, dtype in COLUMNS + (('symbol', np.int64),):
+        arrays[name] = np.concatenate(chunks[name]) if chunks[name] else np.zeros(0, dtype)
+
+    # 按标的字母序、到期日、类型、执行价排序 / Sort by symbol name, expiry, kind and strike
+    symbol_rank = np.argsort(np.argsort(np.array(symbols, dtype=object))).astype(np.int64)
+    symbol_column = symbol_rank[arrays.pop('symbol')]
+    order = np.lexsort((arrays['strike'], arrays['kind'], arrays['expiry'], symbol_column))
+    symbol_column = symbol_column[order]
+
+    os.makedirs(store_path, exist_ok=True)
+    for name, _ in COLUMNS:
+        np.save(os.path.join(store_path, name + '.npy'), arrays[name][order])
+
+    # 记录每个标的的行区间，以及各到期日（升序）的起始行 / Record the row range of every symbol and the first row of each (sorted) expiry
+    index = {}
+    expiry_column = arrays['expiry'][order]
+    for symbol in sorted(symbols):
+        code = symbol_rank[symbol_codes[symbol]]
+        start, stop = np.searchsorted(symbol_column, [code, code + 1])
+        expiries, first = np.unique(expiry_column[start:stop], return_index=True)
+        index[symbol] = {
+            'rows': [int(start), int(stop)],
+            'spot': spots.get(symbol),
+            'expiries': expiries.tolist(),
+            'bounds': (np.append(first, stop - start) + start).tolist(),
+        }
+    meta = {
+        'as_of': as_of if as_of is not None else datetime.datetime.now().isoformat(timespec='seconds'),
+        'rows': int(len(order)),
+        'symbols': index,
+    }
+    with open(os.path.join(store_path, INDEX_FILE), 'w', encoding='utf-8') as handle:
+        json.dump(meta, handle)
+    return ChainStore(store_path)
+
+
+class ChainStore:
+    def __init__(self, path):
+        # 仅读取索引，数据列在首次访问时内存映射 / Only the index is read; data columns are memory-mapped on first access
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), encoding='utf-8') as handle:
+            meta = json.load(handle)
+        self.as_of = meta['as_of']
+        self.row_count = meta['rows']
+        self._index = meta['symbols']
+        self._columns = None
+        self._expiry_cache = {}
+    
+    @property
+    def columns(self):
+        """内存映射的数据列 / Memory-mapped data columns"""
+        if self._columns is None:
+            self._columns = {
+                name: np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r') for name, _ in COLUMNS
+            }
+        return self._columns
+    
+    def symbols(self):
+        """返回存储中的标的列表 / Return the symbols in the store"""
+        return list(self._index)
+    
+    def __contains__(self, symbol):
+        return symbol.upper() in self._index
+    
+    def spot(self, symbol):
+        """返回标的价格，未知时为 None / Return the underlying price, None when unknown"""
+        return self._index[symbol.upper()]['spot']
+    
+    def expiries(self, symbol):
+        """返回标的的到期日天数数组（升序）/ Return the expiries of a symbol as sorted days since epoch"""
+        return self._expiry_index(symbol)[0]
+    
+    def _expiry_index(self, symbol):
+        # 到期日与行边界数组按标的缓存 / Expiry and row-bound arrays are cached per symbol
+        symbol = symbol.upper()
+        cached = self._expiry_cache.get(symbol)
+        if cached is None:
+            entry = self._index[symbol]
+            cached = (np.array(entry['expiries'], dtype=np.int32), np.array(entry['bounds'], dtype=np.int64))
+            self._expiry_cache[symbol] = cached
+        return cached
+    
+    def chain(self, symbol, expiry=None):
+        """返回标的（或其某一到期日）的期权链视图 / Return the chain view of a symbol, or of one of its expiries"""
+        entry = self._index[symbol.upper()]
+        if expiry is None:
+            start, stop = entry['rows']
+        else:
+            if not isinstance(expiry, (int, np.integer)):
+                expiry = to_days(expiry)
+            expiries, bounds = self._expiry_index(symbol)
+            position = int(np.searchsorted(expiries, expiry))
+            if position == len(expiries) or expiries[position] != expiry:
+                raise KeyError(f"{symbol.upper()} has no expiry {from_days(expiry)}")
+            start, stop = bounds[position], bounds[position + 1]
+        columns = self.columns
+        return OptionChain(symbol.upper(), entry['spot'], *(columns[name][start:stop] for name, _ in COLUMNS))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="导入 CSV 期权链 / Import a CSV option chain")
+    parser.add_argument("csv_path")
+    parser.add_argument("store_path")
+    parser.add_argument("--as-of", help="快照时间 / Snapshot timestamp")
+    arguments = parser.parse_args()
+    store = import_csv(arguments.csv_path, arguments.store_path, arguments.as_of)
+    print(f"{store.row_count} rows, {len(store.symbols())} symbols -> {arguments.store_path}")
@@ -0,0 +1,127 @@
+# cli.py
+# 离线批量推荐命令行：读取 JSON Lines 回答记录，输出 JSON Lines 推荐结果
+# Offline batch recommendation CLI: reads answer records as JSON Lines and writes recommendations as JSON Lines
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import sys
+
+from strategy_selector import SUPPORTED_LANGUAGES, StrategySelector
+
+# 每个进程一个选择器，首次使用时创建 / One selector per process, created on first use
+_selector = None
+
+
+def _get_selector():
+    global _selector
+    if _selector is None:
+        _selector = StrategySelector()
+    return _selector
+
+
+def read_records(stream):
+    """逐行读取非空记录 / Read non-blank record lines one at a time"""
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def chunked(iterable, size):
+    """按固定大小分块 / Split an iterable into fixed-size chunks"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def recommend_chunk(lines, language=None):
+    """为一块输入行生成输出行，可在子进程中运行 / Turn a chunk of input lines into output lines, runnable in a worker process"""
+    selector = _get_selector()
+    records = []
+    errors = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        records.append(record if isinstance(record, dict) else {})
+        errors.append(None if isinstance(record, dict) else 'invalid JSON object')
+
+    try:
+        results = selector.select_strategies_batch(records)
+    except (KeyError, TypeError, ValueError):
+        # 有回答不完整或取值无效的记录时逐行处理，只让出错的行返回错误
+        # With incomplete or invalid records fall back to per-row selection so only bad rows fail
+        results = []
+        for index, record in enumerate(records):
+            try:
+                results.append(selector.select_strategy_ids(record))
+            except KeyError as error:
+                results.append(())
+                errors[index] = errors[index] or f"missing answer: {error.args[0]}"
+            except (TypeError, ValueError) as error:
+                results.append(())
+                errors[index] = errors[index] or f"invalid answers: {error}"
+
+    # 推荐组合种类很少，其 JSON 片段只序列化一次 / There are few distinct recommendations, so their JSON fragments are serialized once
+    fragments = {}
+    output = []
+    for record, strategy_ids, error in zip(records, results, errors):
+        symbol = json.dumps(record.get('symbol'), ensure_ascii=False)
+        if error:
+            output.append(f'{{"symbol": {symbol}, "error": {json.dumps(error)}}}')
+            continue
+        fragment = fragments.get(strategy_ids)
+        if fragment is None:
+            result = {'strategies': list(strategy_ids)}
+            if language:
+                result['names'] = [selector.get_strategy(strategy_id, language)['name'] for strategy_id in strategy_ids]
+            fragment = fragments[strategy_ids] = json.dumps(result, ensure_ascii=False)[1:]
+        output.append(f'{{"symbol": {symbol}, {fragment}')
+    return output
+
+
+def run(source, sink, workers=1, chunk_size=10000, language=None):
+    """流式处理整个输入，内存占用与输入大小无关 / Stream the whole input with memory independent of its size"""
+    chunks = chunked(read_records(source), chunk_size)
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            # 在途分块数量有上限，并按输入顺序输出 / Bound the chunks in flight and write them in input order
+            pending = collections.deque()
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    sink.write('\n'.join(pending.popleft().result()) + '\n')
+                pending.append(executor.submit(recommend_chunk, chunk, language))
+            while pending:
+                sink.write('\n'.join(pending.popleft().result()) + '\n')
+    else:
+        for chunk in chunks:
+            sink.write('\n'.join(recommend_chunk(chunk, language)) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="批量推荐期权策略（JSON Lines 输入输出）/ Batch option strategy recommendations over JSON Lines"
+    )
+    parser.add_argument("input", nargs="?", default="-", help="输入文件，默认为标准输入 / Input file, stdin by default")
+    parser.add_argument("--workers", type=int, default=1, help="工作进程数 / Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="每块记录数 / Records per chunk")
+    parser.add_argument("--language", choices=SUPPORTED_LANGUAGES,
+                        help="同时输出该语言的策略名称 / Also output strategy names in this language")
+    arguments = parser.parse_args(argv)
+
+    source = sys.stdin if arguments.input == "-" else open(arguments.input, encoding='utf-8')
+    try:
+        run(source, sys.stdout, arguments.workers, arguments.chunk_size, arguments.language)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# i18n.py
+# 界面文本表：每种语言一个按消息编号排列的驻留字符串元组，切换语言只需换一张表
+# Interface string table: one tuple of interned strings per language, ordered by message index, so switching language swaps one table
+
+import sys
+
+import catalog
+
+# 已构建的文本表，按目录版本失效 / Built string tables, invalidated by the catalog version
+_tables = {}
+_key_index = {}
+_version = None
+
+
+def _check_version():
+    global _version
+    if _version != catalog.version:
+        _tables.clear()
+        _key_index.clear()
+        _key_index.update((key, index) for index, key in enumerate(catalog.load_structure()['message_keys']))
+        _version = catalog.version
+
+
+def message_index(key):
+    """消息键对应的编号 / Index of a message key"""
+    _check_version()
+    return _key_index[key]
+
+
+def table(language):
+    """某一语言的文本表，首次使用时构建 / String table of one language, built on first use"""
+    _check_version()
+    strings = _tables.get(language)
+    if strings is None:
+        messages = catalog.load_language(language)['messages']
+        # 缺少翻译时在构建时就报错，而不是在显示时 / A missing translation fails when the table is built rather than when it is shown
+        strings = _tables[language] = tuple(sys.intern(messages[key]) for key in _key_index)
+    return strings
+
+
+def text(key, language, **values):
+    """取一条消息，有参数时格式化 / Look up one message, formatting it when values are given"""
+    message = table(language)[message_index(key)]
+    return message.format(**values) if values else message
+
+
+def lookup(key, language, default=None):
+    """取一条可能不存在的消息，例如由回答取值拼出的键 / Look up a message that may not exist, such as a key built from an answer value"""
+    _check_version()
+    index = _key_index.get(key)
+    return default if index is None else table(language)[index]
+
+
+class Bindings:
+    """控件与消息的绑定，切换语言时一次性批量更新 / Bindings from widgets to messages, updated in one batch on language switches"""
+    
+    def __init__(self, language):
+        self.language = language
+        self._bindings = {}
+    
+    def bind(self, widget, key, option='text', **values):
+        """绑定控件选项到消息并立即显示，重复绑定同一选项时替换
+        Bind a widget option to a message and show it at once, replacing an earlier binding of the same option"""
+        index = message_index(key)
+        self._bindings[(widget, option)] = (index, values)
+        message = table(self.language)[index]
+        widget.configure({option: message.format(**values) if values else message})
+    
+    def unbind(self, widget, option='text'):
+        self._bindings.pop((widget, option), None)
+    
+    def apply(self, language):
+        """切换语言并更新所有已绑定控件 / Switch language and update every bound widget"""
+        self.language = language
+        strings = table(language)
+        for (widget, option), (index, values) in self._bindings.items():
+            message = strings[index]
+            widget.configure({option: message.format(**values) if values else message})
@@ -0,0 +1,156 @@
+# instrumentation.py
+# 可选的耗时与计数统计，关闭时几乎没有开销
+# Optional timing and counter instrumentation with next to no overhead while disabled
+#
+# 设置环境变量 OPTION_SELECTOR_METRICS=1 启用；设为文件路径时还会在退出时把统计写入该文件
+# Set OPTION_SELECTOR_METRICS=1 to enable it; set it to a file path to also dump the statistics there on exit
+
+import atexit
+import functools
+import os
+import threading
+import time
+
+ENV_VAR = 'OPTION_SELECTOR_METRICS'
+
+# 是否记录统计，热点路径只检查这一个全局变量 / Whether statistics are recorded; hot paths only check this one global
+enabled = False
+
+_lock = threading.Lock()
+# 名称 -> [次数, 总秒数, 最大秒数] / name -> [count, total seconds, max seconds]
+_spans = {}
+_counters = {}
+_callbacks = []
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """计时区段，用于 with 语句 / A timing span for use in a with statement"""
+    return _Span(name) if enabled else _NULL_SPAN
+
+
+def timed(name):
+    """为函数计时的装饰器 / Decorator timing a function
+    
+    是否包装在导入时决定：未通过环境变量启用时原样返回函数，热点路径没有任何额外开销；
+    运行中调用 enable() 只影响 span() 与 count()。
+    Whether to wrap is decided at import time: unless enabled through the environment variable the function is
+    returned unchanged, so hot paths pay nothing; calling enable() later only affects span() and count().
+    """
+    def decorate(function):
+        if not enabled:
+            return function
+        
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def record(name, seconds):
+    """记录一次区段耗时并通知订阅者 / Record one span duration and notify the subscribers"""
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            _spans[name] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds > stats[2]:
+                stats[2] = seconds
+    for callback in _callbacks:
+        callback(name, seconds)
+
+
+def count(name, amount=1):
+    """计数器加一（或加 amount）/ Increment a counter by one, or by amount"""
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def subscribe(callback):
+    """每个区段结束时调用 callback(name, seconds) / Call callback(name, seconds) whenever a span ends"""
+    _callbacks.append(callback)
+
+
+def unsubscribe(callback):
+    _callbacks.remove(callback)
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def snapshot():
+    """当前统计的副本，时间以毫秒为单位 / A copy of the current statistics, times in milliseconds"""
+    with _lock:
+        return {
+            'spans': {
+                name: {'count': calls, 'total_ms': total * 1000.0, 'mean_ms': total * 1000.0 / calls, 'max_ms': longest * 1000.0}
+                for name, (calls, total, longest) in sorted(_spans.items())
+            },
+            'counters': dict(sorted(_counters.items())),
+        }
+
+
+def dump(path):
+    """把统计写成 JSON 文件 / Write the statistics to a JSON file"""
+    import json
+    
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        json.dump(snapshot(), handle, indent=2)
+        handle.write('\n')
+    os.replace(temporary, path)
+
+
+_setting = os.environ.get(ENV_VAR, '')
+if _setting and _setting != '0':
+    enable()
+    if _setting != '1':
+        atexit.register(dump, _setting)
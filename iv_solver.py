@@ -0,0 +1,97 @@
+# iv_solver.py
+# 向量化隐含波动率求解：整条期权链一次求解，没有逐合约的 Python 循环
+# Vectorized implied-volatility solver: a whole chain is solved at once with no Python loop over contracts
+
+import numpy as np
+
+from payoff import PUT
+from pricing import norm_cdf, norm_pdf
+
+# 求解区间 / Solver bracket
+MIN_VOL = 1e-4
+MAX_VOL = 5.0
+
+# 波动率收敛容差与最大迭代次数 / Vol convergence tolerance and iteration cap
+VOL_TOLERANCE = 1e-8
+MAX_ITERATIONS = 64
+
+
+def _price_vega(phi, forward_spot, present_strike, log_ratio, sqrt_t, vol):
+    # 只计算价格与 vega 的 Black-Scholes / Black-Scholes reduced to price and vega
+    deviation = vol * sqrt_t
+    d1 = (log_ratio + 0.5 * deviation * deviation) / deviation
+    d2 = d1 - deviation
+    price = phi * (forward_spot * norm_cdf(phi * d1) - present_strike * norm_cdf(phi * d2))
+    return price, forward_spot * norm_pdf(d1) * sqrt_t
+
+
+def implied_vol(kind, price, spot, strike, t, rate=0.0, dividend=0.0, tolerance=VOL_TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """由期权价格反解隐含波动率，参数可为任意可广播的数组；无解（超出无套利区间、已到期、解超出求解区间、未收敛）时为 NaN
+    Invert option prices to implied vols over broadcastable arrays; NaN where there is no solution
+    (outside no-arbitrage bounds, expired, root outside the solver bracket, not converged)
+    
+    每个元素维护一个包含解的区间：牛顿步落在区间内时采用，否则取区间中点，
+    已收敛的元素从活动集合中移除，之后的迭代只计算其余元素。
+    Each element keeps a bracket around its root: the Newton step is taken when it lands inside, the midpoint otherwise,
+    and converged elements leave the active set so later iterations only touch the rest.
+    """
+    kind, price, spot, strike, t, rate, dividend = np.broadcast_arrays(
+        np.asarray(kind), *(np.asarray(value, dtype=float) for value in (price, spot, strike, t, rate, dividend))
+    )
+    shape = price.shape
+    kind, price, spot, strike, t, rate, dividend = (value.ravel() for value in (kind, price, spot, strike, t, rate, dividend))
+    result = np.full(price.shape, np.nan)
+    
+    phi = np.where(kind == PUT, -1.0, 1.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        forward_spot = spot * np.exp(-dividend * t)
+        present_strike = strike * np.exp(-rate * t)
+        # 价格须严格位于内在价值与上界之间 / The price must lie strictly between intrinsic value and its upper bound
+        intrinsic = np.maximum(phi * (forward_spot - present_strike), 0.0)
+        upper = np.where(phi > 0, forward_spot, present_strike)
+        valid = (t > 0) & (strike > 0) & (spot > 0) & (price > intrinsic) & (price < upper) & np.isfinite(price)
+    
+    active = np.flatnonzero(valid)
+    phi, forward_spot, present_strike, target = phi[active], forward_spot[active], present_strike[active], price[active]
+    log_ratio = np.log(forward_spot / present_strike)
+    sqrt_t = np.sqrt(t[active])
+    
+    # Brenner-Subrahmanyam 近似作为初值 / Brenner-Subrahmanyam approximation as the starting point
+    vol = np.clip(np.sqrt(2.0 * np.pi) / sqrt_t * (target - 0.5 * intrinsic[active]) / forward_spot, 0.05, 2.0)
+    low = np.full(active.shape, MIN_VOL)
+    high = np.full(active.shape, MAX_VOL)
+    
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+        model, vega = _price_vega(phi, forward_spot, present_strike, log_ratio, sqrt_t, vol)
+        difference = model - target
+        # 价格随波动率单调递增，据此收紧区间 / Price increases with vol, which tightens the bracket
+        above = difference > 0
+        high = np.where(above, vol, high)
+        low = np.where(above, low, vol)
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = vol - difference / vega
+        inside = (newton > low) & (newton < high) & np.isfinite(newton)
+        step = np.where(inside, newton, 0.5 * (low + high))
+        done = (np.abs(step - vol) < tolerance) | (high - low < tolerance)
+        vol = step
+        
+        if done.any():
+            # 收敛到区间端点说明解在 [MIN_VOL, MAX_VOL] 之外，记为无解 / Converging onto a bracket end means the root lies outside [MIN_VOL, MAX_VOL], so there is no solution
+            pinned = (vol <= MIN_VOL + tolerance) | (vol >= MAX_VOL - tolerance)
+            result[active[done]] = np.where(pinned[done], np.nan, vol[done])
+            keep = ~done
+            active, phi, forward_spot, present_strike, target = active[keep], phi[keep], forward_spot[keep], present_strike[keep], target[keep]
+            log_ratio, sqrt_t, vol, low, high = log_ratio[keep], sqrt_t[keep], vol[keep], low[keep], high[keep]
+    
+    # 达到迭代上限仍未收敛的元素保持 NaN / Elements still unconverged at the iteration cap stay NaN
+    return result.reshape(shape)
+
+
+def chain_implied_vols(chain, as_of, rate=0.0, dividend=0.0):
+    """由买卖中间价求解整条期权链的隐含波动率 / Solve implied vols for a whole chain from bid/ask mids"""
+    mid = (chain.bid.astype(float) + chain.ask.astype(float)) / 2.0
+    t = (chain.expiry.astype(float) - as_of) / 365.0
+    return implied_vol(chain.kind, mid, chain.spot if chain.spot is not None else np.nan, chain.strike, t, rate, dividend)
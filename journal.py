@@ -0,0 +1,263 @@
+# journal.py
+# 只追加的二进制会话日志：界面线程只打包记录，后台线程批量写入并 fsync；读取时内存映射整个文件
+# Append-only binary session journal: the UI thread only packs records, a background thread writes them and fsyncs in batches;
+# readers memory-map the whole file
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+import catalog
+from strategy_selector import SUPPORTED_LANGUAGES
+
+# 默认日志位置 / Default journal location
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.expanduser('~'), '.option-strategy-selector', 'sessions.journal')
+
+# 文件头：魔数、格式版本、JSON 元数据长度，随后是 JSON 元数据（记录代码表）
+# File header: magic, format version, JSON metadata length, then the JSON metadata holding the code tables
+MAGIC = b'OSSJ'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sHI')
+
+# 每条记录定长：毫秒时间戳、标的代码、各问题的选项序号（-1 为未回答）、语言序号、推荐数量、推荐策略序号
+# Fixed-size records: timestamp in ms, symbol, option index per question (-1 unanswered), language index, recommendation count, strategy indexes
+MAX_QUESTIONS = 8
+MAX_STRATEGIES = 6
+SYMBOL_BYTES = 12
+_RECORD = struct.Struct(f'<q{SYMBOL_BYTES}s{MAX_QUESTIONS}bBB{MAX_STRATEGIES}B')
+NO_STRATEGY = 255
+
+# 批量 fsync 的条件：累计记录数或距上次同步的秒数 / Batched fsync triggers: records since the last sync, or seconds since it
+SYNC_RECORDS = 256
+SYNC_SECONDS = 1.0
+
+
+def _metadata():
+    structure = catalog.load_structure()
+    return {
+        'questions': [[question_id, list(values)] for question_id, values in zip(structure['question_ids'], structure['option_values'])],
+        'strategies': list(structure['strategy_ids']),
+        'languages': list(SUPPORTED_LANGUAGES),
+    }
+
+
+def record_dtype():
+    """与记录结构一致的 NumPy 结构化类型 / NumPy structured dtype matching the record layout"""
+    import numpy as np
+    
+    return np.dtype([
+        ('timestamp', '<i8'),
+        ('symbol', f'S{SYMBOL_BYTES}'),
+        ('answers', 'i1', (MAX_QUESTIONS,)),
+        ('language', 'u1'),
+        ('count', 'u1'),
+        ('strategies', 'u1', (MAX_STRATEGIES,)),
+    ])
+
+
+class JournalWriter:
+    """会话日志写入器，append 可在界面线程调用且不做磁盘 IO / Session journal writer whose append does no disk IO and is safe on the UI thread"""
+    
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, sync_records=SYNC_RECORDS, sync_seconds=SYNC_SECONDS):
+        self.path = path
+        self.sync_records = sync_records
+        self.sync_seconds = sync_seconds
+        
+        metadata = _metadata()
+        self._question_codes = [(question_id, {value: code for code, value in enumerate(values)})
+                                for question_id, values in metadata['questions']]
+        self._strategy_codes = {strategy_id: code for code, strategy_id in enumerate(metadata['strategies'])}
+        self._language_codes = {language: code for code, language in enumerate(metadata['languages'])}
+        if len(self._question_codes) > MAX_QUESTIONS or len(self._strategy_codes) >= NO_STRATEGY:
+            raise ValueError("catalog too large for the journal record format")
+        self._metadata = metadata
+        
+        # 文件在后台线程中打开，构造写入器不做磁盘 IO；打开或写入失败时错误保存在 error 中，之后的记录被丢弃
+        # The file is opened on the background thread so constructing the writer does no disk IO;
+        # an opening or writing failure is kept in `error` and later records are discarded
+        self.error = None
+        self._file = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name='session-journal', daemon=True)
+        self._thread.start()
+    
+    def append(self, symbol, answers, language, strategy_ids, timestamp=None):
+        """打包一条会话记录并交给后台线程 / Pack one session record and hand it to the background thread"""
+        milliseconds = int((time.time() if timestamp is None else timestamp) * 1000)
+        codes = [codes.get(answers.get(question_id), -1) for question_id, codes in self._question_codes]
+        codes += [-1] * (MAX_QUESTIONS - len(codes))
+        strategies = [self._strategy_codes[strategy_id] for strategy_id in strategy_ids][:MAX_STRATEGIES]
+        count = len(strategies)
+        strategies += [NO_STRATEGY] * (MAX_STRATEGIES - count)
+        self._queue.put(_RECORD.pack(milliseconds, symbol.upper().encode('ascii', 'replace')[:SYMBOL_BYTES], *codes,
+                                     self._language_codes.get(language, 255), count, *strategies))
+    
+    def _open(self):
+        # 打开或创建日志文件并定位到最后一条完整记录之后 / Open or create the journal and position it after the last complete record
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            existing, offset = read_header(self.path)
+            if existing != self._metadata:
+                # 代码表不同的记录无法混在同一文件中 / Records with different code tables cannot share one file
+                raise ValueError(f"{self.path} was written with a different catalog; use a new journal file")
+            self._file = open(self.path, 'r+b')
+            # 截掉中断写入留下的半条记录，否则之后的记录全部错位
+            # Cut off a half record left by an interrupted write, otherwise every later record would be misaligned
+            size = self._file.seek(0, os.SEEK_END)
+            complete = offset + (size - offset) // _RECORD.size * _RECORD.size
+            if complete != size:
+                self._file.truncate(complete)
+                os.fsync(self._file.fileno())
+            self._file.seek(complete)
+        else:
+            self._file = open(self.path, 'wb')
+            payload = json.dumps(self._metadata, separators=(',', ':')).encode('utf-8')
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(payload)) + payload)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def _write_loop(self):
+        stopped = False
+        try:
+            self._open()
+            pending = 0
+            last_sync = time.monotonic()
+            while not stopped:
+                # 一次取出队列中已有的全部记录，直到关闭标记 None / Take every record already queued in one go, up to the closing None
+                chunks = []
+                try:
+                    record = self._queue.get(timeout=self.sync_seconds)
+                    while record is not None:
+                        chunks.append(record)
+                        record = self._queue.get_nowait()
+                    stopped = True
+                except queue.Empty:
+                    pass
+                if chunks:
+                    self._file.write(b''.join(chunks))
+                    pending += len(chunks)
+                if pending and (stopped or pending >= self.sync_records or time.monotonic() - last_sync >= self.sync_seconds):
+                    self._sync()
+                    pending = 0
+                    last_sync = time.monotonic()
+        except (OSError, ValueError) as error:
+            # 日志不可用：丢弃之后的全部记录直到关闭 / Unusable journal: discard every later record until closed
+            self.error = error
+            if not stopped:
+                while self._queue.get() is not None:
+                    pass
+    
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        """写完剩余记录、同步并关闭文件；日志无法打开或写入时抛出该错误 / Write the remaining records, sync and close; re-raises an opening or writing error"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as error:
+                # 写入失败后缓冲区中的数据可能再次写入失败，保留最先的错误 / Buffered data may fail again after a write error; keep the first error
+                if self.error is None:
+                    self.error = error
+        if self.error is not None:
+            raise self.error
+
+
+def read_header(path):
+    """读取日志的元数据和记录起始偏移 / Read a journal's metadata and the offset of its first record"""
+    with open(path, 'rb') as handle:
+        head = handle.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} session journal")
+        magic, version, length = _HEADER.unpack(head)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} session journal")
+        payload = handle.read(length)
+        if len(payload) < length:
+            raise ValueError(f"{path} has a truncated header")
+        return json.loads(payload.decode('utf-8')), _HEADER.size + length
+
+
+def open_journal(path):
+    """内存映射全部完整记录，返回 (元数据, 结构化数组) / Memory-map every complete record, returning (metadata, structured array)"""
+    import numpy as np
+    
+    metadata, offset = read_header(path)
+    # 末尾可能有写了一半的记录，只映射完整部分 / A half-written record may trail the file; only complete ones are mapped
+    count = (os.path.getsize(path) - offset) // _RECORD.size
+    if count == 0:
+        return metadata, np.zeros(0, dtype=record_dtype())
+    return metadata, np.memmap(path, dtype=record_dtype(), mode='r', offset=offset, shape=(count,))
+
+
+def replay(path):
+    """按写入顺序逐条解码会话 / Decode the sessions one at a time in write order"""
+    metadata, records = open_journal(path)
+    questions = metadata['questions']
+    for record in records:
+        answers = {question_id: values[code]
+                   for (question_id, values), code in zip(questions, record['answers'].tolist()) if code >= 0}
+        language = int(record['language'])
+        yield {
+            'timestamp': int(record['timestamp']) / 1000.0,
+            'symbol': record['symbol'].decode('ascii', 'replace'),
+            'answers': answers,
+            'language': metadata['languages'][language] if language < len(metadata['languages']) else None,
+            'strategies': [metadata['strategies'][code] for code in record['strategies'][:record['count']].tolist()],
+        }
+
+
+def aggregate(path, start=None, end=None):
+    """在内存映射的数组上统计会话，start/end 为 Unix 秒 / Aggregate sessions over the memory-mapped array; start/end are Unix seconds"""
+    import numpy as np
+    
+    metadata, records = open_journal(path)
+    if start is not None or end is not None:
+        timestamps = records['timestamp']
+        keep = np.ones(len(records), dtype=bool)
+        if start is not None:
+            keep &= timestamps >= int(start * 1000)
+        if end is not None:
+            keep &= timestamps < int(end * 1000)
+        records = records[keep]
+    
+    strategies = records['strategies'].ravel()
+    strategy_counts = np.bincount(strategies[strategies != NO_STRATEGY], minlength=len(metadata['strategies']))
+    answer_counts = {}
+    for column, (question_id, values) in enumerate(metadata['questions']):
+        codes = records['answers'][:, column]
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        answer_counts[question_id] = dict(zip(values, counts.tolist()))
+    symbols, symbol_counts = np.unique(records['symbol'], return_counts=True)
+    languages = np.bincount(records['language'], minlength=len(metadata['languages']))
+    return {
+        'sessions': int(len(records)),
+        'strategies': dict(zip(metadata['strategies'], strategy_counts.tolist())),
+        'answers': answer_counts,
+        'symbols': {symbol.decode('ascii', 'replace'): int(count) for symbol, count in zip(symbols.tolist(), symbol_counts.tolist())},
+        'languages': dict(zip(metadata['languages'], languages[:len(metadata['languages'])].tolist())),
+        'first': int(records['timestamp'].min()) / 1000.0 if len(records) else None,
+        'last': int(records['timestamp'].max()) / 1000.0 if len(records) else None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="会话日志统计与回放 / Session journal statistics and replay")
+    parser.add_argument("path", nargs="?", default=DEFAULT_JOURNAL_PATH)
+    parser.add_argument("--replay", action="store_true", help="以 JSON Lines 输出全部会话 / Print every session as JSON Lines")
+    arguments = parser.parse_args()
+    if arguments.replay:
+        for session in replay(arguments.path):
+            print(json.dumps(session, ensure_ascii=False))
+    else:
+        print(json.dumps(aggregate(arguments.path), ensure_ascii=False, indent=2))
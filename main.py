@@ -2,11 +2,14 @@
 # 期权策略选择器UI界面 / Option Strategy Selector UI
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+import i18n
+import instrumentation
 from strategy_selector import StrategySelector
 
+# messagebox 与结果视图在首次使用时才导入 / messagebox and the result view are imported on first use
+
 class OptionStrategyApp:
-    def __init__(self, root):
+    def __init__(self, root, chain_store=None, journal_path=None):
         self.root = root
         self.root.title("期权策略选择器 / Option Strategy Selector")
         self.root.geometry("900x700")
@@ -15,6 +18,15 @@ class OptionStrategyApp:
         # 初始化语言设置 / Initialize language setting
         self.language = "cn"  # 默认使用中文 / Default to Chinese
         
+        # 本地期权链存储（可选）/ Local option-chain store (optional)
+        self.chain_store = chain_store
+        
+        # 会话日志（可选），文件由日志的后台线程打开和写入 / Session journal (optional); its background thread opens and writes the file
+        self.journal = None
+        if journal_path:
+            from journal import JournalWriter
+            self.journal = JournalWriter(journal_path)
+        
         # 初始化策略选择器 / Initialize strategy selector
         self.strategy_selector = StrategySelector(self.language)
         self.questions = self.strategy_selector.get_questions()
@@ -25,6 +37,12 @@ class OptionStrategyApp:
         # 当前问题索引 / Current question index
         self.current_question_index = 0
         
+        # 后台任务执行器，首次显示结果时创建 / Background task runner, created the first time results are shown
+        self.worker = None
+        
+        # 界面文本绑定，切换语言时批量更新 / Interface text bindings, updated in one batch on language switches
+        self.texts = i18n.Bindings(self.language)
+        
         # 创建UI组件 / Create UI components
         self.create_widgets()
         
@@ -46,66 +64,44 @@ class OptionStrategyApp:
                                   width=5)
         self.lang_button.pack(side=tk.RIGHT, padx=10)
         
-        # 标题文本 / Title text
-        self.title_texts = {
-            "cn": "美股期权策略选择器",
-            "en": "US Stock Option Strategy Selector"
-        }
-        
-        # 副标题文本 / Subtitle text
-        self.subtitle_texts = {
-            "cn": "根据您的市场观点推荐适合的期权策略",
-            "en": "Recommending suitable option strategies based on your market view"
-        }
-        
+        # 标题与副标题 / Title and subtitle
         self.title_label = tk.Label(title_frame, 
-                              text=self.title_texts[self.language], 
                               font=("Arial", 18, "bold"), 
                               fg="white", 
                               bg="#2c3e50")
         self.title_label.pack()
+        self.texts.bind(self.title_label, 'app.title')
         
         self.subtitle_label = tk.Label(title_frame, 
-                                text=self.subtitle_texts[self.language], 
                                 font=("Arial", 12), 
                                 fg="#ecf0f1", 
                                 bg="#2c3e50")
         self.subtitle_label.pack(pady=5)
+        self.texts.bind(self.subtitle_label, 'app.subtitle')
         
         # 标的输入框架 / Symbol input frame
         input_frame = tk.Frame(self.root, bg="#f0f0f0", padx=20, pady=10)
         input_frame.pack(fill=tk.X)
         
-        # 标的输入标签文本 / Symbol input label text
-        self.symbol_label_texts = {
-            "cn": "请输入美股标的代码:",
-            "en": "Enter US stock symbol:"
-        }
-        
+        # 标的输入标签 / Symbol input label
         self.symbol_label = tk.Label(input_frame, 
-                              text=self.symbol_label_texts[self.language], 
                               font=("Arial", 12), 
                               bg="#f0f0f0")
         self.symbol_label.pack(side=tk.LEFT, padx=5)
+        self.texts.bind(self.symbol_label, 'input.symbol')
         
         self.symbol_entry = tk.Entry(input_frame, font=("Arial", 12), width=10)
         self.symbol_entry.pack(side=tk.LEFT, padx=5)
         self.symbol_entry.insert(0, "NVDA")  # 默认值 / Default value
         
         # 问题框架 / Question frame
-        # 问题框架标题文本 / Question frame title text
-        self.question_frame_texts = {
-            "cn": "市场观点",
-            "en": "Market View"
-        }
-        
         self.question_frame = tk.LabelFrame(self.root, 
-                                         text=self.question_frame_texts[self.language], 
                                          font=("Arial", 12, "bold"), 
                                          bg="#f0f0f0", 
                                          padx=20, 
                                          pady=15)
         self.question_frame.pack(fill=tk.X, padx=20, pady=10)
+        self.texts.bind(self.question_frame, 'frame.question')
         
         # 问题标签
         self.question_label = tk.Label(self.question_frame, 
@@ -115,58 +111,111 @@ class OptionStrategyApp:
                                     bg="#f0f0f0")
         self.question_label.pack(anchor=tk.W, pady=5)
         
-        # 选项框架
+        # 选项框架，单选按钮在各问题之间复用 / Options frame; the radio buttons are reused across questions
         self.options_frame = tk.Frame(self.question_frame, bg="#f0f0f0")
         self.options_frame.pack(fill=tk.X, pady=5)
+        self.option_var = tk.StringVar()
+        self.option_buttons = []
         
         # 导航按钮框架 / Navigation button frame
         nav_frame = tk.Frame(self.root, bg="#f0f0f0", padx=20, pady=10)
         nav_frame.pack(fill=tk.X)
         
-        # 按钮文本 / Button texts
-        self.button_texts = {
-            "cn": {"prev": "上一步", "next": "下一步", "get_recommendation": "获取推荐", "restart": "重新开始"},
-            "en": {"prev": "Previous", "next": "Next", "get_recommendation": "Get Recommendation", "restart": "Restart"}
-        }
-        
         self.prev_button = tk.Button(nav_frame, 
-                                   text=self.button_texts[self.language]["prev"], 
                                    font=("Arial", 11), 
                                    command=self.prev_question, 
                                    state=tk.DISABLED,
                                    padx=10)
         self.prev_button.pack(side=tk.LEFT, padx=5)
+        self.texts.bind(self.prev_button, 'button.prev')
         
         self.next_button = tk.Button(nav_frame, 
-                                   text=self.button_texts[self.language]["next"], 
                                    font=("Arial", 11), 
                                    command=self.next_question, 
                                    padx=10)
         self.next_button.pack(side=tk.LEFT, padx=5)
+        self.texts.bind(self.next_button, 'button.next')
         
-        # 结果框架 / Result frame
-        # 结果框架标题文本 / Result frame title text
-        self.result_frame_texts = {
-            "cn": "推荐策略",
-            "en": "Recommended Strategies"
-        }
-        
-        self.result_frame = tk.LabelFrame(self.root, 
-                                       text=self.result_frame_texts[self.language], 
-                                       font=("Arial", 12, "bold"), 
-                                       bg="#f0f0f0", 
-                                       padx=20, 
-                                       pady=15)
-        # 初始不显示结果框架 / Initially don't show result frame
+        # 结果框架在首次显示结果时才创建 / The result frame is created the first time results are shown
+        self.result_frame = None
         
         # 重置按钮 / Reset button
         self.reset_button = tk.Button(nav_frame, 
-                                    text=self.button_texts[self.language]["restart"], 
                                     font=("Arial", 11), 
                                     command=self.reset_app, 
                                     padx=10)
         self.reset_button.pack(side=tk.RIGHT, padx=5)
+        self.texts.bind(self.reset_button, 'button.restart')
     
+    def create_result_frame(self):
+        # 结果框架及其控件只创建一次，之后每次显示结果只更新文本
+        # The result frame and its widgets are created once; later results only update their texts
+        if self.result_frame is not None:
+            return self.result_frame
+        
+        from result_view import ResultList
+        
+        self.result_frame = tk.LabelFrame(self.root, 
+                                       font=("Arial", 12, "bold"), 
+                                       bg="#f0f0f0", 
+                                       padx=20, 
+                                       pady=15)
+        self.texts.bind(self.result_frame, 'frame.result')
+        
+        # 标的信息 / Symbol information
+        self.result_symbol_label = tk.Label(self.result_frame, 
+                                          font=("Arial", 14, "bold"), 
+                                          bg="#f0f0f0")
+        self.result_symbol_label.pack(anchor=tk.W, pady=5)
+        
+        # 本地期权链概况，仅在有存储时显示 / Local option chain summary, only shown with a store
+        self.chain_label = tk.Label(self.result_frame, 
+                                  font=("Arial", 11), 
+                                  bg="#f0f0f0")
+        
+        # 市场观点摘要 / Market view summary
+        self.view_frame = tk.Frame(self.result_frame, bg="#e1e1e1", padx=15, pady=10)
+        self.view_frame.pack(fill=tk.X, pady=10)
+        
+        self.view_title = tk.Label(self.view_frame, 
+                                 font=("Arial", 12, "bold"), 
+                                 bg="#e1e1e1")
+        self.view_title.pack(anchor=tk.W)
+        
+        self.view_summary = tk.Label(self.view_frame, 
+                                   font=("Arial", 11), 
+                                   justify=tk.LEFT, 
+                                   bg="#e1e1e1")
+        self.view_summary.pack(anchor=tk.W, pady=5)
+        
+        # 推荐策略数量 / Recommended strategy count
+        self.strategy_count_label = tk.Label(self.result_frame, 
+                                          font=("Arial", 12, "bold"), 
+                                          bg="#f0f0f0")
+        self.strategy_count_label.pack(anchor=tk.W, pady=5)
+        
+        # 没有推荐策略时的提示 / Message shown when nothing is recommended
+        self.no_strategy_label = tk.Label(self.result_frame, 
+                                       font=("Arial", 12), 
+                                       bg="#f0f0f0")
+        
+        # 后台计算进度 / Background computation progress
+        from tkinter import ttk
+        self.progress_frame = tk.Frame(self.result_frame, bg="#f0f0f0")
+        self.progress_label = tk.Label(self.progress_frame, 
+                                     font=("Arial", 11), 
+                                     bg="#f0f0f0")
+        self.progress_label.pack(side=tk.LEFT)
+        self.texts.bind(self.progress_label, 'status.computing')
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="indeterminate", length=200)
+        self.progress_bar.pack(side=tk.LEFT, padx=10)
+        
+        # 策略卡片列表 / Strategy card list
+        self.result_list = ResultList(self.result_frame)
+        self.result_list.frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        return self.result_frame
+    
+    @instrumentation.timed('ui.switch_language')
     def toggle_language(self):
         # 切换语言 / Toggle language
         self.language = "en" if self.language == "cn" else "cn"
@@ -177,55 +226,48 @@ class OptionStrategyApp:
         # 更新问题列表 / Update question list
         self.questions = self.strategy_selector.get_questions()
         
-        # 更新UI文本 / Update UI texts
-        self.title_label.config(text=self.title_texts[self.language])
-        self.subtitle_label.config(text=self.subtitle_texts[self.language])
-        self.symbol_label.config(text=self.symbol_label_texts[self.language])
-        self.question_frame.config(text=self.question_frame_texts[self.language])
-        self.result_frame.config(text=self.result_frame_texts[self.language])
+        # 所有绑定的界面文本一次批量更新 / Update every bound interface text in one batch
+        self.texts.apply(self.language)
         
-        # 更新按钮文本 / Update button texts
-        self.prev_button.config(text=self.button_texts[self.language]["prev"])
-        self.reset_button.config(text=self.button_texts[self.language]["restart"])
+        # 更新当前问题文本，保留尚未提交的选择 / Update the current question's texts, keeping an unsubmitted choice
+        self.update_question_texts()
         
-        # 更新下一步按钮文本 / Update next button text
-        if self.current_question_index == len(self.questions) - 1:
-            self.next_button.config(text=self.button_texts[self.language]["get_recommendation"])
-        else:
-            self.next_button.config(text=self.button_texts[self.language]["next"])
+        # 正在显示结果时按新语言重新生成 / Regenerate the results in the new language while they are shown
+        if self.result_frame is not None and self.result_frame.winfo_manager():
+            self.show_results()
+    
+    def update_question_texts(self):
+        # 更新问题与选项文本，复用已有的单选按钮 / Update the question and option texts, reusing the existing radio buttons
+        question = self.questions[self.current_question_index]
+        self.question_label.config(text=question['text'])
         
-        # 刷新当前问题 / Refresh current question
-        self.show_current_question()
+        options = question['options']
+        while len(self.option_buttons) < len(options):
+            self.option_buttons.append(tk.Radiobutton(self.options_frame, 
+                                                    variable=self.option_var, 
+                                                    font=("Arial", 11), 
+                                                    bg="#f0f0f0",
+                                                    padx=10,
+                                                    pady=5))
+        # 多余的按钮只隐藏；隐藏的总是末尾几个，重新显示时顺序不变
+        # Surplus buttons are only hidden; they are always the trailing ones, so re-showing keeps the order
+        for position, button in enumerate(self.option_buttons):
+            if position < len(options):
+                button.config(text=options[position]['text'], value=options[position]['value'])
+                if not button.winfo_manager():
+                    button.pack(anchor=tk.W)
+            elif button.winfo_manager():
+                button.pack_forget()
     
     def show_current_question(self):
-        # 清空选项框架 / Clear options frame
-        for widget in self.options_frame.winfo_children():
-            widget.destroy()
-        
         # 获取当前问题 / Get current question
         question = self.questions[self.current_question_index]
         
-        # 设置问题文本 / Set question text
-        self.question_label.config(text=question['text'])
-        
-        # 创建单选按钮变量 / Create radio button variable
-        self.option_var = tk.StringVar()
-        
         # 如果之前已回答过此问题，设置默认值 / If this question has been answered before, set default value
-        if question['id'] in self.answers:
-            self.option_var.set(self.answers[question['id']])
-        
-        # 添加选项 / Add options
-        for option in question['options']:
-            rb = tk.Radiobutton(self.options_frame, 
-                              text=option['text'], 
-                              variable=self.option_var, 
-                              value=option['value'], 
-                              font=("Arial", 11), 
-                              bg="#f0f0f0",
-                              padx=10,
-                              pady=5)
-            rb.pack(anchor=tk.W)
+        self.option_var.set(self.answers.get(question['id'], ''))
+        
+        # 设置问题与选项文本 / Set question and option texts
+        self.update_question_texts()
         
         # 更新导航按钮状态 / Update navigation button state
         if self.current_question_index == 0:
@@ -234,9 +276,9 @@ class OptionStrategyApp:
             self.prev_button.config(state=tk.NORMAL)
         
         if self.current_question_index == len(self.questions) - 1:
-            self.next_button.config(text=self.button_texts[self.language]["get_recommendation"])
+            self.texts.bind(self.next_button, 'button.get_recommendation')
         else:
-            self.next_button.config(text=self.button_texts[self.language]["next"])
+            self.texts.bind(self.next_button, 'button.next')
     
     def next_question(self):
         # 获取当前问题
@@ -244,321 +286,166 @@ class OptionStrategyApp:
         
         # 检查是否已选择选项
         if not self.option_var.get():
-            messagebox.showwarning("提示", "请选择一个选项")
+            from tkinter import messagebox
+            messagebox.showwarning(i18n.text('warning.title', self.language), i18n.text('warning.choose_option', self.language))
             return
         
         # 保存回答
         self.answers[question['id']] = self.option_var.get()
         
-        # 如果是最后一个问题，显示结果
+        # 如果是最后一个问题，显示结果，并把完成的问卷写入日志（切换语言重新显示结果时不再记录）
+        # On the last question show the results and journal the completed questionnaire (not again when a language switch re-renders)
         if self.current_question_index == len(self.questions) - 1:
-            self.show_results()
+            symbol = self.show_results()
+            if symbol is not None:
+                self.record_session(symbol)
         else:
             # 否则，显示下一个问题
             self.current_question_index += 1
             self.show_current_question()
     
     def prev_question(self):
-        if self.current_question_index > 0:
+        self.cancel_background_work()
+        if self.result_frame is not None and self.result_frame.winfo_manager():
+            # 在结果页时回到最后一个问题，保留已有回答 / From the results page return to the last question, keeping the answers
+            self.result_frame.pack_forget()
+            self.question_frame.pack(fill=tk.X, padx=20, pady=10)
+            self.next_button.config(command=self.next_question)
+            self.show_current_question()
+        elif self.current_question_index > 0:
             self.current_question_index -= 1
             self.show_current_question()
     
+    @instrumentation.timed('ui.show_results')
     def show_results(self):
+        # 显示结果页，返回标的代码，未填写代码时返回 None / Show the results page, returning the symbol or None when it is missing
         # 获取标的代码 / Get symbol code
         symbol = self.symbol_entry.get().upper()
         if not symbol:
-            # 警告消息文本 / Warning message text
-            warning_texts = {
-                "cn": "请输入标的代码",
-                "en": "Please enter a stock symbol"
-            }
-            messagebox.showwarning("提示 / Tip", warning_texts[self.language])
-            return
+            from tkinter import messagebox
+            messagebox.showwarning(i18n.text('warning.title', self.language), i18n.text('warning.symbol', self.language))
+            return None
         
         # 隐藏问题框架 / Hide question frame
         self.question_frame.pack_forget()
         
         # 显示结果框架 / Show result frame
+        self.create_result_frame()
         self.result_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # 清空结果框架 / Clear result frame
-        for widget in self.result_frame.winfo_children():
-            widget.destroy()
-        
-        # 获取推荐策略
-        recommended_strategies = self.strategy_selector.select_strategies(self.answers)
-        
-        # 显示标的信息 / Show symbol information
-        # 标的标签文本 / Symbol label text
-        symbol_texts = {
-            "cn": f"标的: {symbol}",
-            "en": f"Symbol: {symbol}"
-        }
-        
-        symbol_label = tk.Label(self.result_frame, 
-                              text=symbol_texts[self.language], 
-                              font=("Arial", 14, "bold"), 
-                              bg="#f0f0f0")
-        symbol_label.pack(anchor=tk.W, pady=5)
-        
-        # 显示市场观点摘要 / Show market view summary
-        view_frame = tk.Frame(self.result_frame, bg="#e1e1e1", padx=15, pady=10)
-        view_frame.pack(fill=tk.X, pady=10)
-        
-        # 市场观点标题文本 / Market view title text
-        view_title_texts = {
-            "cn": "您的市场观点:",
-            "en": "Your Market View:"
-        }
-        
-        view_title = tk.Label(view_frame, 
-                            text=view_title_texts[self.language], 
-                            font=("Arial", 12, "bold"), 
-                            bg="#e1e1e1")
-        view_title.pack(anchor=tk.W)
-        
-        # 市场观点映射 / Market view mapping
-        market_view_map = {
-            'cn': {
-                'bullish': '看涨',
-                'bearish': '看跌',
-                'neutral': '中性',
-                'uncertain': '不确定'
-            },
-            'en': {
-                'bullish': 'Bullish',
-                'bearish': 'Bearish',
-                'neutral': 'Neutral',
-                'uncertain': 'Uncertain'
-            }
-        }
-        
-        price_movement_map = {
-            'cn': {
-                'small': '小幅度变动',
-                'moderate': '中等幅度变动',
-                'large': '大幅度变动'
-            },
-            'en': {
-                'small': 'Small movement',
-                'moderate': 'Moderate movement',
-                'large': 'Large movement'
-            }
-        }
-        
-        volatility_map = {
-            'cn': {
-                'increase': '上升',
-                'decrease': '下降',
-                'stable': '稳定',
-                'unknown': '不确定'
-            },
-            'en': {
-                'increase': 'Increasing',
-                'decrease': 'Decreasing',
-                'stable': 'Stable',
-                'unknown': 'Uncertain'
-            }
-        }
-        
-        risk_map = {
-            'cn': {
-                'low': '低',
-                'medium': '中等',
-                'high': '高'
-            },
-            'en': {
-                'low': 'Low',
-                'medium': 'Medium',
-                'high': 'High'
-            }
-        }
-        
-        time_map = {
-            'cn': {
-                'short': '短期',
-                'medium': '中期',
-                'long': '长期'
-            },
-            'en': {
-                'short': 'Short-term',
-                'medium': 'Medium-term',
-                'long': 'Long-term'
-            }
-        }
-        
-        # 视图标签文本 / View label texts
-        view_label_texts = {
-            'cn': {
-                'market': '市场方向',
-                'price': '价格变动',
-                'volatility': '波动率预期',
-                'risk': '风险承受',
-                'time': '时间周期'
-            },
-            'en': {
-                'market': 'Market Direction',
-                'price': 'Price Movement',
-                'volatility': 'Volatility Expectation',
-                'risk': 'Risk Tolerance',
-                'time': 'Time Horizon'
-            }
-        }
-        
-        # 显示用户选择的观点 / Show user's selected views
-        not_selected_text = {"cn": "未选择", "en": "Not selected"}
-        
-        view_text = f"{view_label_texts[self.language]['market']}: {market_view_map[self.language].get(self.answers.get('market_view', ''), not_selected_text[self.language])}\n"
-        view_text += f"{view_label_texts[self.language]['price']}: {price_movement_map[self.language].get(self.answers.get('price_movement', ''), not_selected_text[self.language])}\n"
-        view_text += f"{view_label_texts[self.language]['volatility']}: {volatility_map[self.language].get(self.answers.get('volatility_view', ''), not_selected_text[self.language])}\n"
-        view_text += f"{view_label_texts[self.language]['risk']}: {risk_map[self.language].get(self.answers.get('risk_tolerance', ''), not_selected_text[self.language])}\n"
-        view_text += f"{view_label_texts[self.language]['time']}: {time_map[self.language].get(self.answers.get('time_horizon', ''), not_selected_text[self.language])}"
-        
-        view_summary = tk.Label(view_frame, 
-                              text=view_text, 
-                              font=("Arial", 11), 
-                              justify=tk.LEFT, 
-                              bg="#e1e1e1")
-        view_summary.pack(anchor=tk.W, pady=5)
-        
-        # 显示推荐策略数量 / Show recommended strategy count
-        strategy_count_texts = {
-            "cn": f"推荐策略 ({len(recommended_strategies)}):",
-            "en": f"Recommended Strategies ({len(recommended_strategies)}):"
-        }
-        
-        strategy_count_label = tk.Label(self.result_frame, 
-                                     text=strategy_count_texts[self.language], 
-                                     font=("Arial", 12, "bold"), 
-                                     bg="#f0f0f0")
-        strategy_count_label.pack(anchor=tk.W, pady=5)
-        
-        # 创建策略展示框架
-        strategies_canvas = tk.Canvas(self.result_frame, bg="#f0f0f0")
-        strategies_canvas.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # 添加滚动条
-        scrollbar = ttk.Scrollbar(strategies_canvas, orient="vertical", command=strategies_canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        strategies_canvas.configure(yscrollcommand=scrollbar.set)
-        strategies_canvas.bind('<Configure>', lambda e: strategies_canvas.configure(scrollregion=strategies_canvas.bbox("all")))
-        
-        # 创建内部框架用于放置策略卡片
-        strategies_frame = tk.Frame(strategies_canvas, bg="#f0f0f0")
-        strategies_canvas.create_window((0, 0), window=strategies_frame, anchor="nw")
-        
-        # 显示推荐策略
-        if recommended_strategies:
-            for i, strategy in enumerate(recommended_strategies):
-                # 创建策略卡片
-                strategy_card = tk.Frame(strategies_frame, 
-                                       bg="white", 
-                                       padx=15, 
-                                       pady=15, 
-                                       relief=tk.RAISED, 
-                                       borderwidth=1)
-                strategy_card.pack(fill=tk.X, pady=10, padx=5)
-                
-                # 策略名称
-                strategy_name = tk.Label(strategy_card, 
-                                       text=strategy['name'], 
-                                       font=("Arial", 13, "bold"), 
-                                       bg="white")
-                strategy_name.pack(anchor=tk.W)
-                
-                # 策略描述
-                description = tk.Label(strategy_card, 
-                                     text=strategy['description'], 
-                                     font=("Arial", 11), 
-                                     wraplength=750, 
-                                     justify=tk.LEFT, 
-                                     bg="white")
-                description.pack(anchor=tk.W, pady=5)
-                
-                # 策略详情
-                details_frame = tk.Frame(strategy_card, bg="white")
-                details_frame.pack(fill=tk.X, pady=5)
-                
-                # 策略详情标签文本 / Strategy detail label texts
-                detail_label_texts = {
-                    "cn": {
-                        "risk": "风险水平",
-                        "profit": "盈利潜力",
-                        "best_for": "最适合",
-                        "iv": "波动率偏好"
-                    },
-                    "en": {
-                        "risk": "Risk Level",
-                        "profit": "Profit Potential",
-                        "best_for": "Best For",
-                        "iv": "IV Preference"
-                    }
-                }
-                
-                # 风险水平 / Risk level
-                risk_label = tk.Label(details_frame, 
-                                    text=f"{detail_label_texts[self.language]['risk']}: {strategy['risk_level']}", 
-                                    font=("Arial", 10), 
-                                    bg="white")
-                risk_label.pack(anchor=tk.W)
-                
-                # 盈利潜力 / Profit potential
-                profit_label = tk.Label(details_frame, 
-                                      text=f"{detail_label_texts[self.language]['profit']}: {strategy['profit_potential']}", 
-                                      font=("Arial", 10), 
-                                      bg="white")
-                profit_label.pack(anchor=tk.W)
-                
-                # 最适合情况 / Best for
-                best_for_label = tk.Label(details_frame, 
-                                        text=f"{detail_label_texts[self.language]['best_for']}: {strategy['best_for']}", 
-                                        font=("Arial", 10), 
-                                        bg="white")
-                best_for_label.pack(anchor=tk.W)
-                
-                # 波动率偏好 / IV preference
-                iv_label = tk.Label(details_frame, 
-                                  text=f"{detail_label_texts[self.language]['iv']}: {strategy['iv_preference']}", 
-                                  font=("Arial", 10), 
-                                  bg="white")
-                iv_label.pack(anchor=tk.W)
-        else:
-            # 如果没有推荐策略 / If no strategies are recommended
-            no_strategy_texts = {
-                "cn": "没有找到符合您市场观点的策略，请尝试调整您的选择。",
-                "en": "No strategies found matching your market view. Please try adjusting your selections."
-            }
-            
-            no_strategy_label = tk.Label(strategies_frame, 
-                                     text=no_strategy_texts[self.language], 
-                                     font=("Arial", 12), 
-                                     bg="#f0f0f0")
-            no_strategy_label.pack(pady=20)
+        # 在后台构建结果内容，完成后在界面线程中更新控件
+        # Build the result content in the background and update the widgets on the UI thread when it is done
+        from result_model import build_result_model
+        from worker import BackgroundRunner
+        if self.worker is None:
+            self.worker = BackgroundRunner(self.root)
+        self.worker.submit(build_result_model, self.strategy_selector, dict(self.answers), symbol, self.language, self.chain_store, 
+                           on_done=self.display_results, 
+                           on_error=self.show_error)
+        self.result_list.set_items(())
+        self.show_progress(True)
         
         # 更新导航按钮 / Update navigation buttons
-        self.next_button.config(text=self.button_texts[self.language]["restart"], command=self.reset_app)
+        self.next_button.config(command=self.reset_app)
+        self.texts.bind(self.next_button, 'button.restart')
+        return symbol
+    
+    def show_progress(self, running):
+        # 显示或隐藏后台计算进度 / Show or hide the background computation progress
+        if running:
+            self.progress_frame.pack(anchor=tk.W, pady=5, after=self.strategy_count_label)
+            self.progress_bar.start(15)
+        elif self.progress_frame.winfo_manager():
+            self.progress_bar.stop()
+            self.progress_frame.pack_forget()
+    
+    def cancel_background_work(self):
+        # 放弃进行中的计算，其结果不会再显示 / Abandon the running computation; its results will not be shown
+        if self.worker is not None:
+            self.worker.cancel()
+        if self.result_frame is not None:
+            self.show_progress(False)
+    
+    def show_error(self, error):
+        self.show_progress(False)
+        from tkinter import messagebox
+        messagebox.showerror(i18n.text('error.title', self.language), str(error))
+    
+    def record_session(self, symbol):
+        # 只在界面线程打包记录，磁盘 IO 由日志的后台线程完成
+        # Only packs the record on the UI thread; the journal's background thread does the disk IO
+        if self.journal is not None:
+            # 推荐已由后台计算计数，这里不再计数 / The background computation already counted this selection
+            strategy_ids = self.strategy_selector.select_rule(self.answers, count=False)[1]
+            self.journal.append(symbol, self.answers, self.language, strategy_ids)
+    
+    @instrumentation.timed('ui.render_results')
+    def display_results(self, model):
+        # 用后台构建的结果更新已有控件 / Update the existing widgets with the results built in the background
+        self.show_progress(False)
+        self.result_symbol_label.config(text=model.symbol_text)
+        if model.chain_text is None:
+            self.chain_label.pack_forget()
+        else:
+            self.chain_label.config(text=model.chain_text)
+            self.chain_label.pack(anchor=tk.W, after=self.result_symbol_label)
+        self.view_title.config(text=model.view_title)
+        self.view_summary.config(text=model.view_text)
+        self.strategy_count_label.config(text=model.count_text)
+        
+        if model.cards:
+            self.no_strategy_label.pack_forget()
+        else:
+            self.no_strategy_label.config(text=model.empty_text)
+            self.no_strategy_label.pack(pady=20, before=self.result_list.frame)
+        self.result_list.set_items(model.cards)
     
     def reset_app(self):
+        # 放弃进行中的计算 / Abandon any running computation
+        self.cancel_background_work()
+        
         # 重置所有状态
         self.answers = {}
         self.current_question_index = 0
         
         # 隐藏结果框架
-        if self.result_frame.winfo_manager():
+        if self.result_frame is not None and self.result_frame.winfo_manager():
             self.result_frame.pack_forget()
         
         # 显示问题框架
         self.question_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        # 重置导航按钮
-        self.next_button.config(text="下一步", command=self.next_question)
+        # 重置导航按钮，按钮文本由显示问题时设置
+        self.next_button.config(command=self.next_question)
         
         # 显示第一个问题
         self.show_current_question()
 
 # 主程序入口
 if __name__ == "__main__":
+    import argparse
+    import sys
+    from journal import DEFAULT_JOURNAL_PATH
+    
+    parser = argparse.ArgumentParser(description="期权策略选择器 / Option Strategy Selector")
+    # 可选参数：本地期权链存储目录 / Optional argument: local option-chain store directory
+    parser.add_argument("store", nargs="?", help="本地期权链存储目录 / Local option-chain store directory")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL_PATH,
+                        help="会话日志文件，传空字符串关闭 / Session journal file, an empty string disables it")
+    arguments = parser.parse_args()
+    
+    chain_store = None
+    if arguments.store:
+        from chain_store import ChainStore
+        chain_store = ChainStore(arguments.store)
+    
     root = tk.Tk()
-    app = OptionStrategyApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = OptionStrategyApp(root, chain_store, arguments.journal)
+    root.mainloop()
+    if app.worker is not None:
+        app.worker.shutdown()
+    if app.journal is not None:
+        try:
+            app.journal.close()
+        except (OSError, ValueError) as error:
+            print(f"session journal unavailable: {error}", file=sys.stderr)
@@ -0,0 +1,80 @@
+# market_view.py
+# 由行情数据推导问题回答 / Derive question answers from market data
+
+import math
+
+import numpy as np
+
+from vol_surface import get_surface
+
+# 判断涨跌方向的收益率阈值 / Return threshold for calling a direction
+DIRECTION_THRESHOLD = 0.02
+
+# 价格变动幅度的分档（与问题选项一致：5% 以内、5%-15%、15% 以上）
+# Price movement bands, matching the question options: within 5%, 5%-15%, above 15%
+MOVEMENT_BANDS = ((0.05, 'small'), (0.15, 'moderate'))
+
+# 隐含波动率相对实现波动率的偏离阈值 / Relative gap between implied and realized vol that counts as a view
+VOL_GAP = 0.10
+
+
+def realized_vol(prices):
+    """按日收盘价计算年化实现波动率 / Annualized realized volatility from daily closes"""
+    prices = np.asarray(prices, dtype=float)
+    if len(prices) < 3:
+        return float('nan')
+    returns = np.diff(np.log(prices))
+    return float(returns.std(ddof=1) * math.sqrt(252))
+
+
+def atm_iv(store, symbol, as_of):
+    """取 as_of 之后最近到期日的平值隐含波动率 / ATM implied vol of the first expiry after as_of"""
+    # 从共享的波动率曲面插值得到，不再取最近执行价的报价 / Interpolated from the shared vol surface instead of the nearest strike's quote
+    # 期限从 as_of 起算，而不是快照导入的时间 / Terms run from as_of rather than from when the snapshot was imported
+    surface = get_surface(store, symbol, as_of)
+    if surface is None:
+        return float('nan')
+    position = int(np.searchsorted(surface.expiries, as_of, side='right'))
+    if position == len(surface.expiries):
+        return float('nan')
+    return surface.atm_vol(int(surface.expiries[position]))
+
+
+def derive_answers(prices, implied_vol=float('nan'), risk_tolerance='medium', time_horizon='medium'):
+    """由近期价格和平值隐含波动率推导五个问题的回答 / Derive the five answers from recent prices and ATM implied vol"""
+    prices = np.asarray(prices, dtype=float)
+    change = prices[-1] / prices[0] - 1.0 if len(prices) > 1 else 0.0
+    realized = realized_vol(prices)
+
+    # 隐含波动率明显高于实现波动率时预期回落，反之预期上升 / Implied well above realized suggests a fall, well below suggests a rise
+    if math.isnan(implied_vol) or math.isnan(realized) or realized <= 0:
+        volatility_view = 'unknown'
+    elif implied_vol > realized * (1 + VOL_GAP):
+        volatility_view = 'decrease'
+    elif implied_vol < realized * (1 - VOL_GAP):
+        volatility_view = 'increase'
+    else:
+        volatility_view = 'stable'
+
+    if change > DIRECTION_THRESHOLD:
+        market_view = 'bullish'
+    elif change < -DIRECTION_THRESHOLD:
+        market_view = 'bearish'
+    elif volatility_view in ('stable', 'decrease'):
+        market_view = 'neutral'
+    else:
+        market_view = 'uncertain'
+
+    price_movement = 'large'
+    for limit, band in MOVEMENT_BANDS:
+        if abs(change) <= limit:
+            price_movement = band
+            break
+
+    return {
+        'market_view': market_view,
+        'price_movement': price_movement,
+        'volatility_view': volatility_view,
+        'risk_tolerance': risk_tolerance,
+        'time_horizon': time_horizon,
+    }
@@ -0,0 +1,169 @@
+# payoff.py
+# 期权策略到期盈亏计算 / Option strategy expiry payoff engine
+
+import collections
+
+import numpy as np
+
+import instrumentation
+
+# 腿类型 / Leg kinds
+CALL, PUT, STOCK = 0, 1, 2
+
+# 策略腿：quantity 为带符号数量（正为买入，负为卖出），expiry 为到期序号（0为近月，1为远月）
+# Strategy leg: quantity is signed (positive long, negative short), expiry is the expiry slot (0 near, 1 far)
+Leg = collections.namedtuple('Leg', ['kind', 'quantity', 'strike', 'premium', 'expiry'])
+Leg.__new__.__defaults__ = (0.0, 0.0, 0)
+
+# 多个策略的腿按 (策略数, 最大腿数) 对齐后的数组，空位数量为0
+# Legs of several strategies padded into (strategies, max legs) arrays, padding has zero quantity
+LegArrays = collections.namedtuple('LegArrays', ['kind', 'quantity', 'strike', 'premium', 'expiry'])
+
+# 到期盈亏结果 / Expiry payoff result
+PayoffProfile = collections.namedtuple('PayoffProfile', ['grid', 'pnl', 'max_profit', 'max_loss', 'breakevens'])
+
+# 各策略的腿模板：(类型, 数量, 执行价偏移档数, 到期序号)，执行价 = 标的价格 × (1 + 偏移档数 × 档宽)
+# Leg templates per strategy: (kind, quantity, strike offset in steps, expiry slot), strike = spot × (1 + offset × step width)
+STRATEGY_TEMPLATES = {
+    # 看涨策略 / Bullish strategies
+    'long_call': ((CALL, 1, 0, 0),),
+    'bull_call_spread': ((CALL, 1, 0, 0), (CALL, -1, 1, 0)),
+    'short_put': ((PUT, -1, -1, 0),),
+    'covered_call': ((STOCK, 1, 0, 0), (CALL, -1, 1, 0)),
+
+    # 看跌策略 / Bearish strategies
+    'long_put': ((PUT, 1, 0, 0),),
+    'bear_put_spread': ((PUT, 1, 0, 0), (PUT, -1, -1, 0)),
+    'short_call': ((CALL, -1, 1, 0),),
+    'protective_put': ((STOCK, 1, 0, 0), (PUT, 1, -1, 0)),
+
+    # 中性策略 / Neutral strategies
+    'straddle': ((CALL, 1, 0, 0), (PUT, 1, 0, 0)),
+    'strangle': ((PUT, 1, -1, 0), (CALL, 1, 1, 0)),
+    'butterfly_spread': ((CALL, 1, -1, 0), (CALL, -2, 0, 0), (CALL, 1, 1, 0)),
+    'iron_condor': ((PUT, 1, -2, 0), (PUT, -1, -1, 0), (CALL, -1, 1, 0), (CALL, 1, 2, 0)),
+
+    # 波动率策略 / Volatility strategies
+    'long_straddle_strangle': ((CALL, 1, 0, 0), (PUT, 1, 0, 0)),
+    'short_straddle_strangle': ((CALL, -1, 0, 0), (PUT, -1, 0, 0)),
+    'calendar_spread': ((CALL, -1, 0, 0), (CALL, 1, 0, 1)),
+}
+
+# 默认执行价档宽（标的价格的比例）/ Default strike step width as a fraction of spot
+DEFAULT_STRIKE_WIDTH = 0.05
+
+# 按模板定价时默认的到期年数（近月、远月）和波动率 / Default years to the near and far expiries and vol when pricing templates
+DEFAULT_EXPIRIES = (30 / 365, 60 / 365)
+DEFAULT_VOL = 0.25
+
+
+def build_legs(strategy_id, spot, width=DEFAULT_STRIKE_WIDTH, premiums=None):
+    """按模板生成策略的腿 / Build the legs of a strategy from its template"""
+    legs = []
+    for index, (kind, quantity, offset, expiry) in enumerate(STRATEGY_TEMPLATES[strategy_id]):
+        if kind == STOCK:
+            # 股票腿的成本为建仓价格 / The cost of a stock leg is its entry price
+            strike, premium = 0.0, spot
+        else:
+            strike, premium = spot * (1 + offset * width), 0.0
+        if premiums is not None:
+            premium = premiums[index]
+        legs.append(Leg(kind, quantity, strike, premium, expiry))
+    return tuple(legs)
+
+
+def stack_legs(leg_lists):
+    """将多个策略的腿对齐为数组 / Pad the legs of several strategies into aligned arrays"""
+    leg_lists = [tuple(legs) for legs in leg_lists]
+    shape = (len(leg_lists), max((len(legs) for legs in leg_lists), default=0))
+    kind = np.full(shape, STOCK, dtype=np.int8)
+    quantity = np.zeros(shape)
+    strike = np.zeros(shape)
+    premium = np.zeros(shape)
+    expiry = np.zeros(shape, dtype=np.int8)
+    for row, legs in enumerate(leg_lists):
+        for column, leg in enumerate(legs):
+            kind[row, column] = leg.kind
+            quantity[row, column] = leg.quantity
+            strike[row, column] = leg.strike
+            premium[row, column] = leg.premium
+            expiry[row, column] = leg.expiry
+    return LegArrays(kind, quantity, strike, premium, expiry)
+
+
+def evaluate(legs, prices):
+    """计算到期盈亏，返回 (策略数, 价格数) 数组 / Compute expiry P&L as a (strategies, prices) array"""
+    # prices 为所有策略共用的一维数组，或每个策略一行的二维数组；远月腿按内在价值计算
+    # prices is 1-D and shared by all strategies, or 2-D with one row per strategy; far-dated legs are valued at intrinsic value
+    prices = np.asarray(prices, dtype=float)
+    count, leg_count = legs.quantity.shape
+    # 期权费部分与价格无关，一次性扣除 / The premium part does not depend on price and is subtracted once
+    pnl = np.empty((count, prices.shape[-1]))
+    pnl[:] = -(legs.quantity * legs.premium).sum(axis=1, keepdims=True)
+    value = np.empty_like(pnl)
+    for column in range(leg_count):
+        kind = legs.kind[:, column:column + 1]
+        # 看涨 max(S-K, 0)，看跌 max(K-S, 0)，股票 S / Call max(S-K, 0), put max(K-S, 0), stock S
+        direction = np.where(kind == PUT, -1.0, 1.0)
+        floor = np.where(kind == STOCK, -np.inf, 0.0)
+        np.subtract(prices, legs.strike[:, column:column + 1], out=value)
+        np.multiply(value, direction * legs.quantity[:, column:column + 1], out=value)
+        # 按数量缩放后，空头腿的下限变为上限 / After scaling by quantity, the floor of a short leg becomes a cap
+        short = legs.quantity[:, column:column + 1] < 0
+        np.maximum(value, floor, out=value, where=~short)
+        np.minimum(value, -floor, out=value, where=short)
+        pnl += value
+    return pnl
+
+
+def payoff_profile(legs, grid, expiries=None, vol=None, rate=0.0, dividend=0.0):
+    """计算价格网格上的盈亏曲线、最大盈利、最大亏损和盈亏平衡点 / Compute the P&L curve, max profit, max loss and breakevens over a price grid"""
+    # 给出 expiries 与 vol 时在近月到期日估值，远月腿按 Black-Scholes 计（pricing.horizon_pnl），否则全部按内在价值
+    # With expiries and vol the P&L is taken at the near expiry with far legs valued by Black-Scholes (pricing.horizon_pnl),
+    # otherwise every leg is at intrinsic value
+    if expiries is None:
+        value = evaluate
+    else:
+        from pricing import horizon_pnl
+
+        def value(legs, prices):
+            return horizon_pnl(legs, prices, expiries, vol, rate, dividend)
+
+    grid = np.asarray(grid, dtype=float)
+    pnl = value(legs, grid)
+
+    # 价格为0时的盈亏也计入极值 / Include the P&L at a zero price in the extremes
+    at_zero = value(legs, np.zeros(1))[:, 0]
+    max_profit = np.maximum(pnl.max(axis=1), at_zero)
+    max_loss = np.minimum(pnl.min(axis=1), at_zero)
+
+    # 价格趋于无穷时的斜率决定盈亏是否无限 / The slope as price goes to infinity decides unlimited profit or loss
+    slope = (legs.quantity * (legs.kind != PUT)).sum(axis=1)
+    max_profit[slope > 0] = np.inf
+    max_loss[slope < 0] = -np.inf
+
+    # 盈亏符号变化处线性插值得到盈亏平衡点 / Breakevens are linearly interpolated where the P&L changes sign
+    negative = pnl < 0
+    rows, columns = np.nonzero(negative[:, :-1] != negative[:, 1:])
+    left = pnl[rows, columns]
+    right = pnl[rows, columns + 1]
+    grid_left = grid[..., columns] if grid.ndim == 1 else grid[rows, columns]
+    grid_right = grid[..., columns + 1] if grid.ndim == 1 else grid[rows, columns + 1]
+    crossings = grid_left + (grid_right - grid_left) * left / (left - right)
+    breakevens = np.split(crossings, np.cumsum(np.bincount(rows, minlength=len(pnl)))[:-1])
+
+    return PayoffProfile(grid, pnl, max_profit, max_loss, breakevens)
+
+
+@instrumentation.timed('payoff.strategy_payoffs')
+def strategy_payoffs(strategy_ids, spot, grid=None, width=DEFAULT_STRIKE_WIDTH, points=100001,
+                     expiries=DEFAULT_EXPIRIES, vol=DEFAULT_VOL, rate=0.0, dividend=0.0):
+    """按模板计算多个策略在近月到期时的盈亏 / Compute payoffs of several strategies at the near expiry from their templates"""
+    # 各腿以 Black-Scholes 模型价格作为期权费 / Every leg is charged its Black-Scholes model price as premium
+    from pricing import priced_legs
+
+    if grid is None:
+        grid = np.linspace(0.0, 2.0 * spot, points)
+    legs = stack_legs(build_legs(strategy_id, spot, width) for strategy_id in strategy_ids)
+    legs = priced_legs(legs, spot, expiries, vol, rate, dividend)
+    return payoff_profile(legs, grid, expiries, vol, rate, dividend)
@@ -0,0 +1,99 @@
+# payoff_chart.py
+# 到期盈亏图的数据：密集价格网格上的盈亏曲线预先降采样为多级最小/最大包络，绘制时只需与像素列数相当的线段
+# Payoff chart data: P&L curves over dense price grids are pre-reduced into multi-level min/max envelopes,
+# so drawing needs only about as many line segments as there are pixel columns
+
+import collections
+import functools
+
+import numpy as np
+
+import payoff
+
+# 图表数据：价格区间 [low, high]，盈亏区间 [y_low, y_high]；levels 为由细到粗的 (最小值, 最大值) 包络，每级列数减半
+# Chart data: price range [low, high] and P&L range [y_low, y_high]; levels holds (minimum, maximum) envelopes from fine to coarse,
+# each with half the columns of the previous one
+ChartData = collections.namedtuple('ChartData', ['low', 'high', 'spot', 'y_low', 'y_high', 'levels', 'breakevens'])
+
+# 价格网格的点数和相对标的价格的范围 / Points of the price grid and its range relative to spot
+CHART_POINTS = 100001
+CHART_RANGE = 0.3
+
+# 最细一级包络的列数，应不少于图表可能的像素宽度；最粗一级的列数
+# Columns of the finest envelope, at least the widest chart in pixels; columns of the coarsest one
+FINEST_COLUMNS = 4096
+COARSEST_COLUMNS = 16
+
+# 没有本地期权链时模板策略使用的参考标的价格，期权费按 payoff 的默认期限和波动率以模型价格计
+# Reference spot for template strategies without a local option chain; premiums are model prices at payoff's default terms and vol
+REFERENCE_SPOT = 100.0
+
+
+def _envelope_levels(pnl):
+    """把一条盈亏曲线归约为多级最小/最大包络 / Reduce one P&L curve into multi-level min/max envelopes"""
+    columns = min(FINEST_COLUMNS, len(pnl))
+    edges = np.linspace(0, len(pnl), columns + 1).astype(np.intp)[:-1]
+    minimum = np.minimum.reduceat(pnl, edges)
+    maximum = np.maximum.reduceat(pnl, edges)
+    levels = [(minimum, maximum)]
+    while len(minimum) >= 2 * COARSEST_COLUMNS:
+        # 相邻两列合并为一列，奇数列时最后一列单独保留 / Merge neighbouring column pairs, keeping an odd last column on its own
+        pairs = np.arange(0, len(minimum), 2)
+        minimum = np.minimum.reduceat(minimum, pairs)
+        maximum = np.maximum.reduceat(maximum, pairs)
+        levels.append((minimum, maximum))
+    return tuple(levels)
+
+
+def build_charts(legs, spots, expiries=None, vol=None, points=CHART_POINTS):
+    """一次计算多个策略的盈亏曲线并预先降采样，无法计算的为 None / Compute and pre-reduce several P&L curves at once, None where they cannot be computed"""
+    # legs 为 payoff.stack_legs 对齐后的数组，每个策略一行；给出 expiries（各到期序号的年数）与 vol 时远月腿按 Black-Scholes 估值
+    # legs are payoff.stack_legs arrays with one row per strategy; with expiries (years per expiry slot) and vol far legs are valued by Black-Scholes
+    if not len(legs.quantity):
+        return ()
+    spots = np.asarray(spots, dtype=float)
+    # 每个策略一行价格网格，围绕各自的标的价格 / One price grid row per strategy, centred on its own spot
+    unit = np.linspace(1.0 - CHART_RANGE, 1.0 + CHART_RANGE, points)
+    grid = spots[:, None] * unit
+    profile = payoff.payoff_profile(legs, grid, expiries, vol)
+    charts = []
+    for row, spot in enumerate(spots.tolist()):
+        pnl = profile.pnl[row]
+        # 加 0.0 把 -0.0 规范为 0.0 / Adding 0.0 turns -0.0 into 0.0
+        y_low, y_high = float(pnl.min()) + 0.0, float(pnl.max()) + 0.0
+        # 缺少报价的腿会让整条曲线无效，此时不提供图表 / A leg without a quote invalidates the whole curve, so no chart is offered
+        if not (np.isfinite(y_low) and np.isfinite(y_high)):
+            charts.append(None)
+            continue
+        # 盈亏恒定时留出上下边距，避免除以零 / Pad a flat P&L so the vertical scale never divides by zero
+        if y_high - y_low < 1e-9:
+            margin = max(abs(y_high), 1.0) * 0.1
+            y_low, y_high = y_low - margin, y_high + margin
+        charts.append(ChartData(float(grid[row, 0]), float(grid[row, -1]), spot, y_low, y_high,
+                                _envelope_levels(pnl), tuple(profile.breakevens[row].tolist())))
+    return tuple(charts)
+
+
+@functools.lru_cache(maxsize=None)
+def template_chart(strategy_id):
+    """按模板和参考价格绘制的盈亏图，各策略只计算一次 / Payoff chart from the template at the reference spot, computed once per strategy"""
+    from pricing import priced_legs
+    
+    legs = payoff.stack_legs([payoff.build_legs(strategy_id, REFERENCE_SPOT)])
+    legs = priced_legs(legs, REFERENCE_SPOT, payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)
+    return build_charts(legs, [REFERENCE_SPOT], payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)[0]
+
+
+def envelope(chart, columns):
+    """取恰好 columns 列的最小/最大包络，耗时与列数而非网格点数成正比 / Min/max envelope with exactly `columns` columns, in time proportional to the columns"""
+    columns = max(int(columns), 1)
+    # 选列数不少于目标的最粗一级，再合并到目标列数 / Pick the coarsest level with at least as many columns, then merge down to the target
+    minimum, maximum = chart.levels[0]
+    for level_minimum, level_maximum in chart.levels[1:]:
+        if len(level_minimum) < columns:
+            break
+        minimum, maximum = level_minimum, level_maximum
+    if len(minimum) <= columns:
+        return minimum, maximum
+    edges = np.linspace(0, len(minimum), columns + 1).astype(np.intp)[:-1]
+    return np.minimum.reduceat(minimum, edges), np.maximum.reduceat(maximum, edges)
@@ -0,0 +1,129 @@
+# pricing.py
+# Black-Scholes 欧式期权定价与希腊值 / Black-Scholes European option pricing and Greeks
+
+import collections
+
+import numpy as np
+
+import instrumentation
+from payoff import DEFAULT_STRIKE_WIDTH, PUT, STOCK, LegArrays, build_legs, evaluate, stack_legs
+
+# 定价结果：vega 与 rho 以波动率/利率变动 1.00 计，theta 以每年计
+# Pricing result: vega and rho per 1.00 change in vol/rate, theta per year
+Greeks = collections.namedtuple('Greeks', ['price', 'delta', 'gamma', 'vega', 'theta', 'rho'])
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+
+def norm_cdf(x):
+    """标准正态分布函数，相对误差小于1.2e-7 / Standard normal CDF with relative error below 1.2e-7"""
+    # 采用 erfc 的切比雪夫近似 / Chebyshev approximation of erfc
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = -z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277))))))))
+    tail = 0.5 * t * np.exp(poly)
+    return np.where(x >= 0, 1.0 - tail, tail)
+
+
+def norm_pdf(x):
+    """标准正态密度函数 / Standard normal density"""
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def black_scholes(kind, spot, strike, t, vol, rate=0.0, dividend=0.0):
+    """批量计算欧式期权价格和希腊值，参数可为任意可广播的数组 / Price European options and Greeks over broadcastable arrays"""
+    kind, spot, strike, t, vol, rate, dividend = np.broadcast_arrays(
+        np.asarray(kind), *(np.asarray(value, dtype=float) for value in (spot, strike, t, vol, rate, dividend))
+    )
+    phi = np.where(kind == PUT, -1.0, 1.0)
+    stock = kind == STOCK
+
+    # 已到期或零波动率的合约按远期内在价值处理 / Expired or zero-vol contracts are valued at forward intrinsic value
+    live = (t > 0) & (vol > 0) & ~stock
+    safe_t = np.where(live, t, 1.0)
+    safe_vol = np.where(live, vol, 1.0)
+    safe_strike = np.where(strike > 0, strike, 1.0)
+    sqrt_t = np.sqrt(safe_t)
+
+    spot_discount = np.exp(-dividend * np.maximum(t, 0.0))
+    strike_discount = np.exp(-rate * np.maximum(t, 0.0))
+    forward_spot = spot * spot_discount
+    present_strike = strike * strike_discount
+
+    d1 = (np.log(spot / safe_strike) + (rate - dividend + 0.5 * safe_vol * safe_vol) * safe_t) / (safe_vol * sqrt_t)
+    d2 = d1 - safe_vol * sqrt_t
+    cdf_d1 = norm_cdf(phi * d1)
+    cdf_d2 = norm_cdf(phi * d2)
+    pdf_d1 = norm_pdf(d1)
+
+    price = phi * (forward_spot * cdf_d1 - present_strike * cdf_d2)
+    delta = phi * spot_discount * cdf_d1
+    gamma = spot_discount * pdf_d1 / (spot * safe_vol * sqrt_t)
+    vega = forward_spot * pdf_d1 * sqrt_t
+    theta = (-forward_spot * pdf_d1 * safe_vol / (2.0 * sqrt_t)
+             - phi * rate * present_strike * cdf_d2
+             + phi * dividend * forward_spot * cdf_d1)
+    rho = phi * strike * safe_t * strike_discount * cdf_d2
+
+    in_money = phi * (forward_spot - present_strike) > 0
+    zero = np.zeros_like(price)
+    price = np.where(live, price, np.where(stock, spot, np.maximum(phi * (forward_spot - present_strike), 0.0)))
+    delta = np.where(live, delta, np.where(stock, 1.0, np.where(in_money, phi * spot_discount, 0.0)))
+    gamma = np.where(live, gamma, zero)
+    vega = np.where(live, vega, zero)
+    theta = np.where(live, theta, zero)
+    rho = np.where(live, rho, zero)
+    return Greeks(price, delta, gamma, vega, theta, rho)
+
+
+@instrumentation.timed('pricing.leg_greeks')
+def leg_greeks(legs, spot, expiries, vol, rate=0.0, dividend=0.0):
+    """为 (策略数, 腿数) 的每条腿定价 / Price every leg of (strategies, legs) arrays"""
+    # expiries 为各到期序号对应的剩余年数，vol 可为标量或与腿数组同形 / expiries holds years to expiry per slot, vol is a scalar or leg-shaped
+    t = np.asarray(expiries, dtype=float)[legs.expiry]
+    spot = np.asarray(spot, dtype=float)
+    if spot.ndim == 1:
+        # 每个策略一个标的价格 / One spot per strategy
+        spot = spot[:, None]
+    return black_scholes(legs.kind, spot, legs.strike, t, vol, rate, dividend)
+
+
+def net_greeks(legs, spot, expiries, vol, rate=0.0, dividend=0.0):
+    """按数量合并各腿，得到每个策略的净期权费和净希腊值 / Combine legs by quantity into net premium and net Greeks per strategy"""
+    per_leg = leg_greeks(legs, spot, expiries, vol, rate, dividend)
+    return Greeks(*((legs.quantity * values).sum(axis=1) for values in per_leg))
+
+
+def priced_legs(legs, spot, expiries, vol, rate=0.0, dividend=0.0):
+    """以模型价格作为各腿的期权费 / Use model prices as the premium of every leg"""
+    premium = leg_greeks(legs, spot, expiries, vol, rate, dividend).price
+    return LegArrays(legs.kind, legs.quantity, legs.strike, np.where(legs.quantity != 0, premium, 0.0), legs.expiry)
+
+
+def horizon_pnl(legs, prices, expiries, vol, rate=0.0, dividend=0.0):
+    """近月到期时的盈亏，远月腿按剩余期限的 Black-Scholes 价值计 / P&L at the near expiry, far legs valued by Black-Scholes over their remaining term"""
+    # prices 与 payoff.evaluate 相同：共用的一维数组，或每个策略一行的二维数组；vol 可为标量或与腿数组同形
+    # prices is as in payoff.evaluate: a shared 1-D array or a 2-D array with one row per strategy; vol is a scalar or leg-shaped
+    prices = np.asarray(prices, dtype=float)
+    far = legs.expiry > 0
+    near_legs = LegArrays(legs.kind, np.where(far, 0.0, legs.quantity), legs.strike, legs.premium, legs.expiry)
+    pnl = evaluate(near_legs, prices)
+    for column in np.flatnonzero(far.any(axis=0)):
+        rows = far[:, column]
+        remaining = np.asarray(expiries, dtype=float)[legs.expiry[rows, column]] - expiries[0]
+        # 价格为0时希腊值会除以零，只取价格 / Greeks divide by zero at a zero price; only the price is used
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = black_scholes(legs.kind[rows, column, None], prices[rows] if prices.ndim == 2 else prices,
+                                  legs.strike[rows, column, None], remaining[:, None],
+                                  vol[rows, column, None] if np.ndim(vol) == 2 else vol, rate, dividend).price
+        pnl[rows] += legs.quantity[rows, column, None] * (value - legs.premium[rows, column, None])
+    return pnl
+
+
+@instrumentation.timed('pricing.strategy_greeks')
+def strategy_greeks(strategy_ids, spot, expiries, vol, rate=0.0, dividend=0.0, width=DEFAULT_STRIKE_WIDTH):
+    """按模板为多个策略定价 / Price several strategies from their templates"""
+    legs = stack_legs(build_legs(strategy_id, spot, width) for strategy_id in strategy_ids)
+    return net_greeks(legs, spot, expiries, vol, rate, dividend)
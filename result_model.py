@@ -0,0 +1,92 @@
+# result_model.py
+# 推荐结果的无界面数据模型，界面只负责把它显示出来
+# Headless data model of the recommendation results; the UI only displays it
+
+import collections
+import math
+
+import instrumentation
+from i18n import lookup, text
+
+# 一张策略卡片的内容：details 为 (标签, 取值) 行，chart 为盈亏图数据（payoff_chart.ChartData）
+# Content of one strategy card: details holds (label, value) rows, chart the payoff chart data (payoff_chart.ChartData)
+StrategyCardData = collections.namedtuple('StrategyCardData', ['strategy_id', 'name', 'description', 'details', 'chart'])
+StrategyCardData.__new__.__defaults__ = (None,)
+
+# 整个结果页的内容，chain_text 在没有本地期权链时为 None / Content of the whole result view; chain_text is None without a local option chain
+ResultModel = collections.namedtuple('ResultModel', ['symbol_text', 'chain_text', 'view_title', 'view_text',
+                                                     'count_text', 'cards', 'empty_text'])
+
+# 市场观点摘要中的问题顺序 / Order of the questions in the market view summary
+VIEW_FIELDS = ('market_view', 'price_movement', 'volatility_view', 'risk_tolerance', 'time_horizon')
+
+# 卡片详情行的顺序 / Order of the detail rows on a card
+DETAIL_FIELDS = ('risk_level', 'profit_potential', 'best_for', 'iv_preference')
+
+
+@instrumentation.timed('result_model.build')
+def build_result_model(selector, answers, symbol, language, chain_store=None):
+    """为一组回答构建结果页内容 / Build the result view content for one set of answers"""
+    strategies = selector.select_strategies(answers, language)
+
+    chain_text = None
+    legs_texts = {}
+    charts = {}
+    if chain_store is not None:
+        if symbol in chain_store:
+            chain = chain_store.chain(symbol)
+            spot = chain.spot if chain.spot is not None else float('nan')
+            chain_text = text('result.chain', language, spot=spot, expiries=len(chain_store.expiries(symbol)),
+                              contracts=len(chain.strike))
+            # 从本地期权链为推荐策略选择具体合约 / Pick concrete contracts for the recommendations from the local option chain
+            from payoff import DEFAULT_VOL, stack_legs
+            from payoff_chart import build_charts
+            from strike_selector import as_of_days, describe_legs, select_recommended_legs
+            from vol_surface import get_surface
+            strategy_ids = [strategy['id'] for strategy in strategies]
+            selections = select_recommended_legs(chain_store, symbol, strategy_ids, answers)
+            for selection in selections:
+                legs_texts[selection.strategy_id] = describe_legs(selection)
+            # 有具体合约时按实际执行价和期权费绘制盈亏图 / With concrete contracts the charts use the actual strikes and premiums
+            if selections:
+                # 远月腿按曲面的远月平值波动率估值，与模拟器一样使用最长的到期序列
+                # Far legs are valued at the surface's far ATM vol, using the longest expiry slots as the simulator does
+                as_of = as_of_days(chain_store)
+                slots = max((selection.expiries for selection in selections), key=len)
+                surface = get_surface(chain_store, symbol)
+                vol = surface.atm_vol(slots[-1]) if surface is not None else float('nan')
+                if not math.isfinite(vol) or vol <= 0:
+                    vol = DEFAULT_VOL
+                built = build_charts(stack_legs(selection.legs for selection in selections),
+                                     [selection.spot for selection in selections],
+                                     tuple((days - as_of) / 365 for days in slots), vol)
+                charts.update(zip([selection.strategy_id for selection in selections], built))
+        else:
+            chain_text = text('result.chain_missing', language)
+
+    not_selected = text('result.not_selected', language)
+    view_text = '\n'.join(
+        f"{text('view.' + field, language)}: {lookup(f'answer.{field}.{answers.get(field)}', language, not_selected)}"
+        for field in VIEW_FIELDS
+    )
+
+    detail_labels = [text('detail.' + field, language) for field in DETAIL_FIELDS]
+    legs_label = text('detail.legs', language)
+    from payoff_chart import template_chart
+    cards = []
+    for strategy in strategies:
+        details = [(label, strategy[field]) for label, field in zip(detail_labels, DETAIL_FIELDS)]
+        if strategy['id'] in legs_texts:
+            details.append((legs_label, legs_texts[strategy['id']]))
+        chart = charts.get(strategy['id']) or template_chart(strategy['id'])
+        cards.append(StrategyCardData(strategy['id'], strategy['name'], strategy['description'], tuple(details), chart))
+
+    return ResultModel(
+        symbol_text=text('result.symbol', language, symbol=symbol),
+        chain_text=chain_text,
+        view_title=text('result.view_title', language),
+        view_text=view_text,
+        count_text=text('result.count', language, count=len(cards)),
+        cards=tuple(cards),
+        empty_text=text('result.empty', language),
+    )
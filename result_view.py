@@ -0,0 +1,278 @@
+# result_view.py
+# 推荐结果列表：策略卡片放在池中复用，只渲染滚动区域内可见的卡片
+# Recommendation result list: strategy cards are pooled and reused, and only cards visible in the scroll area are rendered
+
+import tkinter as tk
+from tkinter import ttk
+
+# 每张卡片占用的最小行高（像素）；所有行等高，虚拟化依赖统一的行高计算可见范围，内容更高的卡片会把行高撑大
+# Minimum row height of every card in pixels; all rows share one height, which virtualization relies on to compute
+# the visible range, and a card with taller content raises it
+CARD_HEIGHT = 350
+
+# 卡片之间的间距 / Gap between cards
+CARD_GAP = 10
+
+# 盈亏图的高度和内边距（像素）/ Height and inner margin of the payoff chart in pixels
+CHART_HEIGHT = 110
+CHART_MARGIN = 6
+
+
+class PayoffChart:
+    """卡片内的盈亏图，画布项只创建一次，之后只更新坐标 / Payoff chart in a card whose canvas items are created once and then only moved"""
+    
+    def __init__(self, parent, height=CHART_HEIGHT):
+        self.canvas = tk.Canvas(parent, height=height, bg="white", highlightthickness=0)
+        self.zero_line = self.canvas.create_line(0, 0, 0, 0, fill="#bbbbbb", dash=(2, 2))
+        self.spot_line = self.canvas.create_line(0, 0, 0, 0, fill="#dddddd")
+        self.curve = self.canvas.create_line(0, 0, 0, 0, fill="#1f6fb2", width=1.5)
+        self.high_text = self.canvas.create_text(0, 0, anchor="nw", font=("Arial", 8), fill="#555555")
+        self.low_text = self.canvas.create_text(0, 0, anchor="sw", font=("Arial", 8), fill="#555555")
+        self.items = (self.zero_line, self.spot_line, self.curve, self.high_text, self.low_text)
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        
+        self.chart = None
+        # 上次绘制的数据和尺寸；数据按身份比较，因其包络为 NumPy 数组
+        # Data and size of the last drawing; the data is compared by identity because its envelopes are NumPy arrays
+        self._drawn_chart = None
+        self._drawn_size = None
+    
+    def show(self, chart):
+        """显示一张图表的数据，None 时隐藏 / Show one chart's data, hiding the chart for None"""
+        if chart is not self.chart:
+            self.chart = chart
+            self.redraw()
+    
+    def redraw(self):
+        """按当前尺寸更新已有画布项的坐标 / Update the coordinates of the existing canvas items for the current size"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        chart = self.chart
+        # 尺寸和数据都未变时无需重画 / Nothing to redraw when neither the size nor the data changed
+        if chart is self._drawn_chart and (width, height) == self._drawn_size:
+            return
+        self._drawn_chart = chart
+        self._drawn_size = (width, height)
+        columns = width - 2 * CHART_MARGIN
+        if chart is None or columns < 2 or height <= 2 * CHART_MARGIN:
+            for item in self.items:
+                self.canvas.itemconfigure(item, state="hidden")
+            return
+        
+        import numpy as np
+        from payoff_chart import envelope
+        
+        # 每个像素列一段竖线，相邻列交替最小和最大值的顺序使折线连续
+        # One vertical stroke per pixel column; alternating the min/max order between columns keeps the polyline continuous
+        minimum, maximum = envelope(chart, columns)
+        scale = (height - 2 * CHART_MARGIN) / (chart.y_high - chart.y_low)
+        top = CHART_MARGIN + chart.y_high * scale
+        x = CHART_MARGIN + np.arange(len(minimum)) * (columns - 1) / max(len(minimum) - 1, 1)
+        low_y = top - minimum * scale
+        high_y = top - maximum * scale
+        flip = np.arange(len(minimum)) % 2 == 1
+        points = np.empty((len(minimum), 4))
+        points[:, 0] = x
+        points[:, 1] = np.where(flip, high_y, low_y)
+        points[:, 2] = x
+        points[:, 3] = np.where(flip, low_y, high_y)
+        self.canvas.coords(self.curve, points.ravel().tolist())
+        
+        right = CHART_MARGIN + columns - 1
+        if chart.y_low <= 0.0 <= chart.y_high:
+            self.canvas.coords(self.zero_line, CHART_MARGIN, top, right, top)
+            self.canvas.itemconfigure(self.zero_line, state="normal")
+        else:
+            self.canvas.itemconfigure(self.zero_line, state="hidden")
+        spot_x = CHART_MARGIN + (chart.spot - chart.low) / (chart.high - chart.low) * (columns - 1)
+        self.canvas.coords(self.spot_line, spot_x, CHART_MARGIN, spot_x, height - CHART_MARGIN)
+        self.canvas.coords(self.high_text, CHART_MARGIN + 2, CHART_MARGIN)
+        self.canvas.coords(self.low_text, CHART_MARGIN + 2, height - CHART_MARGIN)
+        self.canvas.itemconfigure(self.high_text, text=f"{chart.y_high:+.2f}")
+        self.canvas.itemconfigure(self.low_text, text=f"{chart.y_low:+.2f}")
+        for item in (self.spot_line, self.curve, self.high_text, self.low_text):
+            self.canvas.itemconfigure(item, state="normal")
+
+
+class StrategyCard:
+    """可复用的策略卡片，更新数据时只修改已有控件 / A reusable strategy card that reconfigures its widgets on update"""
+    
+    def __init__(self, parent):
+        self.frame = tk.Frame(parent, 
+                            bg="white", 
+                            padx=15, 
+                            pady=15, 
+                            relief=tk.RAISED, 
+                            borderwidth=1)
+        
+        # 策略名称 / Strategy name
+        self.name_label = tk.Label(self.frame, 
+                                 font=("Arial", 13, "bold"), 
+                                 bg="white")
+        self.name_label.pack(anchor=tk.W)
+        
+        # 策略描述 / Strategy description
+        self.description_label = tk.Label(self.frame, 
+                                        font=("Arial", 11), 
+                                        wraplength=750, 
+                                        justify=tk.LEFT, 
+                                        bg="white")
+        self.description_label.pack(anchor=tk.W, pady=5)
+        
+        # 策略详情，每行一个标签，按需增加 / Strategy details, one label per row, added on demand
+        self.details_frame = tk.Frame(self.frame, bg="white")
+        self.details_frame.pack(fill=tk.X, pady=5)
+        self.detail_labels = []
+        
+        # 到期盈亏图 / Expiry payoff chart
+        self.chart = PayoffChart(self.frame)
+        self.chart.canvas.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.data = None
+        self.index = None
+    
+    def update(self, data):
+        """显示一张卡片的数据，数据未变时不做任何事 / Show one card's data, doing nothing when it is unchanged"""
+        if data is self.data:
+            return
+        self.data = data
+        self.name_label.config(text=data.name)
+        self.description_label.config(text=data.description)
+        
+        while len(self.detail_labels) < len(data.details):
+            self.detail_labels.append(tk.Label(self.details_frame, 
+                                             font=("Arial", 10), 
+                                             wraplength=750, 
+                                             justify=tk.LEFT, 
+                                             bg="white"))
+        # 多余的行只隐藏不销毁；隐藏的总是末尾几行，重新显示时顺序不变
+        # Surplus rows are hidden rather than destroyed; they are always the trailing rows, so re-showing keeps the order
+        for position, label in enumerate(self.detail_labels):
+            if position < len(data.details):
+                title, value = data.details[position]
+                label.config(text=f"{title}: {value}")
+                if not label.winfo_manager():
+                    label.pack(anchor=tk.W)
+            elif label.winfo_manager():
+                label.pack_forget()
+        self.chart.show(data.chart)
+
+
+class ResultList:
+    """虚拟化的卡片列表，卡片数量只取决于可见行数 / Virtualized card list whose card count depends only on the visible rows"""
+    
+    def __init__(self, parent, bg="#f0f0f0", row_height=CARD_HEIGHT):
+        self.min_row_height = row_height
+        self.row_height = row_height
+        self.frame = tk.Frame(parent, bg=bg)
+        
+        self.canvas = tk.Canvas(self.frame, bg=bg, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind('<Configure>', lambda event: self._schedule_render())
+        
+        # 指针在列表上时滚轮滚动列表 / The mouse wheel scrolls the list while the pointer is over it
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.canvas.bind_all(sequence, self._on_wheel, add='+')
+        
+        self.items = ()
+        self.cards = []
+        self.windows = []
+        self._width = None
+        self._pending = None
+        self._measuring = False
+    
+    def set_items(self, items):
+        """替换列表数据并回到顶部 / Replace the list data and scroll back to the top"""
+        self.items = tuple(items)
+        # 新数据从最小行高重新开始测量 / New data is measured again from the minimum row height
+        self._set_row_height(self.min_row_height)
+        self.canvas.yview_moveto(0)
+        self._schedule_render()
+    
+    def _set_row_height(self, row_height):
+        if row_height != self.row_height:
+            self.row_height = row_height
+            # 强制重新设置窗口高度和位置 / Force the windows to be resized and repositioned
+            self._width = None
+            for card in self.cards:
+                card.index = None
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.row_height))
+    
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+    
+    def _schedule_render(self):
+        # 同一轮事件中的多次滚动和缩放只渲染一次 / Scrolls and resizes within one event round render once
+        if self._pending is None:
+            self._pending = self.canvas.after_idle(self.render)
+    
+    def render(self):
+        """把池中的卡片分配给可见行 / Assign pooled cards to the visible rows"""
+        self._pending = None
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first = max(0, int(top // self.row_height))
+        last = min(len(self.items), int((top + height) // self.row_height) + 1)
+        
+        # 卡片池只在可见行数增加时扩大 / The pool only grows when more rows become visible
+        while len(self.cards) < last - first:
+            card = StrategyCard(self.canvas)
+            self.cards.append(card)
+            self.windows.append(self.canvas.create_window(5, 0, window=card.frame, anchor="nw", state="hidden"))
+            self._width = None
+        
+        width = max(self.canvas.winfo_width() - 10, 1)
+        if width != self._width:
+            self._width = width
+            for window in self.windows:
+                self.canvas.itemconfigure(window, width=width, height=self.row_height - CARD_GAP)
+        
+        # 行号对池大小取模决定使用哪张卡片，滚动时仍可见的行保留原卡片
+        # The row number modulo the pool size picks the card, so rows that stay visible keep their card while scrolling
+        pool = len(self.cards)
+        shown = set()
+        for index in range(first, last):
+            slot = index % pool
+            shown.add(slot)
+            card = self.cards[slot]
+            card.update(self.items[index])
+            if card.index != index:
+                card.index = index
+                self.canvas.coords(self.windows[slot], 5, index * self.row_height)
+                self.canvas.itemconfigure(self.windows[slot], state="normal")
+        for slot, card in enumerate(self.cards):
+            if slot not in shown and card.index is not None:
+                card.index = None
+                self.canvas.itemconfigure(self.windows[slot], state="hidden")
+        if shown:
+            self._fit_rows([self.cards[slot] for slot in shown])
+    
+    def _fit_rows(self, cards):
+        # 测量可见卡片内容所需的高度，放不下时加大行高后重新渲染；行高在同一组数据内只增不减
+        # Measure the height the visible cards' content needs and, when it does not fit, raise the row height and render again;
+        # within one set of items the row height only grows
+        if self._measuring:
+            return
+        self._measuring = True
+        try:
+            # 容器的所需尺寸在空闲时才重新计算 / Containers recompute their requested size at idle time
+            self.canvas.update_idletasks()
+        finally:
+            self._measuring = False
+        needed = max(card.frame.winfo_reqheight() for card in cards) + CARD_GAP
+        if needed > self.row_height:
+            self._set_row_height(needed)
+            self._schedule_render()
+    
+    def _on_wheel(self, event):
+        widget = self.canvas.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.canvas)):
+            return
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
@@ -0,0 +1,98 @@
+# scoring.py
+# 加权评分引擎：按五个回答对全部策略打分排序
+# Weighted scoring engine: score and rank every strategy against all five answers
+#
+# 每个策略有一组属性（方向、幅度、波动率敞口、风险、时间价值），每个回答给出某个属性的目标值和权重，
+# 得分为 1 减去按属性区间归一化后的加权平方距离。所有策略（和多组回答）的得分由一次矩阵运算得到。
+# Every strategy has attributes (direction, movement, vol exposure, risk, theta profile); every answer sets a target and
+# weight for one attribute. The score is 1 minus the weighted squared distance normalized by each attribute's range,
+# computed for all strategies (and many answer sets) in one matrix operation.
+
+import collections
+
+import numpy as np
+
+import catalog
+
+# 排序结果中的一项 / One entry of a ranking
+RankedStrategy = collections.namedtuple('RankedStrategy', ['strategy_id', 'score'])
+
+# 按目录版本缓存的模型 / Models cached per catalog version
+_models = {}
+
+
+class ScoringModel:
+    def __init__(self, structure):
+        scoring = structure['scoring']
+        self.attributes = tuple(scoring['attributes'])
+        self.strategy_ids = structure['strategy_ids']
+        self.question_ids = structure['question_ids']
+        
+        # 属性按区间缩放到 [0, 1]，各属性的距离可以直接相加 / Attributes are scaled to [0, 1] by their ranges so distances add up
+        low = np.array([scoring['attributes'][name][0] for name in self.attributes])
+        span = np.array([scoring['attributes'][name][1] for name in self.attributes]) - low
+        attributes = structure['strategy_attributes']
+        self.matrix = (np.array([[attributes[strategy_id][name] for name in self.attributes]
+                                 for strategy_id in self.strategy_ids], dtype=float) - low) / span
+        self._squared = self.matrix ** 2
+        
+        # 每个问题的 取值 -> (属性列, 缩放后的目标值, 权重) / Per question: value -> (attribute column, scaled target, weight)
+        self._preferences = []
+        for question_id in self.question_ids:
+            question = scoring['questions'][question_id]
+            column = self.attributes.index(question['attribute'])
+            self._preferences.append({
+                value: (column, (target - low[column]) / span[column], weight)
+                for value, (target, weight) in question['options'].items()
+            })
+    
+    def preferences(self, answers_list):
+        """把多组回答转换为目标矩阵和权重矩阵，缺失或未知的回答权重为 0
+        Turn many answer sets into target and weight matrices; missing or unknown answers get zero weight"""
+        targets = np.zeros((len(answers_list), len(self.attributes)))
+        weights = np.zeros((len(answers_list), len(self.attributes)))
+        for question_id, options in zip(self.question_ids, self._preferences):
+            for row, answers in enumerate(answers_list):
+                preference = options.get(answers.get(question_id))
+                if preference is not None:
+                    column, target, weight = preference
+                    targets[row, column] = target
+                    weights[row, column] += weight
+        return targets, weights
+    
+    def score(self, answers_list):
+        """为每组回答给全部策略打分，返回 (回答组数, 策略数) 的 [0, 1] 得分矩阵
+        Score every strategy for every answer set, returning a (answer sets, strategies) matrix of scores in [0, 1]"""
+        targets, weights = self.preferences(answers_list)
+        # 展开 sum(w * (a - t)^2) = a^2·w - 2 a·(w t) + t^2·w，三项都是矩阵乘法
+        # Expand sum(w * (a - t)^2) = a^2·w - 2 a·(w t) + t^2·w so all three terms are matrix products
+        distance = (weights @ self._squared.T
+                    - 2.0 * (weights * targets) @ self.matrix.T
+                    + (weights * targets ** 2).sum(axis=1, keepdims=True))
+        total = weights.sum(axis=1, keepdims=True)
+        return 1.0 - np.divide(np.maximum(distance, 0.0), total, out=np.zeros_like(distance), where=total > 0)
+    
+    def rank(self, answers, limit=None):
+        """按得分从高到低排序策略，limit 为空时返回全部 / Rank strategies by descending score, all of them unless limit is given"""
+        scores = self.score([answers])[0]
+        if limit is not None and limit < len(scores):
+            if limit <= 0:
+                return []
+            # 只对不低于第 limit 名得分的策略排序，策略很多时更快；同分时按目录顺序取舍
+            # Only sort strategies scoring at least the limit-th best, faster with many strategies; ties keep catalog order
+            cutoff = -np.partition(-scores, limit - 1)[limit - 1]
+            order = np.flatnonzero(scores >= cutoff)
+            order = order[np.argsort(-scores[order], kind='stable')][:limit]
+        else:
+            order = np.argsort(-scores, kind='stable')
+        return [RankedStrategy(self.strategy_ids[index], float(scores[index])) for index in order.tolist()]
+
+
+def load_model():
+    """当前目录版本的评分模型 / Scoring model of the current catalog version"""
+    model = _models.get(catalog.version)
+    if model is None:
+        model = ScoringModel(catalog.load_structure())
+        _models.clear()
+        _models[catalog.version] = model
+    return model
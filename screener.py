@@ -0,0 +1,230 @@
+# screener.py
+# 多标的观察列表筛选：逐个标的推导回答、选择合约并定价，可在进程池中并行，结果按完成顺序流式输出
+# Multi-symbol watchlist screening: derive answers, pick contracts and price them per symbol, optionally in a process pool,
+# streaming results as each symbol finishes
+
+import collections
+import concurrent.futures
+import functools
+import math
+import os
+
+import numpy as np
+
+from chain_store import ChainStore, to_days
+from market_view import atm_iv, derive_answers
+from payoff import payoff_profile, stack_legs
+from pricing import net_greeks
+from strategy_selector import StrategySelector
+from strike_selector import as_of_days, describe_legs, select_recommended_legs
+from vol_surface import get_surface
+
+# 一个标的的一个推荐策略；error 非空时其余字段可能为空
+# One recommended strategy of one symbol; when error is set the other fields may be empty
+ScreenResult = collections.namedtuple('ScreenResult', [
+    'symbol', 'spot', 'iv', 'branch', 'strategy_id', 'cost', 'delta', 'gamma', 'vega', 'theta',
+    'max_profit', 'max_loss', 'legs', 'error',
+])
+
+# 可用于排序的数值列 / Numeric columns usable as sort keys
+SORT_KEYS = ('spot', 'iv', 'cost', 'delta', 'gamma', 'vega', 'theta', 'max_profit', 'max_loss')
+
+# 到期盈亏网格覆盖 0 到 3 倍标的价格 / The expiry payoff grid spans 0 to 3 times the spot
+GRID_POINTS = 3001
+
+# 每个进程缓存打开的快照和选择器 / Open snapshots and the selector are cached per process
+_stores = {}
+_selector = None
+
+
+def _open_store(path):
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = ChainStore(path)
+    return store
+
+
+def _get_selector():
+    global _selector
+    if _selector is None:
+        _selector = StrategySelector()
+    return _selector
+
+
+def load_price_history(root, symbols, lookback=20, end=None):
+    """从按日期命名的快照目录读取各标的最近 lookback+1 个收盘价 / Read the last lookback+1 closes per symbol from dated snapshot directories"""
+    # 只打开最后几个快照，且只读取其索引 / Only the last few snapshots are opened, and only their indexes are read
+    dated = []
+    for name in os.listdir(root):
+        try:
+            day = to_days(name)
+        except ValueError:
+            continue
+        if end is None or day <= end:
+            dated.append((day, name))
+    history = {symbol: [] for symbol in symbols}
+    for _, name in sorted(dated)[-(lookback + 1):]:
+        store = ChainStore(os.path.join(root, name))
+        for symbol, prices in history.items():
+            spot = store.spot(symbol) if symbol in store else None
+            if spot is not None:
+                prices.append(spot)
+    return history
+
+
+def screen_symbol(store_path, symbol, prices=None, answers=None, risk_tolerance='medium', time_horizon='medium'):
+    """筛选单个标的：回答未给出时由价格历史和平值隐含波动率推导 / Screen one symbol, deriving the answers from price history and ATM IV when not given"""
+    store = _open_store(store_path)
+    symbol = symbol.upper()
+    if symbol not in store or store.spot(symbol) is None:
+        return [ScreenResult(symbol, *[None] * 12, error='symbol not in snapshot')]
+    spot = store.spot(symbol)
+    as_of = as_of_days(store)
+    iv = atm_iv(store, symbol, as_of)
+
+    if answers is None:
+        if prices is None or len(prices) < 3:
+            return [ScreenResult(symbol, spot, iv, *[None] * 10, error='not enough price history')]
+        answers = derive_answers(prices, iv, risk_tolerance, time_horizon)
+    selector = _get_selector()
+    try:
+        branch, strategy_ids = selector.select_rule(answers)
+    except KeyError as error:
+        return [ScreenResult(symbol, spot, iv, *[None] * 10, error=f"missing answer: {error.args[0]}")]
+
+    selections = select_recommended_legs(store, symbol, strategy_ids, answers, as_of)
+    if not selections:
+        return [ScreenResult(symbol, spot, iv, branch, *[None] * 9, error='no contracts for the recommended strategies')]
+
+    # 所有推荐策略一起定价 / Price all recommended strategies together
+    legs = stack_legs(selection.legs for selection in selections)
+    slots = max((selection.expiries for selection in selections), key=len)
+    expiries = tuple(max(days - as_of, 1) / 365 for days in slots)
+    # 各腿按其执行价和到期日从波动率曲面取值 / Each leg takes its vol from the surface at its strike and expiry
+    surface = get_surface(store, symbol)
+    if surface is not None:
+        vol = surface.vols(np.where(legs.strike > 0, legs.strike, spot), np.asarray(slots)[legs.expiry])
+    else:
+        vol = iv
+    greeks = net_greeks(legs, spot, expiries, vol)
+    cost = (legs.quantity * legs.premium).sum(axis=1)
+    # 近月到期时估值，仍未到期的远月腿按剩余期限的 Black-Scholes 价值计 / Valued at the near expiry, with still-open far legs at Black-Scholes value
+    profile = payoff_profile(legs, np.linspace(0.0, 3.0 * spot, GRID_POINTS), expiries, vol)
+
+    return [
+        ScreenResult(symbol, spot, iv, branch, selection.strategy_id, float(cost[row]), float(greeks.delta[row]),
+                     float(greeks.gamma[row]), float(greeks.vega[row]), float(greeks.theta[row]),
+                     float(profile.max_profit[row]), float(profile.max_loss[row]), describe_legs(selection), None)
+        for row, selection in enumerate(selections)
+    ]
+
+
+def _error_result(symbol, error):
+    return [ScreenResult(str(symbol).upper(), *[None] * 12, error=f"{type(error).__name__}: {error}")]
+
+
+def screen_symbol_safely(store_path, symbol, prices=None, answers=None, **options):
+    """筛选单个标的，异常转为该标的的出错行，可在子进程中运行 / Screen one symbol, turning exceptions into an error row; runnable in a worker process"""
+    try:
+        return screen_symbol(store_path, symbol, prices, answers, **options)
+    except Exception as error:
+        return _error_result(symbol, error)
+
+
+def run_screen(store_path, symbols, history=None, answers=None, workers=1, **options):
+    """筛选整个观察列表，每完成一个标的产出其结果列表 / Screen a whole watchlist, yielding each symbol's result list as it finishes
+    
+    history 为 标的 -> 收盘价序列，answers 为 标的 -> 回答字典，二者都可缺省。
+    history maps symbol -> closing prices and answers maps symbol -> answer dict; both are optional.
+    """
+    history = history or {}
+    answers = answers or {}
+    items = [(symbol, history.get(symbol), answers.get(symbol)) for symbol in symbols]
+    task = functools.partial(screen_symbol_safely, store_path, **options)
+    if workers > 1:
+        # 每个标的单独提交，完成一个产出一个；子进程本身失败时也只影响对应标的
+        # Each symbol is submitted on its own and yielded as it finishes; even a failed worker only affects its symbol
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(task, *item): item[0] for item in items}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as error:
+                    yield _error_result(futures[future], error)
+    else:
+        for item in items:
+            yield task(*item)
+
+
+def summarize(results, sort_by='vega', descending=True):
+    """把结果展平并按数值列排序，缺失值与出错的行排在最后 / Flatten results and sort by a numeric column, with missing values and errors last"""
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"cannot sort by {sort_by!r}, expected one of {', '.join(SORT_KEYS)}")
+    rows = [row for symbol_results in results for row in symbol_results]
+    
+    def key(row):
+        value = getattr(row, sort_by)
+        if value is None or math.isnan(value):
+            return (1, 0.0)
+        return (0, -value if descending else value)
+    return sorted(rows, key=key)
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="观察列表期权策略筛选 / Watchlist option strategy screening")
+    parser.add_argument("store", help="当日期权链快照目录 / Directory of the current option-chain snapshot")
+    parser.add_argument("--watchlist", help="每行一个标的的文件，默认为快照中全部标的 / File with one symbol per line, all symbols in the snapshot by default")
+    parser.add_argument("--history", help="按日期命名的快照目录的上级目录，用于推导回答 / Parent of dated snapshot directories used to derive answers")
+    parser.add_argument("--answers", help="JSON Lines 回答文件，每行含 symbol 字段 / JSON Lines answers, one record with a symbol field per line")
+    parser.add_argument("--lookback", type=int, default=20)
+    parser.add_argument("--risk-tolerance", default="medium", choices=("low", "medium", "high"))
+    parser.add_argument("--time-horizon", default="medium", choices=("short", "medium", "long"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sort", default="vega", choices=SORT_KEYS)
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--csv", help="把排序后的汇总写入 CSV 文件 / Write the sorted summary to a CSV file")
+    arguments = parser.parse_args()
+
+    store = ChainStore(arguments.store)
+    if arguments.watchlist:
+        with open(arguments.watchlist, encoding='utf-8') as handle:
+            symbols = [line.strip().upper() for line in handle if line.strip()]
+    else:
+        symbols = store.symbols()
+    given_answers = {}
+    if arguments.answers:
+        with open(arguments.answers, encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    given_answers[str(record.pop('symbol')).upper()] = record
+    history = None
+    if arguments.history:
+        history = load_price_history(arguments.history, symbols, arguments.lookback, as_of_days(store))
+
+    results = []
+    for symbol_results in run_screen(arguments.store, symbols, history, given_answers, arguments.workers,
+                                     risk_tolerance=arguments.risk_tolerance, time_horizon=arguments.time_horizon):
+        results.append(symbol_results)
+        # 每完成一个标的立即输出进度 / Report each symbol as soon as it finishes
+        first = symbol_results[0]
+        status = first.error or ', '.join(row.strategy_id for row in symbol_results)
+        print(f"[{len(results)}/{len(symbols)}] {first.symbol}: {status}", file=sys.stderr)
+
+    summary = summarize(results, arguments.sort, not arguments.ascending)
+    if arguments.csv:
+        with open(arguments.csv, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(ScreenResult._fields)
+            writer.writerows(summary)
+    for row in summary:
+        if row.error:
+            print(f"{row.symbol:<8} {row.error}")
+        else:
+            print(f"{row.symbol:<8} {row.strategy_id:<24} cost {row.cost:9.2f}  delta {row.delta:7.3f}  "
+                  f"vega {row.vega:8.3f}  theta {row.theta:8.3f}  max loss {row.max_loss:10.2f}  {row.branch}")
@@ -0,0 +1,185 @@
+# service.py
+# 无界面的 asyncio HTTP/JSON 推荐服务 / Headless asyncio HTTP/JSON recommendation service
+
+import asyncio
+import json
+import urllib.parse
+
+from strategy_selector import SUPPORTED_LANGUAGES, StrategySelector
+
+# 请求体大小上限 / Maximum request body size
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# 连接空闲超时秒数 / Idle keep-alive timeout in seconds
+KEEP_ALIVE_TIMEOUT = 15
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+            500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _check_answers(answers):
+    # 回答取值必须是字符串，否则选择器查表时会抛出 TypeError / Answer values must be strings, otherwise the selector's lookup raises TypeError
+    for question_id, value in answers.items():
+        if not isinstance(value, str):
+            raise HTTPError(400, f"answer to {question_id!r} must be a string")
+
+
+class StrategyService:
+    def __init__(self, selector=None):
+        # 所有连接共享同一个策略选择器，语言按请求传入而不修改实例状态
+        # All connections share one selector; the language is passed per request instead of mutating its state
+        self.selector = selector or StrategySelector()
+        self.routes = {
+            ('GET', '/languages'): self.languages,
+            ('GET', '/questions'): self.questions,
+            ('POST', '/recommend'): self.recommend,
+            ('POST', '/recommend/batch'): self.recommend_batch,
+        }
+    
+    def _language(self, query, body=None):
+        # 语言取自 ?lang= 或请求体的 language 字段 / The language comes from ?lang= or the body's language field
+        language = query.get('lang') or (body or {}).get('language') or self.selector.get_language()
+        if language not in SUPPORTED_LANGUAGES:
+            raise HTTPError(400, f"unsupported language: {language}")
+        return language
+    
+    def languages(self, query, body):
+        """GET /languages"""
+        return {'languages': list(SUPPORTED_LANGUAGES), 'default': self.selector.get_language()}
+    
+    def questions(self, query, body):
+        """GET /questions?lang=en"""
+        language = self._language(query)
+        return {'language': language, 'questions': self.selector.get_questions(language)}
+    
+    def recommend(self, query, body):
+        """POST /recommend {"answers": {...}, "language": "en"}"""
+        language = self._language(query, body)
+        answers = body.get('answers')
+        if not isinstance(answers, dict):
+            raise HTTPError(400, "'answers' must be an object")
+        _check_answers(answers)
+        try:
+            strategies = self.selector.select_strategies(answers, language)
+            branch = self.selector.select_rule_branch(answers)
+        except KeyError as error:
+            raise HTTPError(400, f"missing answer: {error.args[0]}")
+        # 推荐结果为只读映射，序列化前转换为字典 / Recommendations are read-only mappings, converted to dicts for JSON
+        return {'language': language, 'branch': branch, 'strategies': [dict(strategy) for strategy in strategies]}
+    
+    def recommend_batch(self, query, body):
+        """POST /recommend/batch {"answers": [{...}, ...], "language": "en"}"""
+        language = self._language(query, body)
+        answers = body.get('answers')
+        if not isinstance(answers, list) or not all(isinstance(item, dict) for item in answers):
+            raise HTTPError(400, "'answers' must be a list of objects")
+        for item in answers:
+            _check_answers(item)
+        try:
+            results = self.selector.select_strategies_batch(answers)
+        except KeyError as error:
+            raise HTTPError(400, f"missing answer: {error.args[0]}")
+        # 每个策略的本地化信息只返回一次 / Localized entries are returned once per distinct strategy
+        strategy_ids = {strategy_id for row in results for strategy_id in row}
+        return {
+            'language': language,
+            'results': [list(row) for row in results],
+            'strategies': {strategy_id: self.selector.get_strategy(strategy_id, language) for strategy_id in strategy_ids},
+        }
+    
+    def handle(self, method, target, body):
+        """处理一个请求，返回状态码和 JSON 对象 / Handle one request and return the status code and JSON payload"""
+        url = urllib.parse.urlsplit(target)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        route = self.routes.get((method, url.path))
+        if route is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HTTPError(405, f"{method} not allowed on {url.path}")
+            raise HTTPError(404, f"no route for {url.path}")
+        if method == 'POST':
+            try:
+                body = json.loads(body or b'{}')
+            except ValueError:
+                raise HTTPError(400, "request body is not valid JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "request body must be a JSON object")
+        return 200, route(query, body)
+    
+    async def serve_connection(self, reader, writer):
+        """处理一个连接上的多个请求，流水线请求按顺序应答 / Serve many requests on one connection, answering pipelined requests in order"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                # HTTP/1.1 默认保持连接，HTTP/1.0 需显式声明 / HTTP/1.1 keeps connections alive by default, HTTP/1.0 must ask for it
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    break
+                if length > MAX_BODY_BYTES:
+                    status, payload, keep_alive = 413, {'error': 'request body too large'}, False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = self.handle(method.upper(), target, body)
+                    except HTTPError as error:
+                        status, payload = error.status, {'error': str(error)}
+                    except Exception as error:
+                        # 请求体已完整读取，连接可以照常继续 / The body was read in full, so the connection can carry on as usual
+                        status, payload = 500, {'error': f"internal error: {type(error).__name__}"}
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8080, selector=None):
+    """启动服务并一直运行 / Start the service and run forever"""
+    service = StrategyService(selector)
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="期权策略推荐服务 / Option strategy recommendation service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--language", default="cn", choices=SUPPORTED_LANGUAGES)
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.host, arguments.port, StrategySelector(arguments.language)))
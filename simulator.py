@@ -0,0 +1,133 @@
+# simulator.py
+# 推荐策略的蒙特卡洛盈亏模拟 / Monte Carlo P&L simulation for recommended strategies
+
+import collections
+import concurrent.futures
+import math
+
+import numpy as np
+
+import instrumentation
+from payoff import build_legs, stack_legs
+from pricing import horizon_pnl, priced_legs
+from strike_selector import HORIZON_DAYS, MOVEMENT_WIDTH
+
+# 波动率观点对应的模拟波动率倍数 / Simulated vol multiplier for each volatility view
+VOL_VIEW_MULTIPLIER = {'increase': 1.25, 'decrease': 0.8, 'stable': 1.0, 'unknown': 1.0}
+
+# 模板策略远月腿比近月多出的年数 / Extra years to the far expiry for template strategies
+FAR_EXPIRY_GAP = 30 / 365
+
+# 模拟结果，各字段按策略排列；histogram 的区间为 bin_edges
+# Simulation result, every field is per strategy; histogram counts fall into bin_edges
+SimulationResult = collections.namedtuple('SimulationResult', [
+    'strategy_ids', 'paths', 'mean', 'std', 'probability_of_profit', 'expected_shortfall', 'histogram', 'bin_edges'
+])
+
+
+def terminal_prices(spot, years, vol, rate, dividend, count, generator):
+    """几何布朗运动下的到期价格 / Terminal prices under geometric Brownian motion"""
+    drift = (rate - dividend - 0.5 * vol * vol) * years
+    return spot * np.exp(drift + vol * math.sqrt(years) * generator.standard_normal(count))
+
+
+def _simulate_chunk(task):
+    # 单个分块的部分统计量，可在子进程中运行 / Partial statistics of one chunk, runnable in a worker process
+    legs, spot, expiries, vol, rate, dividend, count, seed, tail_size, edges = task
+    generator = np.random.default_rng(seed)
+    prices = terminal_prices(spot, expiries[0], vol, rate, dividend, count, generator)
+    pnl = horizon_pnl(legs, prices, expiries, vol, rate, dividend)
+
+    bins = edges.shape[1] - 1
+    scaled = (pnl - edges[:, :1]) / (edges[:, -1:] - edges[:, :1]) * bins
+    index = np.clip(scaled.astype(np.int64), 0, bins - 1) + np.arange(len(pnl))[:, None] * bins
+    histogram = np.bincount(index.ravel(), minlength=len(pnl) * bins).reshape(len(pnl), bins)
+
+    keep = min(tail_size, count)
+    tail = np.partition(pnl, keep - 1, axis=1)[:, :keep]
+    return pnl.sum(axis=1), np.square(pnl).sum(axis=1), (pnl > 0).sum(axis=1), tail, histogram
+
+
+@instrumentation.timed('simulator.simulate')
+def simulate(legs, spot, expiries, vol, rate=0.0, dividend=0.0, paths=1000000, chunk_size=100000,
+             workers=1, seed=None, alpha=0.05, bins=100, strategy_ids=None):
+    """分块模拟多个策略的盈亏分布 / Simulate the P&L distribution of several strategies in chunks"""
+    # expiries 为各到期序号的剩余年数，近月到期时结算；workers 大于1时分块在进程池中运行
+    # expiries holds years per expiry slot and P&L is taken at the near one; chunks run in a process pool when workers > 1
+    expiries = tuple(float(years) for years in expiries)
+    tail_size = max(1, int(math.ceil(alpha * paths)))
+
+    # 直方图区间取 ±6 个标准差价格范围内的盈亏上下限 / Histogram range spans the P&L over a ±6 standard deviation price range
+    spread = 6.0 * vol * math.sqrt(expiries[0])
+    grid = spot * np.exp(np.linspace(-spread, spread, 2001))
+    curve = horizon_pnl(legs, grid, expiries, vol, rate, dividend)
+    low, high = curve.min(axis=1), curve.max(axis=1)
+    high = np.where(high > low, high, low + 1.0)
+    edges = np.linspace(low, high, bins + 1, axis=1)
+
+    counts = [chunk_size] * (paths // chunk_size) + ([paths % chunk_size] if paths % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = ((legs, spot, expiries, vol, rate, dividend, count, chunk_seed, tail_size, edges)
+             for count, chunk_seed in zip(counts, seeds))
+
+    total = np.zeros(len(legs.quantity))
+    total_square = np.zeros_like(total)
+    profitable = np.zeros_like(total)
+    histogram = np.zeros((len(total), bins), dtype=np.int64)
+    tail = np.empty((len(total), 0))
+
+    def merge(partial):
+        nonlocal total, total_square, profitable, histogram, tail
+        chunk_sum, chunk_square, chunk_profitable, chunk_tail, chunk_histogram = partial
+        total += chunk_sum
+        total_square += chunk_square
+        profitable += chunk_profitable
+        histogram += chunk_histogram
+        # 只保留最差的 tail_size 个结果 / Keep only the worst tail_size outcomes
+        tail = np.concatenate([tail, chunk_tail], axis=1)
+        if tail.shape[1] > tail_size:
+            tail = np.partition(tail, tail_size - 1, axis=1)[:, :tail_size]
+
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            # 限制在途分块数量，内存占用与总路径数无关 / Bound the chunks in flight so memory does not grow with the path count
+            pending = set()
+            for task in tasks:
+                if len(pending) >= 2 * workers:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+                pending.add(executor.submit(_simulate_chunk, task))
+            for future in concurrent.futures.as_completed(pending):
+                merge(future.result())
+    else:
+        for task in tasks:
+            merge(_simulate_chunk(task))
+
+    mean = total / paths
+    std = np.sqrt(np.maximum(total_square / paths - mean * mean, 0.0))
+    return SimulationResult(
+        list(strategy_ids) if strategy_ids is not None else None,
+        paths, mean, std, profitable / paths, tail.mean(axis=1), histogram, edges
+    )
+
+
+def simulate_recommendations(strategy_ids, answers, spot, vol, rate=0.0, dividend=0.0, selections=None, as_of=None,
+                             **options):
+    """按用户的时间周期和波动率观点模拟推荐策略 / Simulate recommended strategies under the user's horizon and volatility view"""
+    # vol 为当前市场波动率，用于给模板策略定价；模拟时乘以波动率观点倍数
+    # vol is the current market vol used to price template legs; simulation scales it by the volatility view
+    simulated_vol = vol * VOL_VIEW_MULTIPLIER.get(answers.get('volatility_view'), 1.0)
+    if selections:
+        # 使用期权链选定的合约，期限为到期日距 as_of 的年数 / Use contracts picked from the chain, terms are years from as_of to their expiries
+        strategy_ids = [selection.strategy_id for selection in selections]
+        legs = stack_legs(selection.legs for selection in selections)
+        slots = max((selection.expiries for selection in selections), key=len)
+        expiries = tuple((days - as_of) / 365 for days in slots)
+    else:
+        years = HORIZON_DAYS.get(answers.get('time_horizon'), HORIZON_DAYS['medium']) / 365
+        expiries = (years, years + FAR_EXPIRY_GAP)
+        width = MOVEMENT_WIDTH.get(answers.get('price_movement'), MOVEMENT_WIDTH['moderate'])
+        legs = stack_legs(build_legs(strategy_id, spot, width) for strategy_id in strategy_ids)
+        legs = priced_legs(legs, spot, expiries, vol, rate, dividend)
+    return simulate(legs, spot, expiries, simulated_vol, rate, dividend, strategy_ids=strategy_ids, **options)
@@ -0,0 +1,129 @@
+# strike_selector.py
+# 为推荐策略选择具体执行价和到期日 / Pick concrete strikes and expiries for recommended strategies
+
+import collections
+import datetime
+
+import numpy as np
+
+import instrumentation
+from chain_store import from_days, to_days
+from payoff import CALL, PUT, STOCK, STRATEGY_TEMPLATES, Leg
+
+# 投资时间周期对应的目标到期天数 / Target days to expiry for each time horizon
+HORIZON_DAYS = {'short': 21, 'medium': 60, 'long': 120}
+
+# 价格变动幅度对应的执行价档宽（标的价格的比例）/ Strike step width for each price movement band, as a fraction of spot
+MOVEMENT_WIDTH = {'small': 0.05, 'moderate': 0.10, 'large': 0.15}
+
+# 选定的策略：expiries 为各到期序号对应的到期日天数，legs 的期权费为买卖中间价
+# Selected strategy: expiries maps expiry slots to days since epoch, leg premiums are bid/ask mids
+StrategyLegs = collections.namedtuple('StrategyLegs', ['strategy_id', 'symbol', 'spot', 'expiries', 'legs'])
+
+_KIND_LABELS = {CALL: 'C', PUT: 'P'}
+
+
+def as_of_days(store):
+    """返回期权链快照日期的天数 / Return the snapshot date of a chain store as days since epoch"""
+    return to_days(datetime.date.fromisoformat(store.as_of[:10]))
+
+
+def choose_expiry(expiries, as_of, horizon):
+    """二分查找最接近目标期限的到期日位置 / Binary-search the position of the expiry closest to the horizon target"""
+    first = int(np.searchsorted(expiries, as_of, side='right'))
+    if first == len(expiries):
+        raise ValueError("no expiry after the snapshot date")
+    target = as_of + HORIZON_DAYS.get(horizon, HORIZON_DAYS['medium'])
+    position = int(np.searchsorted(expiries, target))
+    if position == len(expiries):
+        return len(expiries) - 1
+    if position > first and target - expiries[position - 1] <= expiries[position] - target:
+        return position - 1
+    return max(position, first)
+
+
+def _nearest(strikes, target):
+    # 二分查找最近的执行价 / Binary-search the nearest strike
+    position = int(np.searchsorted(strikes, target))
+    if position == len(strikes) or (position > 0 and target - strikes[position - 1] <= strikes[position] - target):
+        return position - 1
+    return position
+
+
+def _strike_ladder(store, symbol, expiry):
+    # 同一到期日内先看涨后看跌，各自按执行价升序 / Within an expiry calls come before puts, each sorted by strike
+    chain = store.chain(symbol, int(expiry))
+    split = int(np.searchsorted(chain.kind, PUT))
+    # 缺少买价或卖价的执行价没有可用的中间价，不参与选择 / Strikes missing a bid or an ask have no usable mid and are left out
+    quoted = np.isfinite(chain.bid) & np.isfinite(chain.ask)
+    return {
+        kind: (chain.strike[part][quoted[part]], chain.bid[part][quoted[part]], chain.ask[part][quoted[part]])
+        for kind, part in ((CALL, slice(None, split)), (PUT, slice(split, None)))
+    }
+
+
+@instrumentation.timed('strike_selector.select_legs')
+def select_legs(store, symbol, strategy_id, answers, as_of=None):
+    """根据期权链为策略选择执行价和到期日 / Select strikes and expiries for a strategy from an option chain"""
+    spot = store.spot(symbol)
+    if spot is None:
+        raise ValueError(f"no underlying price for {symbol}")
+    if as_of is None:
+        as_of = as_of_days(store)
+    expiries = store.expiries(symbol)
+    template = STRATEGY_TEMPLATES[strategy_id]
+
+    # 近月到期日由投资时间周期决定，远月取其后一个到期日 / The near expiry follows the time horizon, the far one is the next listed expiry
+    near = choose_expiry(expiries, as_of, answers.get('time_horizon'))
+    slots = [int(expiries[near])]
+    if any(expiry_slot == 1 for _, _, _, expiry_slot in template):
+        if near + 1 >= len(expiries):
+            raise ValueError(f"{symbol} has no expiry after {from_days(slots[0])} for {strategy_id}")
+        slots.append(int(expiries[near + 1]))
+    ladders = [_strike_ladder(store, symbol, expiry) for expiry in slots]
+
+    width = MOVEMENT_WIDTH.get(answers.get('price_movement'), MOVEMENT_WIDTH['moderate'])
+    chosen = {}
+    legs = []
+    # 按偏移档数从小到大选取，保证不同档位落在不同执行价上 / Walk offsets in ascending order so distinct offsets land on distinct strikes
+    for index in sorted(range(len(template)), key=lambda i: template[i][2]):
+        kind, quantity, offset, expiry_slot = template[index]
+        if kind == STOCK:
+            legs.append((index, Leg(STOCK, quantity, 0.0, spot, expiry_slot)))
+            continue
+        strikes, bids, asks = ladders[expiry_slot][kind]
+        if len(strikes) == 0:
+            raise ValueError(f"{symbol} has no quoted {'calls' if kind == CALL else 'puts'} on {from_days(slots[expiry_slot])}")
+        position = _nearest(strikes, spot * (1 + offset * width))
+        previous = chosen.get((kind, expiry_slot))
+        if previous is not None and offset > previous[0] and position <= previous[1]:
+            position = min(previous[1] + 1, len(strikes) - 1)
+        chosen[(kind, expiry_slot)] = (offset, position)
+        mid = (float(bids[position]) + float(asks[position])) / 2.0
+        legs.append((index, Leg(kind, quantity, float(strikes[position]), mid, expiry_slot)))
+
+    legs.sort(key=lambda item: item[0])
+    return StrategyLegs(strategy_id, symbol.upper(), spot, tuple(slots), tuple(leg for _, leg in legs))
+
+
+def select_recommended_legs(store, symbol, strategy_ids, answers, as_of=None):
+    """为多个推荐策略选择合约，无法成交的策略跳过 / Select contracts for several recommended strategies, skipping those that cannot be filled"""
+    selections = []
+    for strategy_id in strategy_ids:
+        try:
+            selections.append(select_legs(store, symbol, strategy_id, answers, as_of))
+        except ValueError:
+            continue
+    return selections
+
+
+def describe_legs(selection):
+    """将选定的合约格式化为简短文本 / Format the selected contracts as short text"""
+    parts = []
+    for leg in selection.legs:
+        if leg.kind == STOCK:
+            parts.append(f"{leg.quantity:+g} {selection.symbol} @ {leg.premium:.2f}")
+        else:
+            expiry = from_days(selection.expiries[leg.expiry]).isoformat()
+            parts.append(f"{leg.quantity:+g} {_KIND_LABELS[leg.kind]} {leg.strike:g} {expiry} @ {leg.premium:.2f}")
+    return "; ".join(parts)
@@ -0,0 +1,44 @@
+# tests/conftest.py
+# 让测试直接导入仓库根目录下的模块，并提供小型期权链存储 / Let the tests import the modules at the repository root, and provide small option-chain stores
+
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    """按 Black-Scholes 价格写一份小期权链 CSV 并导入 / Write a small Black-Scholes-priced chain CSV and import it"""
+    from chain_store import import_csv, to_days
+    from payoff import CALL, PUT
+    from pricing import black_scholes
+
+    def make(name='store', spots=None, as_of='2026-10-16', expiries=('2026-11-20', '2026-12-18'),
+             strikes=(80.0, 90.0, 95.0, 100.0, 105.0, 110.0, 120.0), vol=0.3, unquoted=(),
+             stamp=''):
+        # stamp 为写入存储的快照时间，默认同 as_of，None 为导入时刻 / stamp is the snapshot time written to the store, as_of by default and the import time when None
+        # unquoted 中的 (标的, 类型, 执行价) 不写买卖价 / Rows (symbol, type, strike) in unquoted get blank bid and ask
+        spots = spots or {'AAA': 100.0}
+        csv_path = tmp_path / (name + '.csv')
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(csv_path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['symbol', 'expiry', 'type', 'strike', 'bid', 'ask', 'underlying'])
+            for symbol, spot in spots.items():
+                for expiry in expiries:
+                    t = (to_days(expiry) - to_days(as_of)) / 365.0
+                    for kind, code in (('C', CALL), ('P', PUT)):
+                        prices = black_scholes(code, spot, np.array(strikes), t, vol).price.tolist()
+                        for strike, price in zip(strikes, prices):
+                            if (symbol, kind, strike) in unquoted:
+                                writer.writerow([symbol, expiry, kind, strike, '', '', spot])
+                            else:
+                                writer.writerow([symbol, expiry, kind, strike, round(price - 0.01, 6), round(price + 0.01, 6), spot])
+        return import_csv(str(csv_path), str(tmp_path / name), as_of if stamp == '' else stamp)
+
+    return make
@@ -0,0 +1,29 @@
+# tests/test_backtest.py
+# 历史回测：期限从快照日期起算，缺少报价的合约不产生无效估值
+# Backtest: terms run from the snapshot date, and contracts without quotes never produce invalid marks
+
+import math
+
+import backtest
+from chain_store import to_days
+from market_view import atm_iv
+
+EXPIRIES = ('2025-03-21', '2025-04-17')
+
+
+def test_atm_iv_uses_the_snapshot_day(make_store):
+    # 在到期日之后才导入的历史快照 / A historical snapshot imported after its expiries
+    store = make_store('root/2025-02-14', as_of='2025-02-14', expiries=EXPIRIES, vol=0.3, stamp=None)
+    assert abs(atm_iv(store, 'AAA', to_days('2025-02-14')) - 0.3) < 0.01
+
+
+def test_unquoted_contracts_keep_marks_finite(make_store, tmp_path):
+    days = ['2025-02-%02d' % day for day in range(3, 14)]
+    for number, day in enumerate(days):
+        spot = 100.0 * (1.0 + 0.01 * number)
+        # 持仓期间的一天平值附近的合约都没有报价 / On a day between rebalances the contracts around the money have no quotes
+        unquoted = {('AAA', kind, strike) for kind in 'CP' for strike in (95.0, 100.0, 105.0, 110.0)} if number == 6 else ()
+        make_store('root/' + day, spots={'AAA': spot}, as_of=day, expiries=EXPIRIES, unquoted=unquoted, stamp=None)
+    result = backtest.backtest_symbol(str(tmp_path / 'root'), 'AAA', rebalance_every=5)
+    assert sum(result.trades.values()) > 0
+    assert all(math.isfinite(change) for series in result.branch_pnl.values() for _, change in series)
@@ -0,0 +1,76 @@
+# tests/test_chain_store.py
+# 期权链存储：CSV 导入后读回一致，缺失的买卖价为 NaN，按到期日切片
+# Chain store: CSV imports read back unchanged, missing bids and asks are NaN, and chains slice by expiry
+
+import csv
+
+import numpy as np
+import pytest
+
+from chain_store import ChainStore, from_days, import_csv, to_days
+from payoff import CALL, PUT
+
+ROWS = [
+    # 故意打乱顺序并混用类型写法 / Deliberately unsorted, with mixed spellings of the option kind
+    {'symbol': 'msft', 'expiry': '2026-12-18', 'type': 'put', 'strike': '400', 'bid': '12.5', 'ask': '13', 'iv': '0.25',
+     'volume': '7', 'open_interest': '70', 'underlying': '410'},
+    {'symbol': 'AAPL', 'expiry': '2026-12-18', 'type': 'C', 'strike': '200', 'bid': '', 'ask': '5.2', 'iv': '',
+     'volume': '', 'open_interest': '', 'underlying': '195.5'},
+    {'symbol': 'AAPL', 'expiry': '2026-11-20', 'type': 'P', 'strike': '190', 'bid': '3.1', 'ask': '', 'iv': '0.31',
+     'volume': '3', 'open_interest': '30', 'underlying': '195.5'},
+    {'symbol': 'AAPL', 'expiry': '2026-11-20', 'type': 'call', 'strike': '195', 'bid': '6', 'ask': '6.4', 'iv': '0.3',
+     'volume': '12', 'open_interest': '120', 'underlying': '195.5'},
+    {'symbol': 'AAPL', 'expiry': '2026-11-20', 'type': 'c', 'strike': '185', 'bid': '12', 'ask': '12.5', 'iv': '0.32',
+     'volume': '1', 'open_interest': '10', 'underlying': '195.5'},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / 'chain.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+    import_csv(str(path), str(tmp_path / 'store'), as_of='2026-10-16T16:00:00')
+    # 重新打开，确认只依赖磁盘上的文件 / Reopen to rely only on the files on disk
+    return ChainStore(str(tmp_path / 'store'))
+
+
+def test_index_round_trip(store):
+    assert store.as_of == '2026-10-16T16:00:00'
+    assert store.row_count == len(ROWS)
+    assert store.symbols() == ['AAPL', 'MSFT']
+    assert 'aapl' in store and 'TSLA' not in store
+    assert store.spot('aapl') == 195.5
+    assert [from_days(day).isoformat() for day in store.expiries('AAPL')] == ['2026-11-20', '2026-12-18']
+
+
+def test_columns_round_trip_sorted(store):
+    chain = store.chain('AAPL')
+    # 按到期日、类型、执行价排序 / Sorted by expiry, kind and strike
+    assert chain.expiry.tolist() == [to_days('2026-11-20')] * 3 + [to_days('2026-12-18')]
+    assert chain.kind.tolist() == [CALL, CALL, PUT, CALL]
+    assert chain.strike.tolist() == [185.0, 195.0, 190.0, 200.0]
+    assert chain.bid[:2].tolist() == [12.0, 6.0]
+    assert chain.volume.tolist() == [1, 12, 3, 0]
+    assert chain.open_interest.tolist() == [10, 120, 30, 0]
+
+
+def test_missing_quotes_are_nan(store):
+    chain = store.chain('AAPL')
+    assert np.isnan(chain.ask[2]) and chain.bid[2] == 3.1
+    assert np.isnan(chain.bid[3]) and chain.ask[3] == 5.2
+    assert np.isnan(chain.iv[3])
+
+
+def test_expiry_slices(store):
+    near = store.chain('aapl', '2026-11-20')
+    assert near.symbol == 'AAPL' and near.spot == 195.5
+    assert near.strike.tolist() == [185.0, 195.0, 190.0]
+    far = store.chain('AAPL', to_days('2026-12-18'))
+    assert far.strike.tolist() == [200.0]
+    msft = store.chain('MSFT', '2026-12-18')
+    assert msft.kind.tolist() == [PUT] and msft.iv.tolist() == [0.25]
+    with pytest.raises(KeyError):
+        store.chain('AAPL', '2027-01-15')
@@ -0,0 +1,31 @@
+# tests/test_cli.py
+# 批量推荐命令行：无效的行只产生该行的错误记录 / Batch recommendation CLI: invalid rows only produce their own error records
+
+import io
+import json
+
+import cli
+
+ANSWERS = {
+    'market_view': 'bullish',
+    'price_movement': 'small',
+    'volatility_view': 'increase',
+    'risk_tolerance': 'low',
+    'time_horizon': 'short',
+}
+
+
+def test_bad_rows_become_error_records():
+    lines = [
+        json.dumps(dict(ANSWERS, symbol='A')),
+        json.dumps(dict(ANSWERS, market_view=['x'], symbol='B')),
+        json.dumps({'symbol': 'C'}),
+        '[1]',
+    ]
+    sink = io.StringIO()
+    cli.run(io.StringIO('\n'.join(lines)), sink)
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert rows[0] == {'symbol': 'A', 'strategies': ['short_put', 'covered_call']}
+    assert rows[1]['symbol'] == 'B' and rows[1]['error'].startswith('invalid answers')
+    assert rows[2] == {'symbol': 'C', 'error': 'missing answer: market_view'}
+    assert rows[3] == {'symbol': None, 'error': 'invalid JSON object'}
@@ -0,0 +1,31 @@
+# tests/test_iv_solver.py
+# 隐含波动率求解：往返一致，无解时为 NaN / Implied vol solving: round trips, and NaN where there is no solution
+
+import numpy as np
+import pytest
+
+import iv_solver
+from payoff import CALL, PUT
+from pricing import black_scholes
+
+
+def test_round_trip():
+    kind = np.array([CALL, PUT, CALL, PUT])
+    strike = np.array([90.0, 95.0, 110.0, 120.0])
+    vol = np.array([0.15, 0.3, 0.6, 1.2])
+    price = black_scholes(kind, 100.0, strike, 0.25, vol, 0.03).price
+    assert iv_solver.implied_vol(kind, price, 100.0, strike, 0.25, 0.03) == pytest.approx(vol, abs=1e-6)
+
+
+def test_unsolvable_prices_are_nan():
+    # 超出上界、低于内在价值、解大于 MAX_VOL、已到期 / Above the upper bound, below intrinsic, root above MAX_VOL, expired
+    too_volatile = float(black_scholes(CALL, 100.0, 100.0, 1.0, 2.0 * iv_solver.MAX_VOL).price)
+    result = iv_solver.implied_vol(CALL, [120.0, 5.0, too_volatile, 3.0], 100.0, [100.0, 90.0, 100.0, 100.0],
+                                   [1.0, 1.0, 1.0, 0.0])
+    assert np.isnan(result).all()
+
+
+def test_unconverged_elements_are_nan():
+    price = float(black_scholes(CALL, 100.0, 130.0, 0.5, 0.4).price)
+    assert np.isnan(iv_solver.implied_vol(CALL, price, 100.0, 130.0, 0.5, max_iterations=1))
+    assert iv_solver.implied_vol(CALL, price, 100.0, 130.0, 0.5) == pytest.approx(0.4, abs=1e-6)
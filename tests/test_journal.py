@@ -0,0 +1,84 @@
+# tests/test_journal.py
+# 会话日志的写入、回放、统计、半条记录恢复与写入错误 / Session journal writing, replay, aggregation, torn-record recovery and write errors
+
+import pytest
+
+import journal
+
+ANSWERS = {
+    'market_view': 'bullish',
+    'price_movement': 'small',
+    'volatility_view': 'increase',
+    'risk_tolerance': 'low',
+    'time_horizon': 'short',
+}
+
+
+def _write(path, sessions):
+    writer = journal.JournalWriter(str(path))
+    for symbol, answers, language, strategy_ids, timestamp in sessions:
+        writer.append(symbol, answers, language, strategy_ids, timestamp=timestamp)
+    writer.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'sessions.journal'
+    _write(path, [
+        ('aapl', ANSWERS, 'en', ('short_put', 'covered_call'), 1700000000.5),
+        ('NVDA', {'market_view': 'bearish'}, 'cn', (), 1700000001.0),
+    ])
+    sessions = list(journal.replay(str(path)))
+    assert sessions[0] == {
+        'timestamp': 1700000000.5, 'symbol': 'AAPL', 'answers': ANSWERS, 'language': 'en',
+        'strategies': ['short_put', 'covered_call'],
+    }
+    assert sessions[1]['answers'] == {'market_view': 'bearish'}
+    assert sessions[1]['strategies'] == []
+
+    summary = journal.aggregate(str(path))
+    assert summary['sessions'] == 2
+    assert summary['symbols'] == {'AAPL': 1, 'NVDA': 1}
+    assert summary['languages'] == {'cn': 1, 'en': 1}
+    assert summary['strategies']['short_put'] == 1
+    assert summary['answers']['market_view'] == {'bullish': 1, 'bearish': 1, 'neutral': 0, 'uncertain': 0}
+
+
+def test_torn_tail_is_truncated_before_appending(tmp_path):
+    path = tmp_path / 'sessions.journal'
+    _write(path, [('AAPL', ANSWERS, 'en', ('short_put',), 1700000000.0)])
+    # 模拟写到一半时崩溃 / Simulate a crash in the middle of a write
+    with open(path, 'ab') as handle:
+        handle.write(b'\x01\x02\x03\x04\x05')
+    assert journal.aggregate(str(path))['sessions'] == 1
+
+    _write(path, [('MSFT', ANSWERS, 'cn', ('covered_call',), 1700000002.0)])
+    sessions = list(journal.replay(str(path)))
+    assert [session['symbol'] for session in sessions] == ['AAPL', 'MSFT']
+    assert sessions[1]['timestamp'] == 1700000002.0
+    assert sessions[1]['answers'] == ANSWERS
+    assert sessions[1]['strategies'] == ['covered_call']
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a journal at all')
+    # 文件在后台线程中打开，错误在关闭时抛出 / The file is opened on the writer thread, so the error surfaces on close
+    writer = journal.JournalWriter(str(path))
+    writer.append('AAPL', ANSWERS, 'en', ())
+    with pytest.raises(ValueError):
+        writer.close()
+    assert path.read_bytes() == b'not a journal at all'
+
+
+def test_write_errors_surface_on_close(tmp_path, monkeypatch):
+    def fail():
+        raise OSError(28, 'No space left on device')
+
+    writer = journal.JournalWriter(str(tmp_path / 'sessions.journal'), sync_records=1)
+    # 写入器线程遇到同步失败后继续丢弃记录，append 不会阻塞 / After a failed sync the writer thread keeps discarding records, so append never blocks
+    monkeypatch.setattr(writer, '_sync', fail)
+    for timestamp in range(3):
+        writer.append('AAPL', ANSWERS, 'en', (), timestamp=timestamp)
+    with pytest.raises(OSError):
+        writer.close()
+    assert writer.error.errno == 28
@@ -0,0 +1,48 @@
+# tests/test_payoff.py
+# 到期盈亏：期权费计入极值与盈亏平衡点，远月腿按 Black-Scholes 估值
+# Payoffs: premiums enter the extremes and breakevens, and far legs are valued by Black-Scholes
+
+import numpy as np
+import pytest
+
+import payoff
+from pricing import black_scholes, horizon_pnl, priced_legs
+
+
+def test_long_call_is_priced():
+    profile = payoff.strategy_payoffs(['long_call'], 100.0)
+    premium = float(black_scholes(payoff.CALL, 100.0, 100.0, payoff.DEFAULT_EXPIRIES[0], payoff.DEFAULT_VOL).price)
+    assert premium > 0
+    assert profile.max_loss[0] == pytest.approx(-premium)
+    assert profile.max_profit[0] == np.inf
+    assert profile.breakevens[0] == pytest.approx([100.0 + premium], abs=1e-3)
+
+
+def test_calendar_spread_values_the_far_leg():
+    profile = payoff.strategy_payoffs(['calendar_spread'], 100.0)
+    pnl = profile.pnl[0]
+    # 近月到期时在执行价附近盈利，远离执行价时最多亏损净权利金
+    # Profitable around the strike at the near expiry, losing at most the net debit far away from it
+    legs = priced_legs(payoff.stack_legs([payoff.build_legs('calendar_spread', 100.0)]), 100.0,
+                       payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)
+    debit = float((legs.quantity * legs.premium).sum())
+    assert debit > 0
+    peak = profile.grid[np.argmax(pnl)]
+    assert peak == pytest.approx(100.0, abs=0.5)
+    assert profile.max_profit[0] > 0
+    assert profile.max_loss[0] == pytest.approx(-debit, abs=1e-6)
+    assert len(profile.breakevens[0]) == 2
+
+
+def test_horizon_pnl_accepts_one_grid_row_per_strategy():
+    legs = payoff.stack_legs([payoff.build_legs('calendar_spread', 100.0), payoff.build_legs('long_call', 50.0)])
+    legs = priced_legs(legs, np.array([100.0, 50.0]), payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)
+    grid = np.linspace(0.5, 1.5, 101)
+    rows = horizon_pnl(legs, np.vstack([100.0 * grid, 50.0 * grid]), payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)
+    assert rows[0] == pytest.approx(horizon_pnl(legs, 100.0 * grid, payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)[0])
+    assert rows[1] == pytest.approx(horizon_pnl(legs, 50.0 * grid, payoff.DEFAULT_EXPIRIES, payoff.DEFAULT_VOL)[1])
+
+
+def test_evaluate_without_premiums_is_intrinsic():
+    legs = payoff.stack_legs([payoff.build_legs('long_call', 100.0)])
+    assert payoff.evaluate(legs, [90.0, 100.0, 110.0])[0] == pytest.approx([0.0, 0.0, 10.0])
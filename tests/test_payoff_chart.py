@@ -0,0 +1,24 @@
+# tests/test_payoff_chart.py
+# 盈亏图数据：远月腿估值与按像素列数降采样 / Payoff chart data: far-leg valuation and downsampling to pixel columns
+
+import numpy as np
+import pytest
+
+import payoff_chart
+
+
+def test_calendar_chart_is_not_flat():
+    chart = payoff_chart.template_chart('calendar_spread')
+    assert chart.y_low < 0 < chart.y_high
+    assert len(chart.breakevens) == 2
+    assert chart.breakevens[0] < payoff_chart.REFERENCE_SPOT < chart.breakevens[1]
+
+
+@pytest.mark.parametrize('columns', [1, 2, 15, 800, 4096, 10000])
+def test_envelope_keeps_the_extremes(columns):
+    chart = payoff_chart.template_chart('iron_condor')
+    minimum, maximum = payoff_chart.envelope(chart, columns)
+    assert len(minimum) == len(maximum) == min(columns, payoff_chart.FINEST_COLUMNS)
+    assert np.all(minimum <= maximum)
+    assert minimum.min() == pytest.approx(chart.y_low)
+    assert maximum.max() == pytest.approx(chart.y_high)
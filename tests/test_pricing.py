@@ -0,0 +1,64 @@
+# tests/test_pricing.py
+# Black-Scholes 定价：看涨看跌平价、希腊值的符号与数值差分一致
+# Black-Scholes pricing: put-call parity, and Greeks with the right signs agreeing with finite differences
+
+import numpy as np
+import pytest
+
+from payoff import CALL, PUT, STOCK
+from pricing import black_scholes, strategy_greeks
+
+STRIKES = np.array([70.0, 90.0, 100.0, 110.0, 140.0])
+TERMS = np.array([[0.05], [0.5], [2.0]])
+
+
+@pytest.mark.parametrize('rate, dividend', [(0.0, 0.0), (0.05, 0.0), (0.03, 0.02)])
+def test_put_call_parity(rate, dividend):
+    call = black_scholes(CALL, 100.0, STRIKES, TERMS, 0.3, rate, dividend)
+    put = black_scholes(PUT, 100.0, STRIKES, TERMS, 0.3, rate, dividend)
+    forward = 100.0 * np.exp(-dividend * TERMS) - STRIKES * np.exp(-rate * TERMS)
+    assert call.price - put.price == pytest.approx(forward, abs=1e-4)
+    assert call.delta - put.delta == pytest.approx(np.exp(-dividend * TERMS) * np.ones_like(STRIKES), abs=1e-6)
+    assert call.gamma == pytest.approx(put.gamma)
+    assert call.vega == pytest.approx(put.vega)
+
+
+def test_greek_signs():
+    call = black_scholes(CALL, 100.0, STRIKES, TERMS, 0.3, 0.05)
+    put = black_scholes(PUT, 100.0, STRIKES, TERMS, 0.3, 0.05)
+    assert ((call.delta > 0) & (call.delta < 1)).all()
+    assert ((put.delta < 0) & (put.delta > -1)).all()
+    for greeks in (call, put):
+        assert (greeks.price >= 0).all()
+        assert (greeks.gamma > 0).all()
+        assert (greeks.vega > 0).all()
+    # 无股息时看涨期权的时间价值随时间流逝而减少 / Without dividends a call loses value as time passes
+    assert (call.theta < 0).all()
+    assert (call.rho > 0).all()
+    assert (put.rho < 0).all()
+
+
+def test_greeks_match_finite_differences():
+    step = 0.01
+    value = black_scholes(CALL, 100.0, STRIKES, 0.5, 0.3, 0.05)
+    up = black_scholes(CALL, 100.0 + step, STRIKES, 0.5, 0.3, 0.05).price
+    down = black_scholes(CALL, 100.0 - step, STRIKES, 0.5, 0.3, 0.05).price
+    assert value.delta == pytest.approx((up - down) / (2 * step), abs=2e-3)
+    higher_vol = black_scholes(CALL, 100.0, STRIKES, 0.5, 0.3 + step, 0.05).price
+    lower_vol = black_scholes(CALL, 100.0, STRIKES, 0.5, 0.3 - step, 0.05).price
+    assert value.vega == pytest.approx((higher_vol - lower_vol) / (2 * step), rel=1e-3, abs=1e-3)
+
+
+def test_expired_and_stock_legs():
+    expired = black_scholes([CALL, PUT, STOCK], 100.0, [90.0, 90.0, 0.0], 0.0, 0.3)
+    assert expired.price.tolist() == [10.0, 0.0, 100.0]
+    assert expired.delta.tolist() == [1.0, 0.0, 1.0]
+    assert (expired.gamma == 0).all() and (expired.vega == 0).all()
+
+
+def test_straddle_is_long_vol_and_short_time():
+    greeks = strategy_greeks(['straddle'], 100.0, (30 / 365, 60 / 365), 0.25)
+    assert greeks.price[0] > 0
+    assert greeks.gamma[0] > 0 and greeks.vega[0] > 0
+    assert greeks.theta[0] < 0
+    assert abs(greeks.delta[0]) < 0.2
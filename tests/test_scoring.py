@@ -0,0 +1,114 @@
+# tests/test_scoring.py
+# 评分引擎：排序与逐项计算一致、未知回答不加权、limit 截断、同分按目录顺序
+# Scoring engine: rankings agree with a direct computation, unknown answers add no weight, limit truncates, ties keep catalog order
+
+import copy
+
+import pytest
+
+import catalog
+from scoring import ScoringModel, load_model
+
+STRUCTURE = {
+    'scoring': {
+        'attributes': {'direction': [-1.0, 1.0], 'risk': [0.0, 1.0]},
+        'questions': {
+            'market_view': {'attribute': 'direction', 'options': {'bullish': [1.0, 2.0], 'bearish': [-1.0, 2.0]}},
+            'risk_tolerance': {'attribute': 'risk', 'options': {'low': [0.0, 1.0], 'high': [1.0, 1.0]}},
+        },
+    },
+    'question_ids': ('market_view', 'risk_tolerance'),
+    'strategy_ids': ('up_risky', 'up_safe', 'flat', 'down_safe', 'up_safe_twin'),
+    'strategy_attributes': {
+        'up_risky': {'direction': 1.0, 'risk': 1.0},
+        'up_safe': {'direction': 1.0, 'risk': 0.0},
+        'flat': {'direction': 0.0, 'risk': 0.5},
+        'down_safe': {'direction': -1.0, 'risk': 0.0},
+        'up_safe_twin': {'direction': 1.0, 'risk': 0.0},
+    },
+}
+
+
+def _direct_scores(structure, answers):
+    # 逐个策略按定义计算得分 / Score each strategy straight from the definition
+    scoring = structure['scoring']
+    scores = {}
+    for strategy_id in structure['strategy_ids']:
+        distance = total = 0.0
+        for question_id in structure['question_ids']:
+            question = scoring['questions'][question_id]
+            option = question['options'].get(answers.get(question_id))
+            if option is None:
+                continue
+            low, high = scoring['attributes'][question['attribute']]
+            value = structure['strategy_attributes'][strategy_id][question['attribute']]
+            target, weight = option
+            distance += weight * ((value - target) / (high - low)) ** 2
+            total += weight
+        scores[strategy_id] = 1.0 - distance / total if total else 1.0
+    return scores
+
+
+@pytest.mark.parametrize('answers', [
+    {'market_view': 'bullish', 'risk_tolerance': 'low'},
+    {'market_view': 'bearish', 'risk_tolerance': 'high'},
+    {'market_view': 'bullish'},
+])
+def test_ranking_matches_direct_scores(answers):
+    ranking = ScoringModel(STRUCTURE).rank(answers)
+    scores = _direct_scores(STRUCTURE, answers)
+    assert [entry.score for entry in ranking] == pytest.approx([scores[entry.strategy_id] for entry in ranking])
+    order = sorted(STRUCTURE['strategy_ids'], key=lambda strategy_id: -scores[strategy_id])
+    assert [entry.strategy_id for entry in ranking] == order
+
+
+def test_catalog_ranking_order():
+    structure = catalog.load_structure()
+    answers = {'market_view': 'bullish', 'price_movement': 'large', 'volatility_view': 'increase',
+               'risk_tolerance': 'high', 'time_horizon': 'long'}
+    ranking = load_model().rank(answers)
+    assert ranking[0].strategy_id == 'long_call'
+    assert [entry.score for entry in ranking] == sorted((entry.score for entry in ranking), reverse=True)
+    assert sorted(entry.strategy_id for entry in ranking) == sorted(structure['strategy_ids'])
+
+
+def test_unknown_or_missing_answers_add_no_weight():
+    model = ScoringModel(STRUCTURE)
+    known = model.score([{'market_view': 'bullish'}])
+    assert (model.score([{'market_view': 'bullish', 'risk_tolerance': 'reckless'}]) == known).all()
+    assert (model.score([{'market_view': 'bullish', 'time_horizon': 'long'}]) == known).all()
+    # 没有任何有效回答时全部同分 / With no usable answer every strategy scores the same
+    assert (model.score([{}]) == 1.0).all()
+
+
+def test_limit_truncates_the_full_ranking():
+    model = ScoringModel(STRUCTURE)
+    answers = {'market_view': 'bullish', 'risk_tolerance': 'high'}
+    ranking = model.rank(answers)
+    for limit in range(len(ranking) + 2):
+        assert model.rank(answers, limit) == ranking[:limit]
+
+
+def test_ties_keep_catalog_order():
+    model = ScoringModel(STRUCTURE)
+    answers = {'market_view': 'bullish', 'risk_tolerance': 'low'}
+    # up_safe 与 up_safe_twin 属性相同，截断点落在二者之间 / up_safe and up_safe_twin are identical and the cut-off falls between them
+    assert [entry.strategy_id for entry in model.rank(answers)][:2] == ['up_safe', 'up_safe_twin']
+    assert [entry.strategy_id for entry in model.rank(answers, 1)] == ['up_safe']
+    assert [entry.strategy_id for entry in model.rank({}, 3)] == list(STRUCTURE['strategy_ids'][:3])
+    # 目录中的真实同分 / A real tie in the catalog
+    ranking = load_model().rank({'market_view': 'bullish'}, 3)
+    assert [entry.strategy_id for entry in ranking] == ['long_call', 'bull_call_spread', 'short_put']
+
+
+def test_limit_keeps_catalog_order_among_many_ties():
+    # 三种方向循环的 40 个策略，每个截断点都落在同分组内 / 40 strategies cycling three directions, so every cut-off falls inside a tie group
+    structure = copy.deepcopy(STRUCTURE)
+    structure['strategy_ids'] = tuple(f"s{index:02d}" for index in range(40))
+    structure['strategy_attributes'] = {strategy_id: {'direction': (1.0, -1.0, 0.0)[index % 3], 'risk': 0.0}
+                                        for index, strategy_id in enumerate(structure['strategy_ids'])}
+    model = ScoringModel(structure)
+    ranking = model.rank({'market_view': 'bullish'})
+    assert [entry.strategy_id for entry in ranking[:3]] == ['s00', 's03', 's06']
+    for limit in range(1, 40):
+        assert model.rank({'market_view': 'bullish'}, limit) == ranking[:limit]
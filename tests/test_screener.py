@@ -0,0 +1,42 @@
+# tests/test_screener.py
+# 观察列表筛选：串行与进程池结果一致，未知标的与异常输入得到出错行
+# Watchlist screening: serial and process-pool runs agree, unknown symbols and bad input become error rows
+
+import screener
+
+ANSWERS = {
+    'market_view': 'bullish',
+    'price_movement': 'small',
+    'volatility_view': 'increase',
+    'risk_tolerance': 'low',
+    'time_horizon': 'short',
+}
+SPOTS = {'AAA': 100.0, 'BBB': 98.0, 'CCC': 104.0}
+
+
+def _by_symbol(results):
+    return sorted((rows for rows in results), key=lambda rows: rows[0].symbol)
+
+
+def test_workers_give_the_same_rows(make_store):
+    store = make_store(spots=SPOTS)
+    answers = {'AAA': ANSWERS, 'CCC': dict(ANSWERS, market_view='bearish')}
+    # BBB 由价格历史推导回答 / BBB derives its answers from price history
+    history = {'BBB': [95.0, 96.5, 97.0, 98.0]}
+    serial = list(screener.run_screen(store.path, list(SPOTS), history, answers, workers=1))
+    pooled = list(screener.run_screen(store.path, list(SPOTS), history, answers, workers=2))
+    assert [rows[0].symbol for rows in serial] == list(SPOTS)
+    assert _by_symbol(pooled) == _by_symbol(serial)
+    assert all(row.error is None and row.strategy_id for rows in serial for row in rows)
+
+
+def test_unknown_symbol_and_bad_input_give_error_rows(make_store):
+    store = make_store(spots=SPOTS)
+    for workers in (1, 2):
+        results = {rows[0].symbol: rows for rows in screener.run_screen(
+            store.path, ['AAA', 'ZZZ', 'BBB'], answers={'AAA': ANSWERS, 'BBB': 'not answers'}, workers=workers)}
+        assert results['ZZZ'] == [screener.ScreenResult('ZZZ', *[None] * 12, error='symbol not in snapshot')]
+        # 异常只影响出错的标的 / An exception only affects its own symbol
+        bad, = results['BBB']
+        assert bad.error.startswith('TypeError') and bad.strategy_id is None
+        assert results['AAA'][0].error is None
@@ -0,0 +1,89 @@
+# tests/test_selector.py
+# 选择器：与规则匹配一致、缓存结果只读、批量矩阵经过校验、分支计数每次选择一次
+# Selector: agrees with rule matching, cached results are read-only, batch matrices are validated, branch counters tick once per selection
+
+import itertools
+
+import numpy as np
+import pytest
+
+import catalog
+import instrumentation
+from service import StrategyService
+from strategy_selector import StrategySelector
+
+
+def _answer_space():
+    structure = catalog.load_structure()
+    return [dict(zip(structure['question_ids'], combination))
+            for combination in itertools.product(*structure['option_values'])]
+
+
+@pytest.fixture
+def counters():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield lambda: instrumentation.snapshot()['counters']
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_table_matches_rules():
+    selector = StrategySelector()
+    for answers in _answer_space():
+        branch, strategy_ids = selector._match_rule(answers)
+        assert selector.select_rule(answers) == (branch, strategy_ids)
+        assert [strategy['id'] for strategy in selector.select_strategies(answers)] == list(strategy_ids)
+    assert selector.select_strategies_batch(_answer_space()) == [selector.select_strategy_ids(answers)
+                                                                 for answers in _answer_space()]
+
+
+def test_batch_matrix_is_validated():
+    selector = StrategySelector()
+    codes = selector.encode_answers(_answer_space())
+    expected = selector.select_strategies_batch(_answer_space())
+    assert selector.select_strategies_batch(codes) == expected
+    assert selector.select_strategies_batch(codes.astype(np.int8)) == expected
+    with pytest.raises(ValueError, match='integer dtype'):
+        selector.select_strategies_batch(codes.astype(float))
+    with pytest.raises(ValueError, match='integer dtype'):
+        selector.select_strategies_batch(codes.astype(bool))
+    with pytest.raises(ValueError, match='shape'):
+        selector.select_strategies_batch(codes[:, 1:])
+    # 超出某一列选项数的序号，即使在其他列是合法的 / A code past one column's option count, even if valid for other columns
+    counts = codes.max(axis=0) + 1
+    column = int(np.argmin(counts))
+    bad = codes[:1].copy()
+    bad[0, column] = counts[column]
+    with pytest.raises(ValueError, match=f"column {column} "):
+        selector.select_strategies_batch(bad)
+    bad[0, column] = -1
+    with pytest.raises(ValueError, match=f"column {column} "):
+        selector.select_strategies_batch(bad)
+
+
+def test_cached_results_are_read_only():
+    selector = StrategySelector(cache_size=4)
+    answers = _answer_space()[0]
+    first = selector.select_strategies(answers)
+    assert selector.select_strategies(answers) is first
+    with pytest.raises(TypeError):
+        first[0]['name'] = 'changed'
+    assert selector.cache_info().hits == 1
+
+
+def test_each_selection_counts_once(counters):
+    selector = StrategySelector()
+    # 取值未知的方向落入默认分支 / An unknown direction falls through to the fallback branch
+    fallback = dict(_answer_space()[0], market_view='sideways')
+    assert selector.select_rule_branch(fallback).startswith('fallback/')
+    assert 'selector.fallback' not in counters()
+
+    service = StrategyService(selector)
+    for _ in range(3):
+        service.recommend({}, {'answers': fallback})
+    assert counters()['selector.fallback'] == 3
+
+    selector.select_rule(fallback)
+    selector.select_rule(fallback, count=False)
+    assert counters()['selector.fallback'] == 4
@@ -0,0 +1,70 @@
+# tests/test_service.py
+# 推荐服务的错误响应与连接保持 / Error responses and keep-alive of the recommendation service
+
+import asyncio
+import json
+
+import pytest
+
+from service import HTTPError, StrategyService
+
+ANSWERS = {
+    'market_view': 'bullish',
+    'price_movement': 'small',
+    'volatility_view': 'increase',
+    'risk_tolerance': 'low',
+    'time_horizon': 'short',
+}
+
+
+@pytest.fixture(scope='module')
+def service():
+    return StrategyService()
+
+
+def _post(service, path, payload):
+    return service.handle('POST', path, json.dumps(payload).encode('utf-8'))
+
+
+def test_recommend(service):
+    status, payload = _post(service, '/recommend', {'answers': ANSWERS, 'language': 'en'})
+    assert status == 200
+    assert [strategy['id'] for strategy in payload['strategies']] == ['short_put', 'covered_call']
+
+
+@pytest.mark.parametrize('path, payload', [
+    ('/recommend', {'answers': dict(ANSWERS, market_view=['x'])}),
+    ('/recommend/batch', {'answers': [ANSWERS, dict(ANSWERS, market_view={'x': 1})]}),
+    ('/recommend', {'answers': {'market_view': 'bullish'}}),
+    ('/recommend', {'answers': ANSWERS, 'language': 'fr'}),
+    ('/recommend', ['not', 'an', 'object']),
+])
+def test_bad_requests_are_400(service, path, payload):
+    with pytest.raises(HTTPError) as raised:
+        _post(service, path, payload)
+    assert raised.value.status == 400
+
+
+async def _exchange(service, raw):
+    server = await asyncio.start_server(service.serve_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return data.decode('utf-8')
+
+
+def test_unexpected_errors_are_500_and_keep_the_connection():
+    service = StrategyService()
+
+    def broken(query, body):
+        raise RuntimeError('boom')
+    service.routes[('GET', '/broken')] = broken
+    raw = (b'GET /broken HTTP/1.1\r\nHost: x\r\n\r\n'
+           b'GET /languages HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n')
+    response = asyncio.run(_exchange(service, raw))
+    assert response.startswith('HTTP/1.1 500 Internal Server Error')
+    assert 'HTTP/1.1 200 OK' in response
@@ -0,0 +1,57 @@
+# tests/test_simulator.py
+# 蒙特卡洛模拟：固定种子可重现，平均盈亏、波动和盈利概率与解析值一致
+# Monte Carlo simulation: seeded runs repeat, and mean P&L, spread and probability of profit match the analytic values
+
+import math
+
+import numpy as np
+import pytest
+
+import simulator
+from payoff import STOCK, Leg, build_legs, stack_legs
+from pricing import black_scholes, norm_cdf, priced_legs
+
+SPOT, RATE, VOL = 100.0, 0.03, 0.3
+EXPIRIES = (30 / 365, 60 / 365)
+STRATEGIES = ['long_call', 'bull_call_spread', 'covered_call', 'calendar_spread']
+PATHS = 200000
+
+
+def _priced(strategy_ids, vol):
+    legs = stack_legs(build_legs(strategy_id, SPOT) for strategy_id in strategy_ids)
+    return priced_legs(legs, SPOT, EXPIRIES, vol, RATE)
+
+
+def test_mean_pnl_matches_analytic_value():
+    # 以较低的波动率定价、较高的波动率模拟 / Priced at a lower vol than the one simulated
+    legs = _priced(STRATEGIES, 0.25)
+    result = simulator.simulate(legs, SPOT, EXPIRIES, VOL, RATE, paths=PATHS, chunk_size=30000, seed=7)
+    # 近月到期时各腿的期望价值为 e^{rT} 乘以按模拟波动率计算的当前价格（远月腿同样成立）
+    # At the near expiry every leg's expected value is e^{rT} times its price at the simulated vol, far legs included
+    value = black_scholes(legs.kind, SPOT, legs.strike, np.asarray(EXPIRIES)[legs.expiry], VOL, RATE).price
+    expected = (legs.quantity * (math.exp(RATE * EXPIRIES[0]) * value - legs.premium)).sum(axis=1)
+    error = result.std / math.sqrt(PATHS)
+    assert (np.abs(result.mean - expected) < 5 * error + 1e-6).all()
+
+
+def test_stock_distribution_matches_lognormal():
+    legs = stack_legs([[Leg(STOCK, 1, 0.0, SPOT, 0)]])
+    years = EXPIRIES[0]
+    result = simulator.simulate(legs, SPOT, EXPIRIES, VOL, RATE, paths=PATHS, seed=3)
+    growth = math.exp(RATE * years)
+    assert result.mean[0] == pytest.approx(SPOT * (growth - 1), abs=5 * result.std[0] / math.sqrt(PATHS))
+    assert result.std[0] == pytest.approx(SPOT * growth * math.sqrt(math.exp(VOL * VOL * years) - 1), rel=0.01)
+    profit = float(norm_cdf((RATE - 0.5 * VOL * VOL) * math.sqrt(years) / VOL))
+    assert result.probability_of_profit[0] == pytest.approx(profit, abs=0.005)
+    # 最差 5% 的平均值低于平均值，直方图计入全部路径 / The worst-5% mean sits below the mean, and the histogram counts every path
+    assert result.expected_shortfall[0] < result.mean[0]
+    assert result.histogram.sum() == PATHS
+
+
+def test_seeded_runs_repeat():
+    legs = _priced(STRATEGIES, VOL)
+    first = simulator.simulate(legs, SPOT, EXPIRIES, VOL, RATE, paths=50000, chunk_size=20000, seed=11)
+    second = simulator.simulate(legs, SPOT, EXPIRIES, VOL, RATE, paths=50000, chunk_size=20000, seed=11)
+    assert (first.mean == second.mean).all()
+    assert (first.histogram == second.histogram).all()
+    assert (first.expected_shortfall == second.expected_shortfall).all()
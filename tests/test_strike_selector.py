@@ -0,0 +1,28 @@
+# tests/test_strike_selector.py
+# 执行价选择：只选有报价的合约 / Strike selection: only quoted contracts are picked
+
+import math
+
+import pytest
+
+import strike_selector
+from payoff import CALL
+
+ANSWERS = {'time_horizon': 'short', 'price_movement': 'small'}
+
+
+def test_unquoted_strike_is_skipped(make_store):
+    # 平值看涨没有报价时改选相邻的执行价 / Without a quote at the money the neighbouring call strike is used
+    store = make_store(unquoted={('AAA', 'C', 100.0)})
+    selection = strike_selector.select_legs(store, 'AAA', 'long_call', ANSWERS)
+    leg, = selection.legs
+    assert leg.kind == CALL and leg.strike in (95.0, 105.0)
+    assert math.isfinite(leg.premium)
+
+
+def test_strategy_without_quotes_is_dropped(make_store):
+    store = make_store(unquoted={('AAA', 'C', strike) for strike in (80.0, 90.0, 95.0, 100.0, 105.0, 110.0, 120.0)})
+    with pytest.raises(ValueError):
+        strike_selector.select_legs(store, 'AAA', 'long_call', ANSWERS)
+    selections = strike_selector.select_recommended_legs(store, 'AAA', ['long_call', 'long_put'], ANSWERS)
+    assert [selection.strategy_id for selection in selections] == ['long_put']
@@ -0,0 +1,21 @@
+# tests/test_vol_surface.py
+# 波动率曲面：从报价恢复波动率，缓存按存储目录区分 / Vol surface: vols recovered from quotes, cache separated per store directory
+
+import pytest
+
+import vol_surface
+
+
+def test_flat_surface_recovers_the_quoted_vol(make_store):
+    store = make_store(vol=0.3)
+    surface = vol_surface.build_surface(store, 'aaa')
+    assert surface.atm_vol(surface.expiries[0]) == pytest.approx(0.3, abs=0.01)
+
+
+def test_cache_separates_stores_with_the_same_timestamp(make_store):
+    cache = vol_surface.SurfaceCache()
+    low = cache.get(make_store('low', vol=0.2), 'AAA')
+    high = cache.get(make_store('high', vol=0.5), 'AAA')
+    assert cache.stats()['misses'] == 2
+    assert low.atm_vol(low.expiries[0]) == pytest.approx(0.2, abs=0.01)
+    assert high.atm_vol(high.expiries[0]) == pytest.approx(0.5, abs=0.01)
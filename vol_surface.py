@@ -0,0 +1,198 @@
+# vol_surface.py
+# 由期权链快照构建的隐含波动率曲面（执行价 × 到期日），按标的和快照时间做有界 LRU 缓存
+# Implied-volatility surface (strike × expiry) built from an option-chain snapshot, with a bounded LRU cache keyed by symbol and snapshot time
+
+import bisect
+import collections
+import math
+import os
+
+import numpy as np
+
+from chain_store import to_days
+from iv_solver import implied_vol
+from payoff import CALL, PUT
+
+# 对数价值度网格的点数 / Number of points on the log-moneyness grid
+MONEYNESS_POINTS = 201
+
+# 默认缓存的曲面数量 / Default number of cached surfaces
+DEFAULT_CACHE_SIZE = 256
+
+
+class VolSurface:
+    """隐含波动率曲面：每个到期日在对数价值度网格上插值总方差，到期日之间对总方差线性插值
+    Implied-vol surface: total variance is interpolated on a log-moneyness grid per expiry, and linearly in time between expiries
+    
+    价值度超出报价范围时取边缘值；早于首个或晚于末个到期日时保持该到期日的波动率不变。
+    Moneyness beyond the quoted range takes the edge value; before the first or after the last expiry the vol of that expiry is held.
+    """
+    
+    def __init__(self, symbol, spot, as_of, expiries, moneyness, variance):
+        self.symbol = symbol
+        self.spot = spot
+        self.as_of = as_of
+        # expiries 为距纪元的天数，moneyness 为等距的 log(K/S) 网格，variance 为 (到期日, 网格) 的总方差
+        # expiries are days since epoch, moneyness an even log(K/S) grid, variance the (expiry, grid) total variance
+        self.expiries = np.asarray(expiries, dtype=np.int64)
+        self.moneyness = moneyness
+        self.variance = variance
+        self.years = (self.expiries - as_of) / 365.0
+        
+        # 标量查询用的 Python 列表，避免小数组上的 NumPy 开销 / Python lists for scalar queries, avoiding NumPy overhead on tiny inputs
+        self._years = self.years.tolist()
+        self._rows = variance.tolist()
+        self._x0 = float(moneyness[0])
+        self._step = float(moneyness[1] - moneyness[0]) if len(moneyness) > 1 else 1.0
+        self._last = len(moneyness) - 1
+    
+    def _row_variance(self, row, x):
+        position = min(max((x - self._x0) / self._step, 0.0), self._last)
+        index = min(int(position), self._last - 1) if self._last else 0
+        values = self._rows[row]
+        if not self._last:
+            return values[0]
+        fraction = position - index
+        return values[index] + (values[index + 1] - values[index]) * fraction
+    
+    def vol(self, strike, expiry):
+        """单点查询：执行价与到期日（距纪元天数）处的隐含波动率 / Point query: implied vol at a strike and an expiry in days since epoch"""
+        x = math.log(strike / self.spot)
+        t = (expiry - self.as_of) / 365.0
+        years = self._years
+        if t <= years[0]:
+            return math.sqrt(max(self._row_variance(0, x), 0.0) / years[0])
+        if t >= years[-1]:
+            return math.sqrt(max(self._row_variance(len(years) - 1, x), 0.0) / years[-1])
+        row = bisect.bisect_left(years, t)
+        before = self._row_variance(row - 1, x)
+        after = self._row_variance(row, x)
+        weight = (t - years[row - 1]) / (years[row] - years[row - 1])
+        return math.sqrt(max(before + (after - before) * weight, 0.0) / t)
+    
+    def vols(self, strikes, expiries):
+        """向量查询，strikes 与 expiries 按广播规则对齐 / Vectorized query; strikes and expiries broadcast against each other"""
+        strikes, expiries = np.broadcast_arrays(np.asarray(strikes, dtype=float), np.asarray(expiries, dtype=float))
+        x = np.log(strikes / self.spot)
+        t = (expiries - self.as_of) / 365.0
+        
+        # 价值度方向：等距网格上的线性插值 / Moneyness: linear interpolation on the even grid
+        position = np.clip((x - self._x0) / self._step, 0.0, self._last)
+        index = np.minimum(position.astype(np.int64), max(self._last - 1, 0))
+        fraction = position - index
+        upper = np.minimum(index + 1, self._last)
+        
+        # 时间方向：相邻两个到期日的总方差线性插值，两端保持波动率不变
+        # Time: linear interpolation of total variance between neighbouring expiries, holding vol beyond both ends
+        years = self.years
+        clamped = np.clip(t, years[0], years[-1])
+        row = np.clip(np.searchsorted(years, clamped), 1, max(len(years) - 1, 1))
+        if len(years) == 1:
+            row = np.zeros_like(row)
+            below, weight = row, np.zeros_like(clamped)
+        else:
+            below = row - 1
+            weight = (clamped - years[below]) / (years[row] - years[below])
+        variance = self.variance
+        before = variance[below, index] + (variance[below, upper] - variance[below, index]) * fraction
+        after = variance[row, index] + (variance[row, upper] - variance[row, index]) * fraction
+        total = np.maximum(before + (after - before) * weight, 0.0)
+        # 端点之外按端点的波动率而非总方差外推 / Beyond the ends extrapolate the end vol rather than the total variance
+        return np.sqrt(total / clamped)
+    
+    def grid(self, strikes, expiries):
+        """网格查询，返回 (到期日数, 执行价数) 的波动率矩阵 / Grid query returning a (expiries, strikes) vol matrix"""
+        return self.vols(np.asarray(strikes, dtype=float)[None, :], np.asarray(expiries, dtype=float)[:, None])
+    
+    def atm_vol(self, expiry):
+        """平值波动率 / At-the-money vol"""
+        return self.vol(self.spot, expiry)
+
+
+def build_surface(store, symbol, points=MONEYNESS_POINTS, rate=0.0, dividend=0.0, as_of=None):
+    """由快照中某一标的的虚值期权报价构建曲面，没有可用报价时返回 None
+    Build the surface of one symbol from the out-of-the-money quotes in a snapshot, None when nothing usable is quoted"""
+    # as_of 为计算期限的起点（天数），默认取快照的时间戳；按日期命名的历史快照应传入目录日期
+    # as_of is the day terms are measured from, by default the snapshot timestamp; dated historical snapshots should pass their directory date
+    symbol = symbol.upper()
+    spot = store.spot(symbol) if symbol in store else None
+    if spot is None or spot <= 0:
+        return None
+    if as_of is None:
+        as_of = to_days(store.as_of[:10])
+    
+    expiries, smiles = [], []
+    for expiry in store.expiries(symbol).tolist():
+        if expiry <= as_of:
+            continue
+        chain = store.chain(symbol, expiry)
+        iv = chain.iv.astype(float)
+        # 快照缺少隐含波动率时由买卖中间价反解 / Solve from bid/ask mids where the snapshot lacks implied vols
+        missing = ~(iv > 0)
+        if missing.any():
+            mid = (chain.bid[missing] + chain.ask[missing]) / 2.0
+            iv[missing] = implied_vol(chain.kind[missing], mid, spot, chain.strike[missing], (expiry - as_of) / 365.0, rate, dividend)
+        # 虚值一侧的报价流动性更好：执行价低于标的价格用看跌，其余用看涨
+        # Out-of-the-money quotes are the liquid side: puts below the spot, calls at and above it
+        use = np.where(chain.strike < spot, chain.kind == PUT, chain.kind == CALL) & (iv > 0) & np.isfinite(iv)
+        if not use.any():
+            continue
+        order = np.argsort(chain.strike[use], kind='stable')
+        expiries.append(expiry)
+        smiles.append((np.log(chain.strike[use][order] / spot), iv[use][order]))
+    if not expiries:
+        return None
+    
+    low = min(float(x[0]) for x, _ in smiles)
+    high = max(float(x[-1]) for x, _ in smiles)
+    moneyness = np.linspace(low, high, points) if high > low else np.array([low])
+    years = (np.array(expiries) - as_of) / 365.0
+    variance = np.array([np.interp(moneyness, x, iv) ** 2 * t for (x, iv), t in zip(smiles, years)])
+    return VolSurface(symbol, float(spot), as_of, expiries, moneyness, variance)
+
+
+class SurfaceCache:
+    """按 (存储目录, 标的, 快照时间, 估值日) 缓存曲面的有界 LRU / Bounded LRU of surfaces keyed by (store directory, symbol, snapshot time, valuation day)"""
+    
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._surfaces = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, store, symbol, as_of=None):
+        if as_of is None:
+            as_of = to_days(store.as_of[:10])
+        # 不同目录的快照可能有相同的时间戳，目录也是键的一部分 / Snapshots in different directories may share a timestamp, so the directory is part of the key
+        key = (os.path.abspath(store.path), symbol.upper(), store.as_of, int(as_of))
+        try:
+            surface = self._surfaces[key]
+        except KeyError:
+            self.misses += 1
+            surface = self._surfaces[key] = build_surface(store, symbol, as_of=int(as_of))
+            if len(self._surfaces) > self.maxsize:
+                self._surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+        return surface
+    
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = self.misses = 0
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._surfaces), 'maxsize': self.maxsize}
+
+
+# 进程内共享的默认缓存 / Default cache shared within the process
+_cache = SurfaceCache()
+
+
+def get_surface(store, symbol, as_of=None):
+    """从进程内共享缓存取曲面 / Get a surface from the process-wide cache"""
+    return _cache.get(store, symbol, as_of)
+
+
+def cache_stats():
+    return _cache.stats()
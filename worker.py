@@ -0,0 +1,94 @@
+# worker.py
+# 后台执行耗时计算，结果通过 Tk 事件循环送回界面线程
+# Run heavy computations in the background and hand their results back to the UI thread through the Tk event loop
+
+import concurrent.futures
+import queue
+
+
+class Cancelled(Exception):
+    """任务已被更新的任务取代 / The task was superseded by a newer one"""
+
+
+class BackgroundRunner:
+    """在线程池中运行任务，只把最新一代任务的结果交给界面
+    Run tasks in a thread pool and only deliver the results of the latest generation to the UI
+    
+    NumPy 计算和内存映射读取在执行时会释放 GIL，线程足以让界面保持响应。
+    NumPy work and memory-mapped reads release the GIL, so threads are enough to keep the UI responsive.
+    """
+    
+    def __init__(self, root, workers=2, poll_ms=30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='strategy-worker')
+        # 工作线程只向队列写入，界面线程定时读取 / Worker threads only write to the queue; the UI thread polls it
+        self.results = queue.Queue()
+        self.generation = 0
+        self.futures = []
+        self._polling = None
+    
+    def submit(self, function, *args, on_done, on_error=None, on_progress=None, **kwargs):
+        """提交任务并取消之前的任务；on_progress 存在时任务会收到 progress(fraction) 回调
+        Submit a task, cancelling earlier ones; with on_progress the task receives a progress(fraction) callable
+        
+        progress 在任务已过期时抛出 Cancelled，长任务可借此提前结束。
+        progress raises Cancelled once the task is stale, letting long tasks stop early.
+        """
+        self.cancel()
+        generation = self.generation
+        if on_progress is not None:
+            def progress(fraction):
+                if generation != self.generation:
+                    raise Cancelled()
+                self.results.put((generation, on_progress, fraction))
+            kwargs['progress'] = progress
+        self.futures.append(self.executor.submit(self._run, generation, function, args, kwargs, on_done, on_error))
+        if self._polling is None:
+            self._polling = self.root.after(self.poll_ms, self._poll)
+        return generation
+    
+    def _run(self, generation, function, args, kwargs, on_done, on_error):
+        if generation != self.generation:
+            return
+        try:
+            result = function(*args, **kwargs)
+        except Cancelled:
+            return
+        except Exception as error:
+            if on_error is None:
+                raise
+            self.results.put((generation, on_error, error))
+        else:
+            self.results.put((generation, on_done, result))
+    
+    def cancel(self):
+        """放弃所有进行中的任务，其结果将被丢弃 / Abandon every running task; its results will be dropped"""
+        self.generation += 1
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+    
+    def busy(self):
+        return any(not future.done() for future in self.futures)
+    
+    def _poll(self):
+        # 在界面线程中分发结果，过期一代的结果直接丢弃 / Dispatch results on the UI thread, dropping those of stale generations
+        self._polling = None
+        while True:
+            try:
+                generation, callback, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                callback(value)
+        if self.busy() or not self.results.empty():
+            self._polling = self.root.after(self.poll_ms, self._poll)
+    
+    def shutdown(self):
+        """取消任务并关闭线程池，不等待正在运行的任务 / Cancel the tasks and close the pool without waiting for running ones"""
+        self.cancel()
+        if self._polling is not None:
+            self.root.after_cancel(self._polling)
+            self._polling = None
+        self.executor.shutdown(wait=False)